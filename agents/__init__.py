@@ -1,5 +1,31 @@
-from .alpha_beta_agent import AlphaBetaAgent
-from .expectiminimax_agent import ExpectiminimaxAgent
-from .gemini_agent import GeminiAgent
-from .human_agent import HumanAgent
-from .minimax_agent import MinimaxAgent
\ No newline at end of file
+# Agents are imported on first use (PEP 562 module __getattr__), so "import agents"
+# or "from agents.eval_cache import ..." does not load every agent and its dependencies
+import importlib
+
+_EXPORTS = {
+    'AlphaBetaAgent': 'alpha_beta_agent',
+    'ExpectiminimaxAgent': 'expectiminimax_agent',
+    'GeminiAgent': 'gemini_agent',
+    'HumanAgent': 'human_agent',
+    'MCTSAgent': 'mcts_agent',
+    'MinimaxAgent': 'minimax_agent',
+    'ProofNumberAgent': 'proof_number_agent',
+    'ProofNumberSolver': 'proof_number_agent',
+    'ValueNetwork': 'value_network',
+    'WinLossEval': 'win_loss_eval'
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    module_name = _EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module_name}", __name__), name)
+    globals()[name] = value  # Later lookups skip __getattr__
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
\ No newline at end of file
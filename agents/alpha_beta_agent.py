@@ -12,6 +12,17 @@ Key Features:
 - Maintains the same optimal decision-making as Minimax
 - Dramatically reduces computational complexity in most cases
 - Particularly effective with good move ordering
+- Optional transposition table (reuse_search=True) that keeps results between moves
+  and tries the previously best move first
+- Optional pondering (ponder=True) that searches the likely replies on the opponent's time
+- Optional exact endgame solver (endgame_threshold=N) once N or fewer cells are empty
+- Optional move-ordering prior (move_ordering=fn), e.g. a learned policy network
+- Optional batched leaf evaluation (batch_leaves=True): the children of a node one
+  ply above the depth limit are scored with one eval_fn.evaluate_batch call
+- Search tree recorded in a compact array-backed SearchTrace (last_search_tree), with
+  optional node/depth budgets (trace_max_nodes, trace_max_depth), streaming to one file
+  per move (trace_path "traces/ab.trace" -> "traces/ab_ply04.trace") or no recording
+  at all (trace=False)
 
 Algorithm Details:
 - Alpha: Best value that the maximizing player can guarantee
@@ -30,146 +41,252 @@ Usage:
 # alpha_beta_agent.py
 
 import math
-from visualization.tree_diagram import Node
+import os
+from visualization.search_trace import SearchTrace
+from agents.transposition_table import TranspositionTable, EXACT, LOWER, UPPER
+from agents.ponder import Ponderer, SearchAborted
+from agents.endgame_solver import EndgameSolver
+from agents.batch_eval import count_open_children, evaluate_children, supports_batch
 
 
 class AlphaBetaAgent:
-    def __init__(self, eval_fn, max_depth, mark):
+    def __init__(self, eval_fn, max_depth, mark, reuse_search=False, max_table_entries=500_000,
+                 ponder=False, endgame_threshold=0, move_ordering=None, batch_leaves=False,
+                 trace=True, trace_max_nodes=None, trace_max_depth=None, trace_path=None):
         self.eval_fn = eval_fn  # Evaluation function used to score states
         self.max_depth = max_depth  # Max search depth
         self.mark = mark
         self.opponent_mark = 'O' if mark == 'X' else 'X'
         self.nodes_expanded = 0
-        self.last_search_tree = None  # Store root Node for visualization
+        self.last_search_tree = None  # SearchTrace of the last search, for visualization
+        # Search tree recording: off (trace=False), limited to a node/depth budget, or streamed to trace_path
+        self.trace = trace
+        self.trace_max_nodes = trace_max_nodes
+        self.trace_max_depth = trace_max_depth
+        self.trace_path = trace_path
+        self._trace = None  # SearchTrace being recorded by the current search
+        # Transposition table kept between get_action calls (None = search from scratch).
+        # Pondering needs the table to hand its results over to the real search.
+        self.table = TranspositionTable(max_table_entries) if reuse_search or ponder else None
+        self.last_search_stats = None  # Table statistics of the last search
+        self.last_value = None  # Root value of the last search (None if the endgame solver chose the move)
+        self._cutoffs = 0  # Depth cut-offs so far, used to mark complete subtrees
+        # Background search on the opponent's time (None = pondering off)
+        self.ponderer = Ponderer(self) if ponder else None
+        self._abort = None  # Set on the copy that ponders; stops its search early
+        # Exact solver used once at most endgame_threshold empty cells remain (0 = off)
+        self.endgame_threshold = endgame_threshold
+        self.endgame = EndgameSolver() if endgame_threshold > 0 else None
+        # Optional prior move_ordering(state, actions) -> actions, best first (e.g. ValueNetwork.order_moves)
+        self.move_ordering = move_ordering
+        # Score the last ply in one call per parent when eval_fn has evaluate_batch
+        self.batch_leaves = batch_leaves and supports_batch(eval_fn)
+
+    def reset_for_new_game(self):
+        # Next game with the same agent: clears the search stats and trace, keeps the table
+        if self.ponderer is not None:
+            self.ponderer.reset()
+        if self.table is not None:
+            self.table.keep_unreachable = True
+        self.nodes_expanded = 0
+        self.last_value = None
+        self.last_search_stats = None
+        self._cutoffs = 0
+        self.last_search_tree = None
+        self._trace = None
 
     def get_action(self, state):
         # Returns the best action for the current state using alpha-beta pruning
         # Calls the alpha_beta recursive function starting from the root
+        if self.ponderer is not None:
+            pondered = self.ponderer.collect(state)
+            if pondered is not None:
+                # This reply was already searched while the opponent was thinking
+                self.nodes_expanded = pondered['nodes_expanded']  # Nodes of the pondered search
+                self.last_value = pondered['search_value']
+                self.last_search_stats = pondered['search_stats']
+                self.last_search_tree = pondered['search_tree']
+                self.ponderer.start(state.generate_successor(pondered['action'], self.mark))
+                return pondered['action']
+
         self.nodes_expanded = 0
+        if self.endgame is not None and len(state.get_valid_moves()) <= self.endgame_threshold:
+            # Few empty cells left: solve exactly instead of stopping at max_depth
+            action = self.endgame.best_move(state, self.mark)
+            self.nodes_expanded = self.endgame.nodes_expanded
+            self.last_value = None  # Solver scores are not on the eval_fn scale
+            self.last_search_tree = None  # No alpha-beta tree to visualize
+        else:
+            if self.table is not None:
+                self.table.new_search(state, retain=self._abort is None)
 
-        # Create root node of the search tree
-        root_node = Node(
-            move=None,
-            value=None,
-            alpha=float('-inf'),
-            beta=float('inf'),
-            is_max=True,
-            pruned=False
-        )
+            # Create the trace and its root node
+            root_node = -1
+            self._trace = self._new_trace(state)
+            if self._trace is not None:
+                root_node = self._trace.add(None, None, float('-inf'), float('inf'), is_max=True)
 
-        # Run alpha-beta with tree building
-        value, action = self.alpha_beta(state, self.max_depth, float(
-            '-inf'), float('inf'), True, root_node)
+            # Run alpha-beta with tree recording
+            value, action = self.alpha_beta(state, self.max_depth, float(
+                '-inf'), float('inf'), True, root_node)
+            self.last_value = value
 
-        # Store root node for visualization after move
-        self.last_search_tree = root_node
+            # Store the trace for visualization after move
+            if self._trace is not None:
+                self._trace.finish(root_node, value)
+                self._trace.close()
+            self.last_search_tree, self._trace = self._trace, None
+            if self.table is not None:
+                self.last_search_stats = self.table.search_stats(self.nodes_expanded)
+
+        if self.ponderer is not None:
+            self.ponderer.start(state.generate_successor(action, self.mark))
 
         return action
 
-    def alpha_beta(self, state, depth, alpha, beta, maximizing_player, parent_node):
+    def reply_key(self, state):
+        # Table key of a min node: the opponent to move (used by the ponderer)
+        return state.get_key() + (False,)
+
+    def alpha_beta(self, state, depth, alpha, beta, maximizing_player, parent_node=-1):
+        # parent_node is this node's index in self._trace (-1 = not recorded)
         # Base case: if the state is terminal or depth limit reached, evaluate the state
+        if self._abort is not None and self._abort.is_set():
+            raise SearchAborted()
         self.nodes_expanded += 1
 
         # Terminal or depth limit: evaluate node and set value
-        if state.is_terminal() or depth == 0:
+        terminal = state.is_terminal()
+        if terminal or depth == 0:
+            if not terminal:
+                self._cutoffs += 1  # Depth limit reached before the game ended
             val = self.eval_fn(state)
-            parent_node.value = val
             return val, None
 
+        # Reuse a stored result for this position if it decides the node
+        key = None
+        if self.table is not None:
+            key = state.get_key() + (maximizing_player,)
+            entry = self.table.probe(key, depth, alpha, beta)
+            if entry is not None:
+                if not entry.complete:
+                    self._cutoffs += 1
+                return entry.value, entry.best_move
+            alpha_orig, beta_orig = alpha, beta
+            nodes_before, cutoffs_before = self.nodes_expanded, self._cutoffs
+
+        actions = self._ordered_actions(state, key)
+
+        # One ply above the depth limit: score all children with a single batched call
+        leaf_values = None
+        if self.batch_leaves and depth == 1:
+            leaf_values = self._evaluate_leaves(
+                state, actions, self.mark if maximizing_player else self.opponent_mark)
+        trace = self._trace if parent_node >= 0 else None
+
         if maximizing_player:
             # Maximizing player's turn
             value, best_action = float('-inf'), None
             # Iterate over all possible legal actions
-            for action in state.get_legal_actions():
-                successor = state.generate_successor(action, self.mark)
-
-                # Create child node
-                child_node = Node(
-                    move=action,
-                    value=None,
-                    alpha=alpha,
-                    beta=beta,
-                    is_max=False,
-                    pruned=False
-                )
-                parent_node.add_child(child_node)
-
-                new_value, _ = self.alpha_beta(
-                    successor, depth - 1, alpha, beta, False, child_node)
+            for action in actions:
+                # Record child node
+                child_node = trace.add(parent_node, action, alpha, beta, False) if trace is not None else -1
+
+                if leaf_values is not None:
+                    new_value = leaf_values[action]
+                else:
+                    successor = state.generate_successor(action, self.mark)
+                    new_value, _ = self.alpha_beta(
+                        successor, depth - 1, alpha, beta, False, child_node)
 
                 if new_value > value:
                     value, best_action = new_value, action
 
                 # Update alpha
                 alpha = max(alpha, value)
-                child_node.value = new_value
-                child_node.alpha = alpha
-                child_node.beta = beta
+                if trace is not None:
+                    trace.finish(child_node, new_value, alpha, beta)
 
                 # Prune if possible
                 if alpha >= beta:
                     # Mark remaining siblings as pruned
                     # Note: pruning means stopping exploration here; mark remaining children pruned
-                    siblings = state.get_legal_actions()
-                    prune_index = siblings.index(action)
-                    for rem_action in siblings[prune_index+1:]:
-                        pruned_node = Node(
-                            move=rem_action,
-                            value=None,
-                            alpha=alpha,
-                            beta=beta,
-                            is_max=False,
-                            pruned=True
-                        )
-                        parent_node.add_child(pruned_node)
+                    if trace is not None:
+                        prune_index = actions.index(action)
+                        for rem_action in actions[prune_index+1:]:
+                            trace.add(parent_node, rem_action, alpha, beta, False, pruned=True)
                     break
 
-            parent_node.value = value
-            return value, best_action
-
         else:
             # Minimizing player's turn
             value, best_action = float('inf'), None
 
-            for action in state.get_legal_actions():
-                successor = state.generate_successor(
-                    action, self.opponent_mark)
-
-                child_node = Node(
-                    move=action,
-                    value=None,
-                    alpha=alpha,
-                    beta=beta,
-                    is_max=True,
-                    pruned=False
-                )
-                parent_node.add_child(child_node)
+            for action in actions:
+                child_node = trace.add(parent_node, action, alpha, beta, True) if trace is not None else -1
 
-                new_value, _ = self.alpha_beta(
-                    successor, depth - 1, alpha, beta, True, child_node)
+                if leaf_values is not None:
+                    new_value = leaf_values[action]
+                else:
+                    successor = state.generate_successor(
+                        action, self.opponent_mark)
+                    new_value, _ = self.alpha_beta(
+                        successor, depth - 1, alpha, beta, True, child_node)
 
                 if new_value < value:
                     value, best_action = new_value, action
 
                 beta = min(beta, value)
-                child_node.value = new_value
-                child_node.alpha = alpha
-                child_node.beta = beta
+                if trace is not None:
+                    trace.finish(child_node, new_value, alpha, beta)
 
                 if beta <= alpha:
-                    siblings = state.get_legal_actions()
-                    prune_index = siblings.index(action)
-                    for rem_action in siblings[prune_index+1:]:
-                        pruned_node = Node(
-                            move=rem_action,
-                            value=None,
-                            alpha=alpha,
-                            beta=beta,
-                            is_max=True,
-                            pruned=True
-                        )
-                        parent_node.add_child(pruned_node)
+                    if trace is not None:
+                        prune_index = actions.index(action)
+                        for rem_action in actions[prune_index+1:]:
+                            trace.add(parent_node, rem_action, alpha, beta, True, pruned=True)
                     break
 
-            parent_node.value = value
-            return value, best_action
+        if key is not None:
+            # A value outside the original window is only a bound on the true value
+            if value <= alpha_orig:
+                flag = UPPER
+            elif value >= beta_orig:
+                flag = LOWER
+            else:
+                flag = EXACT
+            self.table.store(key, depth, value, flag, best_action,
+                             self._cutoffs == cutoffs_before, self.nodes_expanded - nodes_before)
+        return value, best_action
+
+    def _new_trace(self, state):
+        # Recorder for one search, or None when recording is off.
+        # Each move streams to its own file, named after the number of moves played so far;
+        # a pondering copy keeps its trace in memory so it never writes to trace_path.
+        if not self.trace:
+            return None
+        path = None
+        if self.trace_path is not None and self._abort is None:
+            root, extension = os.path.splitext(self.trace_path)
+            path = f"{root}_ply{state.total_move:02d}{extension}"
+        return SearchTrace(self.trace_max_nodes, self.trace_max_depth, path)
+
+    def _evaluate_leaves(self, state, actions, mark):
+        # Scores every child of a node at depth 1 in one eval_fn call: {action: value}.
+        # Children beyond a cut-off are evaluated too; pruning itself is unchanged.
+        self.nodes_expanded += len(actions)
+        if self.table is not None:
+            self._cutoffs += count_open_children(state, actions, mark)
+        return dict(zip(actions, evaluate_children(self.eval_fn, state, actions, mark)))
+
+    def _ordered_actions(self, state, key):
+        # Legal actions, with the best move remembered for this position tried first
+        # and the remaining ones in the order suggested by move_ordering (if any)
+        actions = state.get_legal_actions()
+        if self.move_ordering is not None:
+            actions = list(self.move_ordering(state, actions))
+        if key is not None:
+            best_move = self.table.best_move(key)
+            if best_move in actions:
+                actions.remove(best_move)
+                actions.insert(0, best_move)
+        return actions
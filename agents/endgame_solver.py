@@ -0,0 +1,123 @@
+"""
+Exact Endgame Solver
+
+This module implements an exhaustive, memoized negamax solver for positions with
+few empty cells left. Near the end of the game a depth-limited search costs about
+as much as searching to the very end, but still stops at max_depth and trusts a
+heuristic. The search agents switch to this solver once the number of empty
+cells drops to their endgame_threshold, which gives perfect late-game play at a
+cost bounded by the number of empty cells.
+
+Key Features:
+- Searches to the end of the game, no evaluation function involved
+- Compact position encoding: one integer bitboard per player (game/bitboard.py)
+- Own small memo table keyed by (side-to-move bits, opponent bits)
+- Table is bounded by max_entries and simply cleared when it fills up
+- Prefers the fastest win and the slowest loss
+
+Scoring:
+- Win:  1 + number of empty cells left after the winning move
+- Draw: 0
+- Loss: negative of the opponent's win score
+
+Date Created: 2026-10-19
+Version: 1.0
+
+Usage:
+    solver = EndgameSolver(max_entries=200_000)
+    score, move = solver.solve(board, 'O')
+    scores = solver.move_scores(board, 'O')   # exact score of every move
+"""
+
+# endgame_solver.py
+
+from game.bitboard import cell_line_masks, encode, iter_cells
+
+
+class EndgameSolver:
+    def __init__(self, max_entries=200_000):
+        self.max_entries = max_entries  # Memory bound for the memo table
+        self.table = {}  # (mover_bits, opponent_bits) -> exact score for the mover
+        self.nodes_expanded = 0
+        self._geometry = None  # (size, winning_length) the table was built for
+
+    def solve(self, board, to_move):
+        # Returns (score, best_move) for the side to move
+        self.nodes_expanded = 0
+        self._prepare(board.size, board.winning_length)
+        x_bits, o_bits = encode(board)
+        mover, opponent = (x_bits, o_bits) if to_move == 'X' else (o_bits, x_bits)
+        score, index = self._search_root(mover, opponent)
+        return score, (divmod(index, board.size) if index is not None else None)
+
+    def best_move(self, board, to_move):
+        # Returns a move that achieves the exact value of the position
+        return self.solve(board, to_move)[1]
+
+    def move_scores(self, board, to_move):
+        # Returns {move: exact score for to_move after playing it} for every empty cell
+        self.nodes_expanded = 0
+        self._prepare(board.size, board.winning_length)
+        x_bits, o_bits = encode(board)
+        mover, opponent = (x_bits, o_bits) if to_move == 'X' else (o_bits, x_bits)
+        empty = ~(mover | opponent) & self._full
+        return {divmod(index, board.size): self._move_score(mover, opponent, empty, index)
+                for index in iter_cells(empty)}
+
+    def _prepare(self, size, winning_length):
+        # Caches the board geometry; a different board invalidates the table
+        if self._geometry != (size, winning_length):
+            self.table.clear()
+            self._geometry = (size, winning_length)
+        self._cell_masks = cell_line_masks(size, winning_length)
+        self._full = (1 << (size * size)) - 1
+
+    def _wins(self, bits, index):
+        # True if the stone at index completes a line for bits
+        for mask in self._cell_masks[index]:
+            if bits & mask == mask:
+                return True
+        return False
+
+    def _search_root(self, mover, opponent):
+        # Same as _negamax, but also remembers which move gave the best score
+        empty = ~(mover | opponent) & self._full
+        best_score, best_index = None, None
+        for index in iter_cells(empty):
+            score = self._move_score(mover, opponent, empty, index)
+            if best_score is None or score > best_score:
+                best_score, best_index = score, index
+        return best_score, best_index
+
+    def _move_score(self, mover, opponent, empty, index):
+        # Exact score for the mover of playing at index
+        new_mover = mover | (1 << index)
+        if self._wins(new_mover, index):
+            return empty.bit_count()  # 1 + cells still empty after this move
+        return -self._negamax(opponent, new_mover)
+
+    def _negamax(self, mover, opponent):
+        # Exact score of the position for the side to move (mover)
+        key = (mover, opponent)
+        score = self.table.get(key)
+        if score is not None:
+            return score
+
+        self.nodes_expanded += 1
+        empty = ~(mover | opponent) & self._full
+        if not empty:
+            return 0  # Board full without a line: draw
+
+        best = None
+        best_possible = empty.bit_count()  # Winning right now scores the most
+        for index in iter_cells(empty):
+            score = self._move_score(mover, opponent, empty, index)
+            if best is None or score > best:
+                best = score
+                if best == best_possible:
+                    break
+
+        if len(self.table) >= self.max_entries:
+            self.table.clear()
+        self.table[key] = best
+        return best
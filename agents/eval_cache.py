@@ -0,0 +1,79 @@
+"""
+Memoized Evaluation Function
+
+This module wraps any eval_fn(state) in a position-keyed cache. The search
+agents call eval_fn at every leaf, and the same leaf is often reached through
+different move orders (transpositions) or again on the next move. The wrapper
+answers those repeats from the cache instead of rescanning the board.
+
+Key Features:
+- Drop-in replacement: CachedEvaluator(eval_fn) is itself a valid eval_fn
+- Keyed by Board.get_key(), a cheap (x_bits, o_bits) pair, plus the board size
+  and winning length, so one cache can serve boards of every geometry
+- Bounded size with least-recently-used (LRU) eviction
+- Reports hit rate and the time the hits saved
+
+Note: the wrapped eval_fn must depend on the position only (not on move order).
+
+Date Created: 2026-10-19
+Version: 1.0
+
+Usage:
+    eval_fn = CachedEvaluator(simple_eval_function, max_entries=100_000)
+    agent = AlphaBetaAgent(eval_fn=eval_fn, max_depth=6, mark='X')
+    print(eval_fn.get_stats())
+"""
+
+# eval_cache.py
+
+import time
+from collections import OrderedDict
+
+
+class CachedEvaluator:
+    def __init__(self, eval_fn, max_entries=100_000):
+        self.eval_fn = eval_fn  # Wrapped evaluation function
+        self.max_entries = max_entries  # LRU bound on cached positions
+        self._cache = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self._eval_time = 0.0  # Seconds spent inside eval_fn on misses
+
+    def __call__(self, state):
+        # The same bits mean different positions on boards of another size or winning length
+        key = state.get_key() + (state.size, state.winning_length)
+        value = self._cache.get(key)
+        if value is not None:
+            self.hits += 1
+            self._cache.move_to_end(key)
+            return value
+
+        self.misses += 1
+        start_time = time.perf_counter()
+        value = self.eval_fn(state)
+        self._eval_time += time.perf_counter() - start_time
+
+        self._cache[key] = value
+        if len(self._cache) > self.max_entries:
+            self._cache.popitem(last=False)  # Evict the least recently used position
+        return value
+
+    def get_stats(self):
+        # Hit rate and an estimate of the time saved (hits x average eval_fn time)
+        calls = self.hits + self.misses
+        avg_eval_time = self._eval_time / self.misses if self.misses else 0.0
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': round(self.hits / calls, 4) if calls else 0.0,
+            'entries': len(self._cache),
+            'eval_time_sec': round(self._eval_time, 4),
+            'time_saved_sec': round(self.hits * avg_eval_time, 4)
+        }
+
+    def clear(self):
+        # Drops all cached values and statistics
+        self._cache.clear()
+        self.hits = 0
+        self.misses = 0
+        self._eval_time = 0.0
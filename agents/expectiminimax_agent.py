@@ -7,16 +7,19 @@ Expectiminimax handles games with chance nodes (random events) by computing
 expected values instead of assuming worst-case scenarios.
 
 Key Features:
-- Handles three types of nodes: Max, Min, and Chance
+- Handles Max nodes (the agent's move) and Chance nodes (the opponent's reply)
 - Computes expected values for probabilistic outcomes
 - Suitable for games with random elements (dice, card draws, etc.)
 - Provides optimal play against uncertain opponents
 - Uses probability distributions to model random events
+- Optional transposition table (reuse_search=True) that keeps results between moves
+- Optional pondering (ponder=True) that searches the likely replies on the opponent's time
+- Optional exact endgame solver (endgame_threshold=N) once N or fewer cells are empty
 
 Algorithm Structure:
 - Max nodes: Choose action that maximizes expected value
-- Min nodes: Choose action that minimizes expected value
 - Chance nodes: Compute weighted average of all possible outcomes
+  (the opponent's replies, assumed uniformly random)
 
 Applications:
 - Board games with dice (Backgammon, Monopoly)
@@ -35,59 +38,133 @@ Usage:
 # expectiminimax_agent.py
 
 import random
+from agents.transposition_table import TranspositionTable, EXACT
+from agents.ponder import Ponderer, SearchAborted
+from agents.endgame_solver import EndgameSolver
 
 class ExpectiminimaxAgent:
-    def __init__(self, eval_fn, max_depth, mark):
+    def __init__(self, eval_fn, max_depth, mark, reuse_search=False, max_table_entries=500_000,
+                 ponder=False, endgame_threshold=0):
         self.eval_fn = eval_fn  # Evaluation function used to evaluate terminal/non-terminal states
         self.max_depth = max_depth  # Maximum search depth for the algorithm
         self.mark = mark
         self.opponent_mark = 'O' if mark == 'X' else 'X'
         self.nodes_expanded = 0
+        # Transposition table kept between get_action calls (None = search from scratch).
+        # Pondering needs the table to hand its results over to the real search.
+        self.table = TranspositionTable(max_table_entries) if reuse_search or ponder else None
+        self.last_search_stats = None  # Table statistics of the last search
+        self.last_value = None  # Root value of the last search (None if the endgame solver chose the move)
+        self._cutoffs = 0  # Depth cut-offs so far, used to mark complete subtrees
+        # Background search on the opponent's time (None = pondering off)
+        self.ponderer = Ponderer(self) if ponder else None
+        self._abort = None  # Set on the copy that ponders; stops its search early
+        # Exact solver used once at most endgame_threshold empty cells remain (0 = off)
+        self.endgame_threshold = endgame_threshold
+        self.endgame = EndgameSolver() if endgame_threshold > 0 else None
+
+    def reset_for_new_game(self):
+        # Forgets this game's search state; what the table has learned carries over
+        if self.ponderer is not None:
+            self.ponderer.reset()
+        if self.table is not None:
+            self.table.keep_unreachable = True
+        self.nodes_expanded = 0
+        self.last_value = None
+        self.last_search_stats = None
+        self._cutoffs = 0
 
     def get_action(self, state):
         # Returns the best action for the current state using the expectiminimax algorithm
-        # Only the action part is returned; the value is ignored here
+        # Only the action is returned; the root value is kept in last_value
+        if self.ponderer is not None:
+            pondered = self.ponderer.collect(state)
+            if pondered is not None:
+                # This reply was already searched while the opponent was thinking
+                self.nodes_expanded = pondered['nodes_expanded']  # Nodes of the pondered search
+                self.last_value = pondered['search_value']
+                self.last_search_stats = pondered['search_stats']
+                self.ponderer.start(state.generate_successor(pondered['action'], self.mark))
+                return pondered['action']
+
         self.nodes_expanded = 0
-        _, action = self.expectiminimax(state, self.max_depth, "max")
+        if self.endgame is not None and len(state.get_valid_moves()) <= self.endgame_threshold:
+            # Few empty cells left: solve exactly instead of stopping at max_depth
+            action = self.endgame.best_move(state, self.mark)
+            self.nodes_expanded = self.endgame.nodes_expanded
+            self.last_value = None  # Solver scores are not on the eval_fn scale
+        else:
+            if self.table is not None:
+                self.table.new_search(state, retain=self._abort is None)
+            self.last_value, action = self.expectiminimax(state, self.max_depth, "max")
+            if self.table is not None:
+                self.last_search_stats = self.table.search_stats(self.nodes_expanded)
+        if self.ponderer is not None:
+            self.ponderer.start(state.generate_successor(action, self.mark))
         return action
 
+    def reply_key(self, state):
+        # The opponent's replies are a chance node (used by the ponderer)
+        return state.get_key() + ("chance",)
+
     def expectiminimax(self, state, depth, node_type):
         # Recursive expectiminimax search
         # state: current game state
         # depth: remaining search depth
-        # node_type: "max", "min", or "chance" indicating the type of node
+        # node_type: "max" or "chance" indicating the type of node
+        if self._abort is not None and self._abort.is_set():
+            raise SearchAborted()
         self.nodes_expanded += 1
         # Base case: if the state is terminal or depth limit reached, evaluate the state
-        if state.is_terminal() or depth == 0:
+        terminal = state.is_terminal()
+        if terminal or depth == 0:
+            if not terminal:
+                self._cutoffs += 1  # Depth limit reached before the game ended
             return self.eval_fn(state), None
 
+        if self.table is not None:
+            return self._expectiminimax_with_table(state, depth, node_type)
+        return self._expectiminimax_children(state, depth, node_type)
+
+    def _expectiminimax_with_table(self, state, depth, node_type):
+        # Looks the node up in the transposition table before searching it
+        key = state.get_key() + (node_type,)
+        entry = self.table.probe(key, depth)
+        if entry is not None:
+            if not entry.complete:
+                self._cutoffs += 1
+            return entry.value, entry.best_move
+
+        nodes_before, cutoffs_before = self.nodes_expanded, self._cutoffs
+        value, action = self._expectiminimax_children(state, depth, node_type)
+        self.table.store(key, depth, value, EXACT, action,
+                         self._cutoffs == cutoffs_before, self.nodes_expanded - nodes_before)
+        return value, action
+
+    def _expectiminimax_children(self, state, depth, node_type):
+        # Searches every child of a non-terminal max or chance node
         if node_type == "max":
             # Maximizing player's turn: choose the action with the highest expected value
             max_eval, best_action = float('-inf'), None
             for action in state.get_legal_actions():
                 # For each action, simulate the result and evaluate using expectiminimax
-                value, _ = self.expectiminimax(state.generate_successor(action, self.opponent_mark), depth - 1, "chance")
+                value, _ = self.expectiminimax(state.generate_successor(action, self.mark), depth - 1, "chance")
                 if value > max_eval:
                     max_eval, best_action = value, action
             return max_eval, best_action
 
-        elif node_type == "min":
-            # Minimizing player's turn: choose the action with the lowest expected value
-            min_eval, best_action = float('inf'), None
-            for action in state.get_legal_actions():
-                # For each action, simulate the result and evaluate using expectiminimax
-                value, _ = self.expectiminimax(state.generate_successor(action, self.mark), depth - 1, "chance")
-                if value < min_eval:
-                    min_eval, best_action = value, action
-            return min_eval, best_action
-
         elif node_type == "chance":
             # Chance node: calculate the expected value over all possible actions
             total_value = 0
+            # The reply that is worst for us is returned as the node's move, so the table
+            # can tell the ponderer which reply to search first; it does not affect the value
+            worst_value, worst_action = float('inf'), None
             actions = state.get_legal_actions()
             prob = 1 / len(actions)  # Assume uniform probability distribution over actions
             for action in actions:
-                # For each possible outcome, calculate its expected value
-                value, _ = self.expectiminimax(state.generate_successor(action, self.mark), depth - 1, "min")
+                # For each possible reply of the opponent, the agent moves next
+                value, _ = self.expectiminimax(state.generate_successor(action, self.opponent_mark), depth - 1, "max")
                 total_value += prob * value
-            return total_value, None
\ No newline at end of file
+                if value < worst_value:
+                    worst_value, worst_action = value, action
+            return total_value, worst_action
\ No newline at end of file
@@ -4,13 +4,26 @@ This agent uses Gemini language model to choose moves in Tic Tac Toe by promptin
 
 Features:
 - Uses Gemini API to generate a move (row,col)
-- Automatically falls back to random moves if API fails or key is missing
+- Automatically falls back to random moves (or the hedging engine's move) if API fails or key is missing
 - API key stored in .env file or config/gemini_settings.json
 - Coverts game state into a text prompt
 - Trying to use different prompts to improve performance by providing more context like:
 1. If there is a winning move, take it immediately
 2. If the opponent has a winning move, play third spot to block their win
 3. Follow opening theory: must take center first, then corners, then edges (always end up with a win or draw)
+- Async path (get_action_async) with a per-move deadline, bounded retries with
+  jittered exponential backoff and a limit on concurrent requests
+- The blocking get_action runs the same async path on a shared background event loop
+- Any object with generate_content(prompt) (and optionally generate_content_async)
+  can be injected as model=..., e.g. the offline stand-ins in agents/mock_llm.py
+- Optional persistent response cache (cache=True or a ResponseCache): repeated and
+  symmetric positions are answered from disk instead of the API
+- One configured model shared by all agents (agents/gemini_client.py), an optional
+  shared rate limit (requests_per_second) and optional coalescing of concurrent
+  move requests into multi-board prompts (coalesce=True)
+- Optional hedging (hedge=True or hedge=<agent>): a local engine (exact endgame solver
+  or AlphaBetaAgent) searches at the same time as the API call and its move replaces
+  the random fallback when the LLM fails, is too slow or answers an illegal move
 
 Dependencies:
 - google-generativeai: Google Gemini API SDK (gemini-1.5-flash-latest)
@@ -26,22 +39,99 @@ Setup:
     { "GEMINI_API_KEY": "your_api_key_here" }
 
 Date: 2025-07-06
-Version: 1.1
+Version: 1.2
+
+Usage:
+  agent = GeminiAgent(mark='O', move_timeout=10.0, max_retries=2)
+  move = agent.get_action(board)               # blocking
+  move = await agent.get_action_async(board)   # inside an event loop
+  agent = GeminiAgent(mark='O', model=MockGeminiModel(latency=0.2, error_rate=0.1))
+  agent = GeminiAgent(mark='O', cache=True)    # shared cache in results/gemini_cache.sqlite
+  agent = GeminiAgent(mark='O', requests_per_second=5, coalesce=True, max_batch=8)
+  agent = GeminiAgent(mark='O', hedge=True, move_timeout=3.0, hedge_wait=1.0)
 """
+import asyncio
 import json
 import os
 import random
-import google.generativeai as genai
-from dotenv import load_dotenv
+import threading
+import time
+import weakref
+from agents.gemini_client import ClientPool, generate_async
+from agents.response_cache import ResponseCache
+
+# Event loop on a daemon thread that runs the async path for the blocking get_action
+_background_loop = None
+_background_lock = threading.Lock()
+
+# Request slots shared by all agents of an event loop: loop -> {limit: asyncio.Semaphore}
+_request_slots = weakref.WeakKeyDictionary()
+
+
+def _get_background_loop():
+  global _background_loop
+  with _background_lock:
+    if _background_loop is None:
+      _background_loop = asyncio.new_event_loop()
+      threading.Thread(target=_background_loop.run_forever, name="gemini-agent-loop", daemon=True).start()
+  return _background_loop
+
+
+def _get_request_slots(limit):
+  # Semaphore limiting the requests in flight in the running event loop
+  slots = _request_slots.setdefault(asyncio.get_running_loop(), {})
+  if limit not in slots:
+    slots[limit] = asyncio.Semaphore(limit)
+  return slots[limit]
+
 
 class GeminiAgent:
-  def __init__(self, mark, eval_fn=None, max_depth=None, **kwargs):
+  # Part of the response cache key; bump it whenever _build_prompt changes
+  PROMPT_VERSION = 1
+
+  def __init__(self, mark, eval_fn=None, max_depth=None, model=None, move_timeout=30.0,
+               max_retries=2, retry_backoff=0.5, max_concurrency=8, verbose=True, cache=None,
+               requests_per_second=None, coalesce=False, max_batch=8, batch_wait=0.02,
+               hedge=False, hedge_wait=None, hedge_depth=2, hedge_exact_cells=10, **kwargs):
     # Initialize the Gemini API agent.
     self.mark = mark
     self.opponent_mark = 'O' if mark == 'X' else 'X'
     self.api_configured = False
     self.nodes_expanded = 0
+    self.move_timeout = move_timeout  # Seconds per move, retries included (None = no deadline)
+    self.max_retries = max_retries  # Extra attempts after a failed request
+    self.retry_backoff = retry_backoff  # Base delay (seconds) of the exponential backoff
+    self.max_concurrency = max_concurrency  # Requests in flight per event loop (shared by agents with the same limit)
+    self.verbose = verbose
+    self.stats = {'requests': 0, 'retries': 0, 'errors': 0, 'timeouts': 0,
+                  'invalid_moves': 0, 'fallback_moves': 0, 'cache_hits': 0, 'cache_misses': 0,
+                  # Which source answered each move, and the time each source took
+                  'moves_llm': 0, 'moves_engine': 0, 'moves_random': 0,
+                  'llm_calls': 0, 'llm_time_sec': 0.0, 'engine_runs': 0, 'engine_time_sec': 0.0,
+                  'hedge_cutoffs': 0}
+    self.last_move_info = None  # Source and latencies of the last move
+    # Response cache: True = the shared default cache, None/False = off
+    self.cache = ResponseCache.default() if cache is True else (cache or None)
+    self.requests_per_second = requests_per_second  # Shared rate limit per model (None = unlimited)
+    self.coalesce = coalesce  # Merge concurrent requests of all agents into multi-board prompts
+    self.max_batch = max_batch  # Boards per multi-board prompt at most
+    self.batch_wait = batch_wait  # Seconds a request waits for others to join its prompt
+    # Hedging: a local engine races the API call (True = built-in engine, or any agent object)
+    self.hedge = bool(hedge)
+    self.hedge_engine = None if hedge is True or not hedge else hedge
+    self.hedge_wait = hedge_wait  # Seconds the LLM may still take once the engine has a move (None = until move_timeout)
+    self.hedge_depth = hedge_depth  # Search depth of the built-in AlphaBetaAgent engine
+    self.hedge_exact_cells = hedge_exact_cells  # Built-in engine solves exactly with this many empty cells or fewer
+    self._engine_lock = threading.Lock()  # One engine search at a time per agent
+    self._endgame = None
 
+    # An injected model (e.g. a local stand-in) replaces the Gemini API
+    if model is not None:
+      self.model = model
+      self.api_configured = True
+      return
+
+    from dotenv import load_dotenv
     load_dotenv()
     api_key = os.getenv("GEMINI_API_KEY")
 
@@ -55,95 +145,272 @@ class GeminiAgent:
         pass
 
     if not api_key:
-      print(f"Gemini cannot be found. Agent will make random moves.")
+      print(f"Gemini cannot be found. Agent will make {'engine' if self.hedge else 'random'} moves.")
       self.api_configured = False
     else:
       try:
-        genai.configure(api_key=api_key)
-        self.model = genai.GenerativeModel("gemini-1.5-flash-latest") # the latest free model
+        # Configured once per process and shared by every agent (see gemini_client.py)
+        self.model = ClientPool.get_model(api_key)
         self.api_configured = True
         print(f"Gemini API configured successfully.")
       except Exception as e:
         # Catching any exception during API configuration
-        print(f"Error configuring Gemini API: {e}. Agent will make random moves.")
+        print(f"Error configuring Gemini API: {e}. Agent will make {'engine' if self.hedge else 'random'} moves.")
         self.api_configured = False
 
+  def reset_for_new_game(self):
+    # Prepares the agent for another game. The API client, response cache and hedge engine
+    # are kept; stats are lifetime counters (Metrics records per-game differences).
+    self.nodes_expanded = 0
+    self.last_move_info = None
+
   def get_action(self, board):
-    # Get the best move by querying Gemini API
+    # Get the best move by querying Gemini API (blocks until the move deadline at most)
     valid_moves = board.get_valid_moves()
 
     # If there is only one valid move, return it immediately
     if len(valid_moves) == 1:
       return valid_moves[0]
 
-    # If Gemini API is not configured, return a random move
-    if not self.api_configured:
+    # If Gemini API is not configured (and there is no cache or engine to ask), return a random move
+    if not self.api_configured and self.cache is None and not self.hedge:
       return random.choice(valid_moves)
 
-    # Main API call logic
-    try:
-      board_str = self._board_to_string(board)
-      # # =========== To improve performance, we can try different prompts ===========
-      # prompt = f"""
-      # You are playing Tic-Tac-Toe.
-      # Your mark is '{self.mark}'.
-      # The opponent's mark: '{self.opponent_mark}'.
-
-      # Current board ({board.size}x{board.size}):
-      # {board_str}
-
-      # Valid moves: {valid_moves}
-
-      # Only make a move from the list. Your response must be in the format: row,col
-      # Example: 1,2
-      # """
-      # ======================
-
-      prompt = f"""
-      You are playing Tic-Tac-Toe as an expert AI.
-      Your goal is to win the game. If you cannot win, ensure a draw. Do not lose.
-      Your mark is '{self.mark}'.
-      The opponent's mark: '{self.opponent_mark}'.
-
-      Current board ({board.size}x{board.size}):
-      {board_str}
-
-      Valid moves (0-indexed row, 0-indexed col): {valid_moves}
-
-      Consider the following strategic priorities for your move:
-      1. Win immediately: If you can make a move to win, do it.
-      2. Block opponent's win: If the opponent can win on their next move, block them.
-      3. Take the center: If available, the center position (1,1) is usually best.
-      4. Take a corner: If available, any corner (0,0), (0,2), (2,0), (2,2) is good.
-      5. Take an edge: If available, any remaining edge position (0,1), (1,0), (1,2), (2,1).
-
-      Only make a move from the 'Valid moves' list.
-      Your response must be only the 0-indexed row and column, separated by a comma.
-      Example: 1,2
-      """
-
-      response = self.model.generate_content(prompt)
-      if not response or not response.text:
-          raise ValueError("Gemini API returned an empty or invalid response.")
-
-      # Parse the response text to extract the move
-      response_text = response.text.strip()
-      row_str, col_str = response_text.split(',')
-
-      # For example, if the response is "1,2", we convert it to a tuple (1, 2)
-      move = (int(row_str.strip()), int(col_str.strip()))
-
-      # Validate the move
+    future = asyncio.run_coroutine_threadsafe(self.get_action_async(board), _get_background_loop())
+    return future.result()
+
+  async def get_action_async(self, board):
+    # Get the best move by querying Gemini API without blocking the event loop.
+    # Failed requests are retried until max_retries or the move deadline is reached;
+    # after that the agent falls back to the hedging engine's move, or a random move.
+    valid_moves = board.get_valid_moves()
+    if len(valid_moves) == 1:
+      return valid_moves[0]
+
+    # A cached answer for this position (or a rotation/reflection of it) saves the call
+    if self.cache is not None:
+      move = await asyncio.to_thread(self.cache.get, board, self.mark, self.PROMPT_VERSION)
       if move in valid_moves:
-          print(f"Gemini Agent chose move: {move}")
-          return move
-      else:
-          print(f"Gemini Agent returned an invalid move: {move}. Falling back to random move.")
-          return random.choice(valid_moves)
-
-    except Exception as e:
-      print(f"Error during Gemini API call: {e}. Falling back to random move.")
-      return random.choice(valid_moves)
+        self.stats['cache_hits'] += 1
+        self.last_move_info = {'source': 'cache'}
+        self._log(f"Gemini Agent chose cached move: {move}")
+        return move
+      self.stats['cache_misses'] += 1
+
+    # Start the engine first so it searches while the request is in flight
+    engine_task = None
+    if self.hedge:
+      engine_task = asyncio.create_task(self._timed(asyncio.to_thread(self._engine_move, board)))
+      engine_task.add_done_callback(self._record_engine_time)
+
+    llm_move, llm_time = None, None
+    if self.api_configured:
+      llm_task = asyncio.create_task(self._timed(self._ask_model(board, valid_moves)))
+      if engine_task is not None and self.hedge_wait is not None:
+        # Once the engine has a move, the LLM only gets hedge_wait more seconds
+        done, _ = await asyncio.wait({llm_task, engine_task}, return_when=asyncio.FIRST_COMPLETED)
+        if llm_task not in done:
+          done, _ = await asyncio.wait({llm_task}, timeout=self.hedge_wait)
+          if not done:
+            llm_task.cancel()
+            self.stats['hedge_cutoffs'] += 1
+            self._log("Gemini API call outlasted the hedging engine.")
+      try:
+        llm_move, llm_time = await llm_task
+        self.stats['llm_time_sec'] += llm_time
+      except asyncio.CancelledError:
+        if not llm_task.cancelled():
+          raise  # The caller itself was cancelled
+
+    if llm_move is not None:
+      self.stats['moves_llm'] += 1
+      self.last_move_info = {'source': 'llm', 'llm_latency_sec': llm_time}
+      return llm_move
+
+    self.stats['fallback_moves'] += 1
+    if engine_task is not None:
+      try:
+        engine_move, engine_time = await engine_task
+      except Exception as e:
+        self._log(f"Hedging engine failed: {e}.")
+        engine_move, engine_time = None, None
+      if engine_move in valid_moves:
+        self.stats['moves_engine'] += 1
+        self.last_move_info = {'source': 'engine', 'llm_latency_sec': llm_time, 'engine_latency_sec': engine_time}
+        self._log(f"Gemini Agent used the engine's move: {engine_move}")
+        return engine_move
+
+    self.stats['moves_random'] += 1
+    self.last_move_info = {'source': 'random', 'llm_latency_sec': llm_time}
+    return random.choice(valid_moves)
+
+  async def _ask_model(self, board, valid_moves):
+    # Queries the model with retries; returns a valid move or None
+    loop = asyncio.get_running_loop()
+    deadline = None if self.move_timeout is None else loop.time() + self.move_timeout
+    prompt = self._build_prompt(board, valid_moves)
+    fallback = "the engine's move" if self.hedge else "random move"
+
+    try:
+      for attempt in range(self.max_retries + 1):
+        remaining = None if deadline is None else deadline - loop.time()
+        if remaining is not None and remaining <= 0:
+          break
+        if attempt > 0:
+          self.stats['retries'] += 1
+
+        # Main API call logic
+        try:
+          self.stats['requests'] += 1
+          # Waiting for a request slot counts against the deadline too
+          response = await asyncio.wait_for(self._request_in_slot(prompt, board, valid_moves), timeout=remaining)
+          move = self._parse_move(response)
+
+          # Validate the move
+          if move in valid_moves:
+            self._log(f"Gemini Agent chose move: {move}")
+            if self.cache is not None:
+              await asyncio.to_thread(self.cache.put, board, self.mark, self.PROMPT_VERSION, move)
+            return move
+          self.stats['invalid_moves'] += 1
+          self._log(f"Gemini Agent returned an invalid move: {move}. Falling back to {fallback}.")
+          return None
+
+        except asyncio.TimeoutError:
+          self.stats['timeouts'] += 1
+          self._log(f"Gemini API call missed the move deadline. Falling back to {fallback}.")
+          return None
+        except Exception as e:
+          self.stats['errors'] += 1
+          self._log(f"Error during Gemini API call: {e}.")
+          if attempt < self.max_retries:
+            # Exponential backoff with full jitter, never past the deadline
+            delay = random.uniform(0, self.retry_backoff * 2 ** attempt)
+            if deadline is not None:
+              delay = min(delay, max(0.0, deadline - loop.time()))
+            await asyncio.sleep(delay)
+      return None
+    finally:
+      self.stats['llm_calls'] += 1
+
+  def _engine_move(self, board):
+    # Local move for hedging (runs on a worker thread)
+    # The engines are imported here so agents without hedging do not load the search code
+    with self._engine_lock:
+      if self.hedge_engine is not None:
+        return self.hedge_engine.get_action(board)
+      if len(board.get_valid_moves()) <= self.hedge_exact_cells:
+        if self._endgame is None:
+          from agents.endgame_solver import EndgameSolver
+          self._endgame = EndgameSolver()
+        return self._endgame.best_move(board, self.mark)
+      from agents.alpha_beta_agent import AlphaBetaAgent
+      return AlphaBetaAgent(self._engine_eval, self.hedge_depth, self.mark).get_action(board)
+
+  def _engine_eval(self, board):
+    # Win/loss evaluation from this agent's point of view for the built-in engine
+    winner = board.get_winner()
+    if winner == self.mark:
+      return 1
+    if winner == self.opponent_mark:
+      return -1
+    return 0
+
+  @staticmethod
+  async def _timed(awaitable):
+    # Returns (result, seconds taken)
+    start_time = time.perf_counter()
+    result = await awaitable
+    return result, time.perf_counter() - start_time
+
+  def _record_engine_time(self, task):
+    if not task.cancelled() and task.exception() is None:
+      self.stats['engine_runs'] += 1
+      self.stats['engine_time_sec'] += task.result()[1]
+
+  def get_agent_stats(self):
+    # Request counters of this agent (recorded per game by Metrics)
+    return dict(self.stats)
+
+  async def _request_in_slot(self, prompt, board, valid_moves):
+    # Sends one move request once one of the max_concurrency request slots is free
+    async with _get_request_slots(self.max_concurrency):
+      return await self._request(prompt, board, valid_moves)
+
+  async def _request(self, prompt, board, valid_moves):
+    # Sends one move request, alone or as part of a multi-board prompt
+    limiter = None
+    if self.requests_per_second:
+      limiter = ClientPool.get_limiter(self.model, self.requests_per_second)
+    if self.coalesce:
+      coalescer = ClientPool.get_coalescer(self.model, self.max_batch, self.batch_wait, limiter)
+      return await coalescer.generate(prompt, self._board_section(board, valid_moves))
+    if limiter is not None:
+      await limiter.acquire()
+    return await generate_async(self.model, prompt)
+
+  def _board_section(self, board, valid_moves):
+    # This board's block inside a multi-board prompt
+    return (f"Your mark is '{self.mark}'. The opponent's mark: '{self.opponent_mark}'.\n"
+            f"Current board ({board.size}x{board.size}):\n{self._board_to_string(board)}\n"
+            f"Valid moves (0-indexed row, 0-indexed col): {valid_moves}")
+
+  def _build_prompt(self, board, valid_moves):
+    board_str = self._board_to_string(board)
+    # # =========== To improve performance, we can try different prompts ===========
+    # prompt = f"""
+    # You are playing Tic-Tac-Toe.
+    # Your mark is '{self.mark}'.
+    # The opponent's mark: '{self.opponent_mark}'.
+
+    # Current board ({board.size}x{board.size}):
+    # {board_str}
+
+    # Valid moves: {valid_moves}
+
+    # Only make a move from the list. Your response must be in the format: row,col
+    # Example: 1,2
+    # """
+    # ======================
+
+    prompt = f"""
+    You are playing Tic-Tac-Toe as an expert AI.
+    Your goal is to win the game. If you cannot win, ensure a draw. Do not lose.
+    Your mark is '{self.mark}'.
+    The opponent's mark: '{self.opponent_mark}'.
+
+    Current board ({board.size}x{board.size}):
+    {board_str}
+
+    Valid moves (0-indexed row, 0-indexed col): {valid_moves}
+
+    Consider the following strategic priorities for your move:
+    1. Win immediately: If you can make a move to win, do it.
+    2. Block opponent's win: If the opponent can win on their next move, block them.
+    3. Take the center: If available, the center position (1,1) is usually best.
+    4. Take a corner: If available, any corner (0,0), (0,2), (2,0), (2,2) is good.
+    5. Take an edge: If available, any remaining edge position (0,1), (1,0), (1,2), (2,1).
+
+    Only make a move from the 'Valid moves' list.
+    Your response must be only the 0-indexed row and column, separated by a comma.
+    Example: 1,2
+    """
+    return prompt
+
+  def _parse_move(self, response):
+    if not response or not response.text:
+      raise ValueError("Gemini API returned an empty or invalid response.")
+
+    # Parse the response text to extract the move
+    response_text = response.text.strip()
+    row_str, col_str = response_text.split(',')
+
+    # For example, if the response is "1,2", we convert it to a tuple (1, 2)
+    return (int(row_str.strip()), int(col_str.strip()))
+
+  def _log(self, message):
+    if self.verbose:
+      print(message)
 
   def _board_to_string(self, board):
     # Converts the board state to a string representation.
@@ -0,0 +1,237 @@
+"""
+Shared Gemini Client Pool, Rate Limiter and Request Coalescing
+
+This module lets many GeminiAgent instances (e.g. the agents of hundreds of
+concurrent games, or the fresh agents Metrics.run_series creates for every game)
+share one connection to the Gemini API instead of each configuring its own.
+
+Key Features:
+- ClientPool: one configured GenerativeModel per (API key, model name), reused
+  by every agent instead of calling genai.configure per agent
+- TokenBucket: rate limiter shared by all agents of a model, so bursts queue
+  locally instead of turning into HTTP 429 responses
+- RequestCoalescer: collects the move requests that arrive within a few
+  milliseconds from different games and sends them as one multi-board prompt
+  (one API call answers up to max_batch boards)
+- Works with any model object that has generate_content(prompt) and optionally
+  generate_content_async(prompt), e.g. the stand-ins in agents/mock_llm.py
+
+Multi-board prompt format:
+- The prompt lists the boards as "Board 1", "Board 2", ...
+- The model answers one line per board: "<board number>: row,col"
+
+Date Created: 2026-10-19
+Version: 1.0
+
+Usage:
+    model = ClientPool.get_model(api_key)
+    limiter = ClientPool.get_limiter(model, requests_per_second=2.0)
+    coalescer = ClientPool.get_coalescer(model, max_batch=8, max_wait=0.02, limiter=limiter)
+    response = await coalescer.generate(single_prompt, board_section)
+"""
+
+# gemini_client.py
+
+import asyncio
+import re
+import threading
+import time
+import weakref
+
+DEFAULT_MODEL_NAME = "gemini-1.5-flash-latest"  # the latest free model
+
+# "<board number>: row,col" lines of a multi-board answer
+BATCH_ANSWER_PATTERN = re.compile(r"^\s*(?:Board\s*)?(\d+)\s*[:.)-]\s*(\d+\s*,\s*\d+)\s*$", re.MULTILINE)
+
+
+async def generate_async(model, prompt):
+    # Uses the model's native async call if it has one, otherwise a worker thread
+    generate = getattr(model, 'generate_content_async', None)
+    if generate is not None:
+        return await generate(prompt)
+    return await asyncio.to_thread(model.generate_content, prompt)
+
+
+class BoardResponse:
+    # Answer for one board of a multi-board request (same .text as a single response)
+    def __init__(self, text):
+        self.text = text
+
+
+class TokenBucket:
+    def __init__(self, rate, capacity=None):
+        self.rate = rate  # Tokens (requests) added per second
+        self.capacity = capacity or max(1.0, rate)  # Largest burst allowed
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()  # Agents may use the bucket from different threads/loops
+        self.stats = {'acquired': 0, 'waits': 0, 'wait_time_sec': 0.0}
+
+    async def acquire(self, tokens=1):
+        # Waits until tokens are available and takes them
+        waited = False
+        while True:
+            delay = self._try_take(tokens)
+            if delay == 0:
+                return
+            if not waited:
+                self.stats['waits'] += 1
+                waited = True
+            self.stats['wait_time_sec'] += delay
+            await asyncio.sleep(delay)
+
+    def _try_take(self, tokens):
+        # Takes the tokens and returns 0, or returns how long to wait for them
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            if self._tokens >= tokens:
+                self._tokens -= tokens
+                self.stats['acquired'] += 1
+                return 0
+            return (tokens - self._tokens) / self.rate
+
+
+class RequestCoalescer:
+    def __init__(self, model, max_batch=8, max_wait=0.02, limiter=None):
+        self.model = model
+        self.limiter = limiter  # Optional TokenBucket; one token per API call
+        self.max_batch = max_batch  # Boards per API call at most
+        self.max_wait = max_wait  # Seconds the first request waits for company
+        self._pending = []  # (single prompt, board section, future)
+        self._timer = None
+        self.stats = {'boards': 0, 'api_calls': 0, 'multi_board_calls': 0, 'unanswered_boards': 0}
+
+    async def generate(self, prompt, section):
+        # Queues one board; returns a response whose .text is "row,col".
+        # prompt is the normal single-board prompt (used when the board goes alone),
+        # section is the board's block inside a multi-board prompt.
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((prompt, section, future))
+        if len(self._pending) >= self.max_batch:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.max_wait, self._flush)
+        return await future
+
+    def _flush(self):
+        # Sends everything queued so far as one request
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch = [item for item in self._pending if not item[2].done()]  # Skip callers that gave up
+        self._pending = []
+        if batch:
+            asyncio.get_running_loop().create_task(self._send(batch))
+
+    async def _send(self, batch):
+        self.stats['boards'] += len(batch)
+        self.stats['api_calls'] += 1
+        try:
+            if self.limiter is not None:
+                await self.limiter.acquire()
+            if len(batch) == 1:
+                prompt, _, future = batch[0]
+                response = await generate_async(self.model, prompt)
+                if not future.done():
+                    future.set_result(response)
+                return
+
+            self.stats['multi_board_calls'] += 1
+            response = await generate_async(self.model, build_batch_prompt([section for _, section, _ in batch]))
+            answers = parse_batch_answer(response.text if response else "")
+            for number, (_, _, future) in enumerate(batch, start=1):
+                if future.done():
+                    continue
+                if number in answers:
+                    future.set_result(BoardResponse(answers[number]))
+                else:
+                    self.stats['unanswered_boards'] += 1
+                    future.set_exception(ValueError(f"No answer for board {number} in the multi-board response."))
+        except Exception as e:
+            for _, _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+
+
+def build_batch_prompt(sections):
+    # One prompt asking for a move on each of several boards
+    boards = "\n\n".join(f"Board {number}:\n{section}" for number, section in enumerate(sections, start=1))
+    return f"""
+    You are playing several independent Tic-Tac-Toe games as an expert AI.
+    For every board below, choose the best move for the given mark.
+    Your goal is to win each game. If you cannot win, ensure a draw. Do not lose.
+
+{boards}
+
+    Only make a move from each board's 'Valid moves' list.
+    Answer with one line per board, in the format: <board number>: row,col
+    Example:
+    1: 1,2
+    2: 0,0
+    """
+
+
+def parse_batch_answer(text):
+    # {board number: "row,col"} from a multi-board answer
+    return {int(number): move.replace(" ", "") for number, move in BATCH_ANSWER_PATTERN.findall(text or "")}
+
+
+class ClientPool:
+    _lock = threading.Lock()
+    _models = {}  # (api_key, model_name) -> GenerativeModel
+    _configured_key = None  # genai.configure is process-wide: last key configured
+    _limiters = {}  # (id(model), rate, capacity) -> TokenBucket
+    _coalescers = weakref.WeakKeyDictionary()  # event loop -> {(model, batch, wait, limiter ids): RequestCoalescer}
+
+    @classmethod
+    def get_model(cls, api_key, model_name=DEFAULT_MODEL_NAME):
+        # One configured model per key and name, created on first use
+        with cls._lock:
+            model = cls._models.get((api_key, model_name))
+            if model is None:
+                import google.generativeai as genai  # Imported on first real API use only
+                if cls._configured_key != api_key:
+                    genai.configure(api_key=api_key)
+                    cls._configured_key = api_key
+                model = genai.GenerativeModel(model_name)
+                cls._models[(api_key, model_name)] = model
+            return model
+
+    @classmethod
+    def get_limiter(cls, model, requests_per_second, burst=None):
+        # Rate limiter shared by every agent that uses model with the same limits
+        with cls._lock:
+            key = (id(model), requests_per_second, burst)
+            if key not in cls._limiters:
+                cls._limiters[key] = TokenBucket(requests_per_second, burst)
+            return cls._limiters[key]
+
+    @classmethod
+    def get_coalescer(cls, model, max_batch=8, max_wait=0.02, limiter=None):
+        # Coalescer for model in the running event loop (futures cannot cross loops)
+        loop = asyncio.get_running_loop()
+        with cls._lock:
+            coalescers = cls._coalescers.setdefault(loop, {})
+            key = (id(model), max_batch, max_wait, id(limiter))
+            if key not in coalescers:
+                coalescers[key] = RequestCoalescer(model, max_batch, max_wait, limiter)
+            return coalescers[key]
+
+    @classmethod
+    def get_stats(cls):
+        # Limiter and coalescer counters, summed over the pool
+        stats = {'models': len(cls._models), 'rate_limit_waits': 0, 'rate_limit_wait_sec': 0.0,
+                 'boards': 0, 'api_calls': 0, 'multi_board_calls': 0, 'unanswered_boards': 0}
+        with cls._lock:
+            for limiter in cls._limiters.values():
+                stats['rate_limit_waits'] += limiter.stats['waits']
+                stats['rate_limit_wait_sec'] += limiter.stats['wait_time_sec']
+            for coalescers in list(cls._coalescers.values()):
+                for coalescer in coalescers.values():
+                    for name in ('boards', 'api_calls', 'multi_board_calls', 'unanswered_boards'):
+                        stats[name] += coalescer.stats[name]
+        stats['rate_limit_wait_sec'] = round(stats['rate_limit_wait_sec'], 3)
+        return stats
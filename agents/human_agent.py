@@ -18,6 +18,10 @@ class HumanAgent:
         self.mark = mark # 'X' or 'O'
         self.nodes_expanded = 0  # node counter (always zero)
 
+    def reset_for_new_game(self):
+        # Nothing carries over between games
+        self.nodes_expanded = 0
+
     def get_action(self, board):
         """
         Get the player's move from command-line input
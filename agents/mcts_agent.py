@@ -0,0 +1,157 @@
+"""
+Monte Carlo Tree Search Agent (PUCT)
+
+This module implements an MCTS agent in the style of AlphaZero: instead of
+searching every move to a fixed depth, it grows a tree one simulation at a time
+and spends the simulations on the moves that look most promising. Each
+simulation selects a path with the PUCT rule, expands the leaf once and backs up
+a value estimate for it.
+
+Key Features:
+- PUCT selection: Q(s, a) + c_puct * P(s, a) * sqrt(N(s)) / (1 + N(s, a))
+- Priors P(s, a) and leaf values from a ValueNetwork (agents/value_network.py)
+- Loads the shipped weights for the board size when no network is given
+- Falls back to uniform priors and random playouts without any network
+- Terminal positions are scored exactly (+1 win, 0 draw, -1 loss)
+- Fixed simulation budget per move; the most visited move is played
+
+Date Created: 2026-10-19
+Version: 1.0
+
+Usage:
+    agent = MCTSAgent(mark='O', network=ValueNetwork.load("models/value_net_3x3.npz"))
+    best_action = agent.get_action(current_game_state)
+"""
+
+# mcts_agent.py
+
+import math
+import os
+import random
+from agents.value_network import ValueNetwork, default_model_path
+
+
+class MCTSNode:
+    __slots__ = ('to_move', 'prior', 'visits', 'value_sum', 'children')
+
+    def __init__(self, to_move, prior):
+        self.to_move = to_move  # Mark of the player to move in this node
+        self.prior = prior  # P(s, a) of the move leading here
+        self.visits = 0
+        self.value_sum = 0.0  # Sum of values for the player who moved into this node
+        self.children = None  # move -> MCTSNode, None until expanded
+
+    def q_value(self):
+        return self.value_sum / self.visits if self.visits else 0.0
+
+
+class MCTSAgent:
+    def __init__(self, mark, eval_fn=None, max_depth=None, network=None, simulations=200,
+                 c_puct=1.5, seed=None, **kwargs):
+        # eval_fn and max_depth are accepted for a uniform constructor but unused:
+        # positions are scored by the network (or random playouts)
+        self.mark = mark
+        self.opponent_mark = 'O' if mark == 'X' else 'X'
+        self.network = network  # ValueNetwork, or None to load the default weights
+        self.simulations = simulations  # Simulations per move
+        self.c_puct = c_puct  # Exploration constant
+        self.random = random.Random(seed)
+        self.nodes_expanded = 0
+        self.last_value = None  # Mean value of the chosen move for this agent after the last search
+        self._network_checked = network is not None
+
+    def reset_for_new_game(self, seed=None):
+        # Prepares the agent for another game; the network stays loaded.
+        # seed restarts the random generator as a new agent with that seed would.
+        self.nodes_expanded = 0
+        self.last_value = None
+        if seed is not None:
+            self.random.seed(seed)
+
+    def get_action(self, state):
+        # Runs the simulations from state and returns the most visited move
+        self._ensure_network(state.size)
+        self.nodes_expanded = 0
+        root = MCTSNode(self.mark, 1.0)
+        self._expand(root, state)
+
+        for _ in range(self.simulations):
+            self._simulate(root, state)
+
+        move, child = max(root.children.items(), key=lambda item: item[1].visits)
+        self.last_value = child.q_value()
+        return move
+
+    def _ensure_network(self, size):
+        # Loads the shipped weights for this board size once, if they exist
+        if self._network_checked:
+            return
+        self._network_checked = True
+        path = default_model_path(size)
+        if os.path.exists(path):
+            self.network = ValueNetwork.load(path)
+
+    def _simulate(self, root, state):
+        # One selection / expansion / backup pass from the root
+        node, path = root, [root]
+        while node.children:
+            move, node = self._select(node)
+            state = state.generate_successor(move, path[-1].to_move)
+            path.append(node)
+
+        mover = path[-2].to_move if len(path) > 1 else None
+        winner = state.get_winner()
+        if winner is not None:
+            value = 1.0 if winner == mover else -1.0
+        elif state.is_full():
+            value = 0.0
+        else:
+            # Value of the leaf for its side to move, seen from the player who moved into it
+            value = -self._expand(node, state)
+
+        # Back up: each node stores the value for the player who moved into it
+        for visited in reversed(path):
+            visited.visits += 1
+            visited.value_sum += value
+            value = -value
+
+    def _select(self, node):
+        # Child with the highest PUCT score
+        sqrt_visits = math.sqrt(node.visits)
+        best_score, best_item = float('-inf'), None
+        for move, child in node.children.items():
+            score = child.q_value() + self.c_puct * child.prior * sqrt_visits / (1 + child.visits)
+            if score > best_score:
+                best_score, best_item = score, (move, child)
+        return best_item
+
+    def _expand(self, node, state):
+        # Creates the children of node and returns the value for its side to move
+        self.nodes_expanded += 1
+        moves = state.get_legal_actions()
+        next_to_move = 'O' if node.to_move == 'X' else 'X'
+
+        if self.network is None:
+            priors = {move: 1.0 / len(moves) for move in moves}
+            value = self._playout(state, node.to_move)
+        else:
+            array = state.to_array()[None]
+            priors = self.network.policy(state)
+            value = float(self.network.evaluate_batch(array)[0])
+            if self.network.perspective != node.to_move:
+                value = -value
+
+        node.children = {move: MCTSNode(next_to_move, priors[move]) for move in moves}
+        return value
+
+    def _playout(self, state, to_move):
+        # Random game to the end; +1 if to_move wins, -1 if it loses, 0 for a draw
+        player = to_move
+        while not state.is_terminal():
+            move = self.random.choice(state.get_legal_actions())
+            state = state.generate_successor(move, player)
+            player = 'O' if player == 'X' else 'X'
+        winner = state.get_winner()
+        if winner is None:
+            return 0.0
+        return 1.0 if winner == to_move else -1.0
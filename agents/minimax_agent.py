@@ -10,6 +10,11 @@ Key Features:
 - Alternates between maximizing and minimizing players
 - Uses an evaluation function to score terminal or depth-limited states
 - Guarantees optimal play assuming both players play perfectly
+- Optional transposition table (reuse_search=True) that keeps results between moves
+- Optional pondering (ponder=True) that searches the likely replies on the opponent's time
+- Optional exact endgame solver (endgame_threshold=N) once N or fewer cells are empty
+- Optional batched leaf evaluation (batch_leaves=True): the children of a node one
+  ply above the depth limit are scored with one eval_fn.evaluate_batch call
 
 Author:Wentao Ma
 Date Created: July 09, 2025
@@ -22,33 +27,119 @@ Usage:
 
 # minimax_agent.py
 
+from agents.transposition_table import TranspositionTable, EXACT
+from agents.ponder import Ponderer, SearchAborted
+from agents.endgame_solver import EndgameSolver
+from agents.batch_eval import count_open_children, evaluate_children, supports_batch
+
+
 class MinimaxAgent:
-    def __init__(self, eval_fn, max_depth, mark):
+    def __init__(self, eval_fn, max_depth, mark, reuse_search=False, max_table_entries=500_000,
+                 ponder=False, endgame_threshold=0, batch_leaves=False):
         # Store the evaluation function and maximum search depth for the agent
         self.eval_fn = eval_fn  # Evaluation function
         self.max_depth = max_depth  # Maximum search depth
         self.mark = mark
         self.opponent_mark = 'O' if mark == 'X' else 'X'  # Determine opponent's mark
         self.nodes_expanded = 0
+        # Transposition table kept between get_action calls (None = search from scratch).
+        # Pondering needs the table to hand its results over to the real search.
+        self.table = TranspositionTable(max_table_entries) if reuse_search or ponder else None
+        self.last_search_stats = None  # Table statistics of the last search
+        self.last_value = None  # Root value of the last search (None if the endgame solver chose the move)
+        self._cutoffs = 0  # Depth cut-offs so far, used to mark complete subtrees
+        # Background search on the opponent's time (None = pondering off)
+        self.ponderer = Ponderer(self) if ponder else None
+        self._abort = None  # Set on the copy that ponders; stops its search early
+        # Exact solver used once at most endgame_threshold empty cells remain (0 = off)
+        self.endgame_threshold = endgame_threshold
+        self.endgame = EndgameSolver() if endgame_threshold > 0 else None
+        # Score the last ply in one call per parent when eval_fn has evaluate_batch
+        self.batch_leaves = batch_leaves and supports_batch(eval_fn)
+
+    def reset_for_new_game(self):
+        # Reuses the agent for the next game of a series (table and endgame memo stay warm)
+        if self.ponderer is not None:
+            self.ponderer.reset()
+        if self.table is not None:
+            self.table.keep_unreachable = True
+        self.nodes_expanded = 0
+        self.last_value = None
+        self.last_search_stats = None
+        self._cutoffs = 0
 
     def get_action(self, state):
         # Returns the best action for the current state using the minimax algorithm
         # The agent assumes it is the maximizing player at the root
+        if self.ponderer is not None:
+            pondered = self.ponderer.collect(state)
+            if pondered is not None:
+                # This reply was already searched while the opponent was thinking
+                self.nodes_expanded = pondered['nodes_expanded']  # Nodes of the pondered search
+                self.last_value = pondered['search_value']
+                self.last_search_stats = pondered['search_stats']
+                self.ponderer.start(state.generate_successor(pondered['action'], self.mark))
+                return pondered['action']
+
         self.nodes_expanded = 0
-        _, action = self.minimax(state, self.max_depth, True)
+        if self.endgame is not None and len(state.get_valid_moves()) <= self.endgame_threshold:
+            # Few empty cells left: solve exactly instead of stopping at max_depth
+            action = self.endgame.best_move(state, self.mark)
+            self.nodes_expanded = self.endgame.nodes_expanded
+            self.last_value = None  # Solver scores are not on the eval_fn scale
+        else:
+            if self.table is not None:
+                self.table.new_search(state, retain=self._abort is None)
+            self.last_value, action = self.minimax(state, self.max_depth, True)
+            if self.table is not None:
+                self.last_search_stats = self.table.search_stats(self.nodes_expanded)
+        if self.ponderer is not None:
+            self.ponderer.start(state.generate_successor(action, self.mark))
         return action
 
+    def reply_key(self, state):
+        # Table key of state when the opponent is to move (used by the ponderer)
+        return state.get_key() + (False,)
+
     def minimax(self, state, depth, maximizing_player):
         # Recursive minimax search function
         # state: current game state
         # depth: remaining search depth
         # maximizing_player: True if it's the maximizing player's turn, False otherwise
+        if self._abort is not None and self._abort.is_set():
+            raise SearchAborted()
         self.nodes_expanded += 1
 
         # Base case: if the state is terminal or depth limit is reached, evaluate the state
-        if state.is_terminal() or depth == 0:
+        terminal = state.is_terminal()
+        if terminal or depth == 0:
+            if not terminal:
+                self._cutoffs += 1  # Depth limit reached before the game ended
             return self.eval_fn(state), None
 
+        if self.table is not None:
+            return self._minimax_with_table(state, depth, maximizing_player)
+        return self._minimax_children(state, depth, maximizing_player)
+
+    def _minimax_with_table(self, state, depth, maximizing_player):
+        # Looks the node up in the transposition table before searching it
+        key = state.get_key() + (maximizing_player,)
+        entry = self.table.probe(key, depth)
+        if entry is not None:
+            if not entry.complete:
+                self._cutoffs += 1
+            return entry.value, entry.best_move
+
+        nodes_before, cutoffs_before = self.nodes_expanded, self._cutoffs
+        value, action = self._minimax_children(state, depth, maximizing_player)
+        self.table.store(key, depth, value, EXACT, action,
+                         self._cutoffs == cutoffs_before, self.nodes_expanded - nodes_before)
+        return value, action
+
+    def _minimax_children(self, state, depth, maximizing_player):
+        # Searches every child of a non-terminal node
+        if self.batch_leaves and depth == 1:
+            return self._minimax_leaves(state, maximizing_player)
         if maximizing_player:
             # Maximizing player's turn: try to maximize the evaluation value
             max_eval, best_action = float('-inf'), None
@@ -68,4 +159,20 @@ class MinimaxAgent:
                 # Update the best value and action if a lower value is found
                 if value < min_eval:
                     min_eval, best_action = value, action
-            return min_eval, best_action
\ No newline at end of file
+            return min_eval, best_action
+
+    def _minimax_leaves(self, state, maximizing_player):
+        # Node at depth 1: scores all children with a single batched eval_fn call
+        mark = self.mark if maximizing_player else self.opponent_mark
+        actions = state.get_legal_actions()
+        self.nodes_expanded += len(actions)
+        if self.table is not None:
+            self._cutoffs += count_open_children(state, actions, mark)
+        values = evaluate_children(self.eval_fn, state, actions, mark)
+
+        # Same tie-breaking as the scalar loop: the first best action wins
+        best_index = 0
+        for index, value in enumerate(values):
+            if (value > values[best_index]) if maximizing_player else (value < values[best_index]):
+                best_index = index
+        return values[best_index], actions[best_index]
\ No newline at end of file
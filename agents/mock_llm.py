@@ -0,0 +1,211 @@
+"""
+Local Stand-ins for the Gemini API
+
+This module provides offline replacements for the Gemini model used by
+GeminiAgent, so LLM-driven games can be tested and benchmarked without an API
+key, network access or cost. Both stand-ins answer the agent's prompt with a
+move from its "Valid moves" list after a configurable delay, and fail with a
+configurable probability.
+
+Key Features:
+- MockGeminiModel: in-process model with generate_content and
+  generate_content_async (the same methods GeminiAgent calls on the real model)
+- MockGeminiServer: localhost HTTP server (POST /generate) in a background
+  thread, for tests that should include a real network round trip
+- HTTPModel: client for MockGeminiServer with the same two methods
+- Configurable latency, latency jitter and error rate, optional seeded randomness
+- Optional server-side rate limit that answers excess requests with a "429" error
+- Answers multi-board prompts (agents/gemini_client.py) with one line per board
+- Call statistics, including the peak number of requests in flight
+
+Date Created: 2026-10-19
+Version: 1.0
+
+Usage:
+    agent = GeminiAgent(mark='O', model=MockGeminiModel(latency=0.2, error_rate=0.1))
+
+    with MockGeminiServer(latency=0.05) as server:
+        agent = GeminiAgent(mark='O', model=HTTPModel(server.url))
+"""
+
+# mock_llm.py
+
+import ast
+import asyncio
+import json
+import random
+import re
+import threading
+import time
+import urllib.request
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# The "Valid moves ...: [(0, 1), ...]" line of GeminiAgent's prompt
+VALID_MOVES_PATTERN = re.compile(r"Valid moves[^:\n]*:\s*(\[[^\]]*\])")
+
+
+class MockAPIError(Exception):
+    # Simulated API failure (e.g. HTTP 429/503 from the real service)
+    pass
+
+
+class MockResponse:
+    # Minimal response object with the .text attribute GeminiAgent reads
+    def __init__(self, text):
+        self.text = text
+
+
+def answer_prompt(prompt, rng, choose_move=None):
+    # Picks a move from the prompt's valid moves and formats it as "row,col".
+    # A multi-board prompt (several valid move lists) gets one "<board>: row,col" line per board.
+    boards = [ast.literal_eval(match) for match in VALID_MOVES_PATTERN.findall(prompt)]
+    answers = []
+    for valid_moves in boards:
+        if not valid_moves:
+            answers.append("")
+            continue
+        move = choose_move(prompt, valid_moves) if choose_move else rng.choice(valid_moves)
+        answers.append(f"{move[0]},{move[1]}")
+    if len(answers) == 1:
+        return answers[0]
+    return "\n".join(f"{number}: {answer}" for number, answer in enumerate(answers, start=1))
+
+
+class MockGeminiModel:
+    def __init__(self, latency=0.05, jitter=0.0, error_rate=0.0, seed=None, choose_move=None, rate_limit=None):
+        self.latency = latency  # Seconds per request
+        self.jitter = jitter  # Extra uniform random delay in [0, jitter] seconds
+        self.error_rate = error_rate  # Probability that a request fails
+        self.choose_move = choose_move  # Optional choose_move(prompt, valid_moves) -> (row, col)
+        self.rate_limit = rate_limit  # Requests per second before "429" errors (None = unlimited)
+        self.random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._recent_calls = deque()  # Start times of the calls in the last second
+        self.stats = {'calls': 0, 'errors': 0, 'rate_limited': 0, 'in_flight': 0, 'peak_in_flight': 0}
+
+    def generate_content(self, prompt):
+        # Blocking call, like the SDK's GenerativeModel.generate_content
+        delay, fail = self._begin()
+        try:
+            time.sleep(delay)
+            return self._respond(prompt, fail)
+        finally:
+            self._end()
+
+    async def generate_content_async(self, prompt):
+        # Non-blocking call, like the SDK's GenerativeModel.generate_content_async
+        delay, fail = self._begin()
+        try:
+            await asyncio.sleep(delay)
+            return self._respond(prompt, fail)
+        finally:
+            self._end()
+
+    def _begin(self):
+        # Records the call and draws its delay and outcome
+        with self._lock:
+            self.stats['calls'] += 1
+            self.stats['in_flight'] += 1
+            self.stats['peak_in_flight'] = max(self.stats['peak_in_flight'], self.stats['in_flight'])
+            delay = self.latency + self.random.uniform(0, self.jitter)
+            fail = self.random.random() < self.error_rate
+            if self.rate_limit is not None:
+                now = time.monotonic()
+                while self._recent_calls and now - self._recent_calls[0] > 1.0:
+                    self._recent_calls.popleft()
+                self._recent_calls.append(now)
+                if len(self._recent_calls) > self.rate_limit:
+                    fail = 'rate_limited'
+        return delay, fail
+
+    def _end(self):
+        with self._lock:
+            self.stats['in_flight'] -= 1
+
+    def _respond(self, prompt, fail):
+        if fail == 'rate_limited':
+            with self._lock:
+                self.stats['rate_limited'] += 1
+            raise MockAPIError("429 Too Many Requests (simulated)")
+        if fail:
+            with self._lock:
+                self.stats['errors'] += 1
+            raise MockAPIError("503 Service Unavailable (simulated)")
+        with self._lock:
+            text = answer_prompt(prompt, self.random, self.choose_move)
+        return MockResponse(text)
+
+
+class MockGeminiServer:
+    def __init__(self, host="127.0.0.1", port=0, latency=0.05, jitter=0.0, error_rate=0.0, seed=None,
+                 rate_limit=None):
+        # port=0 picks a free port; see .url once started
+        self.model = MockGeminiModel(latency, jitter, error_rate, seed, rate_limit=rate_limit)
+        self._server = ThreadingHTTPServer((host, port), self._make_handler())
+        self._server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/generate"
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, name="mock-gemini-server", daemon=True)
+        self._thread.start()
+        return self
+
+    def close(self):
+        self._server.shutdown()
+        self._server.server_close()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _make_handler(self):
+        model = self.model
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                # Body: {"prompt": "..."}; reply: {"text": "row,col"} or HTTP 429/503
+                length = int(self.headers.get("Content-Length", 0))
+                prompt = json.loads(self.rfile.read(length) or b"{}").get("prompt", "")
+                try:
+                    status, body = 200, {"text": model.generate_content(prompt).text}
+                except MockAPIError as e:
+                    status, body = int(str(e)[:3]), {"error": str(e)}
+                payload = json.dumps(body).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, *args):
+                pass  # Keep benchmark output clean
+
+        return Handler
+
+
+class HTTPModel:
+    def __init__(self, url, timeout=30.0):
+        self.url = url  # e.g. MockGeminiServer.url
+        self.timeout = timeout  # Socket timeout per request
+
+    def generate_content(self, prompt):
+        # Blocking HTTP round trip; HTTP errors raise urllib.error.HTTPError
+        request = urllib.request.Request(self.url, data=json.dumps({"prompt": prompt}).encode(),
+                                         headers={"Content-Type": "application/json"}, method="POST")
+        with urllib.request.urlopen(request, timeout=self.timeout) as response:
+            return MockResponse(json.loads(response.read())["text"])
+
+    async def generate_content_async(self, prompt):
+        # urllib has no async API, so the request runs on a worker thread
+        return await asyncio.to_thread(self.generate_content, prompt)
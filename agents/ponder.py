@@ -0,0 +1,117 @@
+"""
+Pondering (searching on the opponent's time)
+
+This module lets a search agent keep working while the opponent thinks. After the
+agent returns its move, a background thread searches the positions the opponent
+can reach with each reply, most likely reply first. The results land in the
+agent's transposition table and in a small reply -> move map. When the real reply
+arrives the thread is stopped: a reply that was searched to the end is answered
+immediately, and partial work on it is still picked up through the table. Work on
+the other replies is discarded.
+
+Key Features:
+- Background thread that never runs at the same time as the agent's own search
+- Replies ordered by the best reply remembered in the transposition table
+- Stops within one node once the real reply is known (cooperative abort)
+- Statistics on how often the real reply had already been searched
+
+Date Created: 2026-10-19
+Version: 1.0
+
+Usage:
+    agent = AlphaBetaAgent(eval_fn, max_depth, mark='O', ponder=True)
+    # get_action() starts and collects pondering on its own
+    agent.ponderer.stop()  # when the game is over
+"""
+
+# ponder.py
+
+import copy
+import threading
+
+
+class SearchAborted(Exception):
+    # Raised inside a pondering search once the real reply has arrived
+    pass
+
+
+class Ponderer:
+    def __init__(self, agent):
+        self.agent = agent  # Search agent with a transposition table
+        self._thread = None
+        self._abort = threading.Event()
+        self._results = {}  # Position key after a reply -> result of the search
+        self._active = False  # True between start() and collect()
+        self.stats = {'ponder_hits': 0, 'ponder_misses': 0, 'replies_searched': 0}
+
+    def start(self, state):
+        # Starts pondering on state, the position right after the agent's own move
+        self.stop()
+        if state.is_terminal():
+            return
+        self._abort = threading.Event()
+        self._results = {}
+        self._active = True
+        self._thread = threading.Thread(target=self._run, args=(state, self._abort), daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        # Stops the background search and waits for the thread to finish
+        if self._thread is not None:
+            self._abort.set()
+            self._thread.join()
+            self._thread = None
+
+    def reset(self):
+        # Stops pondering and forgets its results (the game is over)
+        self.stop()
+        self._results = {}
+        self._active = False
+
+    def collect(self, state):
+        # Stops pondering once the opponent has replied.
+        # Returns a dict with the action (and the search's value, statistics, tree
+        # and nodes expanded) if state was searched to the end, otherwise None.
+        self.stop()
+        if not self._active:
+            return None
+        result = self._results.get(state.get_key())
+        self._results = {}
+        self._active = False
+        if result is None:
+            self.stats['ponder_misses'] += 1
+        else:
+            self.stats['ponder_hits'] += 1
+        return result
+
+    def _likely_replies(self, state):
+        # Opponent replies, the one the last search expected first
+        replies = state.get_legal_actions()
+        expected = self.agent.table.best_move(self.agent.reply_key(state))
+        if expected in replies:
+            replies.remove(expected)
+            replies.insert(0, expected)
+        return replies
+
+    def _run(self, state, abort):
+        # Background thread: search every reply until aborted
+        searcher = copy.copy(self.agent)  # Shares eval_fn and the transposition table
+        searcher.ponderer = None
+        searcher._abort = abort
+
+        for reply in self._likely_replies(state):
+            position = state.generate_successor(reply, self.agent.opponent_mark)
+            if position.is_terminal():
+                continue
+            try:
+                action = searcher.get_action(position)
+            except SearchAborted:
+                return
+            self._results[position.get_key()] = {
+                'action': action,
+                'search_value': searcher.last_value,
+                'search_stats': searcher.last_search_stats,
+                'search_tree': getattr(searcher, 'last_search_tree', None),
+                'nodes_expanded': searcher.nodes_expanded
+            }
+            self.stats['replies_searched'] += 1
@@ -0,0 +1,128 @@
+"""
+Lazy Agent and View Registry
+
+This module maps agent and view names (the strings used by main.py's menus,
+pruning_visual_test.py and the select_agent helpers) to "module:attribute"
+targets and imports a module only when its agent or view is actually chosen.
+Importing the registry itself costs nothing: it does not touch the Gemini SDK,
+dotenv, pygame, matplotlib or networkx, so headless benchmarks and the many
+short-lived processes of batch jobs start quickly.
+
+Key Features:
+- AGENTS / VIEWS: ordered name -> spec tables, in menu order
+- load_agent / load_view: import and return the class on first use (cached by Python)
+- Optional default constructor arguments per lookup (load_agent('gemini', cache=True))
+- agent_available / view_available: check optional dependencies with
+  importlib.util.find_spec, without importing them
+- register_agent / register_view: add plug-in agents or views at runtime
+
+Date Created: 2026-10-19
+Version: 1.0
+
+Usage:
+    from agents.registry import agent_names, load_agent, create_agent
+    AgentClass = load_agent('alphabeta')
+    agent = create_agent('minimax', 'O', eval_fn=eval_fn, max_depth=9)
+    GUIView = load_view('gui')
+"""
+
+# registry.py
+
+import importlib
+import importlib.util
+from functools import partial
+
+
+class PluginSpec:
+    def __init__(self, name, target, label=None, search=False, requires=()):
+        self.name = name
+        self.target = target  # "package.module:Attribute"
+        self.label = label or name  # Display name in menus
+        self.search = search  # Takes eval_fn and max_depth (tree-search agents)
+        self.requires = tuple(requires)  # Optional third-party packages the module imports
+
+    def load(self):
+        # Imports the module and returns the class
+        module_name, attribute = self.target.split(":")
+        return getattr(importlib.import_module(module_name), attribute)
+
+    def available(self):
+        # True if every optional dependency is installed (nothing is imported)
+        for package in self.requires:
+            try:
+                if importlib.util.find_spec(package) is None:
+                    return False
+            except (ImportError, ValueError):
+                return False
+        return True
+
+
+# Agents in menu order
+AGENTS = {
+    'minimax': PluginSpec('minimax', 'agents.minimax_agent:MinimaxAgent', 'Minimax', search=True),
+    'alphabeta': PluginSpec('alphabeta', 'agents.alpha_beta_agent:AlphaBetaAgent', 'Alpha-Beta', search=True),
+    'expectiminimax': PluginSpec('expectiminimax', 'agents.expectiminimax_agent:ExpectiminimaxAgent',
+                                 'Expectiminimax', search=True),
+    'gemini': PluginSpec('gemini', 'agents.gemini_agent:GeminiAgent', 'Gemini',
+                         requires=('google.generativeai', 'dotenv')),
+    'human': PluginSpec('human', 'agents.human_agent:HumanAgent', 'Human'),
+    'proofnumber': PluginSpec('proofnumber', 'agents.proof_number_agent:ProofNumberAgent', 'Proof-Number'),
+    'mcts': PluginSpec('mcts', 'agents.mcts_agent:MCTSAgent', 'MCTS')
+}
+
+# Views and diagrams
+VIEWS = {
+    'cli': PluginSpec('cli', 'visualization.cli_view:CLIView', 'Command line'),
+    'gui': PluginSpec('gui', 'visualization.gui_view:GUIView', 'Pygame window', requires=('pygame',)),
+    'tree': PluginSpec('tree', 'visualization.tree_diagram:TreeDiagram', 'Search tree diagram',
+                       requires=('matplotlib',))
+}
+
+
+def register_agent(name, target, label=None, search=False, requires=()):
+    # Adds (or replaces) an agent; target is "module:Class"
+    AGENTS[name] = PluginSpec(name, target, label, search, requires)
+
+
+def register_view(name, target, label=None, requires=()):
+    VIEWS[name] = PluginSpec(name, target, label, requires=requires)
+
+
+def agent_names():
+    return list(AGENTS)
+
+
+def get_agent_spec(name):
+    spec = AGENTS.get(name.lower()) if name else None
+    if spec is None:
+        raise ValueError(f"Unknown agent type: {name}")
+    return spec
+
+
+def agent_available(name):
+    return name in AGENTS and AGENTS[name].available()
+
+
+def load_agent(name, **defaults):
+    # The agent class, or a partial with default constructor arguments
+    agent_class = get_agent_spec(name).load()
+    return partial(agent_class, **defaults) if defaults else agent_class
+
+
+def create_agent(name, mark, eval_fn=None, max_depth=None, **kwargs):
+    # Instantiates an agent; eval_fn and max_depth only go to search agents
+    spec = get_agent_spec(name)
+    if spec.search:
+        kwargs.update(eval_fn=eval_fn, max_depth=max_depth)
+    return spec.load()(mark=mark, **kwargs)
+
+
+def view_available(name):
+    return name in VIEWS and VIEWS[name].available()
+
+
+def load_view(name):
+    spec = VIEWS.get(name)
+    if spec is None:
+        raise ValueError(f"Unknown view: {name}")
+    return spec.load()
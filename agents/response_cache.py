@@ -0,0 +1,180 @@
+"""
+Persistent Response Cache for LLM Agents
+
+This module stores the moves returned by the Gemini API in a small SQLite file,
+so a position that was already asked about (in this run or an earlier one) is
+answered locally instead of with another paid, slow API call. Positions that are
+rotations or reflections of each other share one entry: every board is reduced
+to a canonical form before lookup, and the cached move is mapped back through the
+same symmetry.
+
+Key Features:
+- SQLite file, safe to share between agents and threads of one process
+- Key: canonical board (smallest of the 8 symmetric forms) + mark + prompt version
+- Moves are stored in canonical coordinates and mapped back on lookup
+- Time-to-live (TTL) per entry and a size bound with least-recently-used eviction
+- Hit / miss / expiry / eviction statistics
+
+Date Created: 2026-10-19
+Version: 1.0
+
+Usage:
+    cache = ResponseCache("results/gemini_cache.sqlite", ttl=7 * 24 * 3600, max_entries=100_000)
+    move = cache.get(board, 'O', prompt_version=2)     # None on a miss
+    cache.put(board, 'O', prompt_version=2, move=(1, 1))
+"""
+
+# response_cache.py
+
+import os
+import sqlite3
+import threading
+import time
+
+DEFAULT_CACHE_PATH = os.path.join("results", "gemini_cache.sqlite")
+
+# The 8 symmetries of a square board: (row, col, size) -> (row, col) in the transformed board
+SYMMETRIES = (
+    lambda r, c, n: (r, c),                  # identity
+    lambda r, c, n: (c, n - 1 - r),          # rotate 90 degrees clockwise
+    lambda r, c, n: (n - 1 - r, n - 1 - c),  # rotate 180 degrees
+    lambda r, c, n: (n - 1 - c, r),          # rotate 270 degrees clockwise
+    lambda r, c, n: (r, n - 1 - c),          # mirror left-right
+    lambda r, c, n: (n - 1 - r, c),          # mirror top-bottom
+    lambda r, c, n: (c, r),                  # transpose (main diagonal)
+    lambda r, c, n: (n - 1 - c, n - 1 - r)   # anti-diagonal
+)
+INVERSE = (0, 3, 2, 1, 4, 5, 6, 7)  # Index of the symmetry that undoes each one
+
+
+def canonical_form(board):
+    # Returns (canonical board string, index of the symmetry that produces it)
+    n = board.size
+    cells = [[board.board[r, c] or '.' for c in range(n)] for r in range(n)]
+    best = None
+    for index, transform in enumerate(SYMMETRIES):
+        grid = [[None] * n for _ in range(n)]
+        for r in range(n):
+            for c in range(n):
+                new_r, new_c = transform(r, c, n)
+                grid[new_r][new_c] = cells[r][c]
+        text = "/".join("".join(row) for row in grid)
+        if best is None or text < best[0]:
+            best = (text, index)
+    return best
+
+
+def to_canonical(move, symmetry, size):
+    # Maps a move on the real board to the canonical board
+    return SYMMETRIES[symmetry](move[0], move[1], size)
+
+
+def from_canonical(move, symmetry, size):
+    # Maps a move on the canonical board back to the real board
+    return SYMMETRIES[INVERSE[symmetry]](move[0], move[1], size)
+
+
+class ResponseCache:
+    _default = None  # Shared instance behind ResponseCache.default()
+    _default_lock = threading.Lock()
+
+    def __init__(self, path=DEFAULT_CACHE_PATH, ttl=7 * 24 * 3600, max_entries=100_000):
+        self.path = path
+        self.ttl = ttl  # Seconds an entry stays valid (None = forever)
+        self.max_entries = max_entries  # Size bound; the least recently used 10% go when exceeded
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            "key TEXT PRIMARY KEY, row INTEGER, col INTEGER, created REAL, last_used REAL)")
+        self._db.execute("CREATE INDEX IF NOT EXISTS responses_last_used ON responses (last_used)")
+        self._db.commit()
+        self.stats = {'hits': 0, 'misses': 0, 'expired': 0, 'evicted': 0}
+        self.purge_expired()
+        self._entries = self._db.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+
+    @classmethod
+    def default(cls):
+        # One cache at DEFAULT_CACHE_PATH shared by every agent created with cache=True
+        with cls._default_lock:
+            if cls._default is None:
+                cls._default = cls()
+        return cls._default
+
+    def get(self, board, mark, prompt_version):
+        # Cached move for this position (mapped to the real board), or None
+        canonical, symmetry = canonical_form(board)
+        key = self._key(canonical, board.size, mark, prompt_version)
+        now = time.time()
+        with self._lock:
+            row = self._db.execute("SELECT row, col, created FROM responses WHERE key = ?", (key,)).fetchone()
+            if row is not None and self.ttl is not None and now - row[2] > self.ttl:
+                self._db.execute("DELETE FROM responses WHERE key = ?", (key,))
+                self._db.commit()
+                self._entries -= 1
+                self.stats['expired'] += 1
+                row = None
+            if row is None:
+                self.stats['misses'] += 1
+                return None
+            self._db.execute("UPDATE responses SET last_used = ? WHERE key = ?", (now, key))
+            self._db.commit()
+            self.stats['hits'] += 1
+        return from_canonical((row[0], row[1]), symmetry, board.size)
+
+    def put(self, board, mark, prompt_version, move):
+        # Stores the move chosen on board by mark
+        canonical, symmetry = canonical_form(board)
+        key = self._key(canonical, board.size, mark, prompt_version)
+        row, col = to_canonical(move, symmetry, board.size)
+        now = time.time()
+        with self._lock:
+            cursor = self._db.execute(
+                "INSERT OR IGNORE INTO responses (key, row, col, created, last_used) VALUES (?, ?, ?, ?, ?)",
+                (key, row, col, now, now))
+            if cursor.rowcount:
+                self._entries += 1
+            else:
+                self._db.execute("UPDATE responses SET row = ?, col = ?, created = ?, last_used = ? WHERE key = ?",
+                                 (row, col, now, now, key))
+            if self._entries > self.max_entries:
+                self._evict(self._entries - int(self.max_entries * 0.9))
+            self._db.commit()
+
+    def purge_expired(self):
+        # Deletes every entry older than the TTL
+        if self.ttl is None:
+            return
+        with self._lock:
+            cursor = self._db.execute("DELETE FROM responses WHERE created < ?", (time.time() - self.ttl,))
+            self._db.commit()
+            self.stats['expired'] += cursor.rowcount
+
+    def get_stats(self):
+        # Counters since this cache was opened, plus the current size
+        lookups = self.stats['hits'] + self.stats['misses']
+        return dict(self.stats, entries=self._entries,
+                    hit_rate=round(self.stats['hits'] / lookups, 4) if lookups else 0.0)
+
+    def clear(self):
+        with self._lock:
+            self._db.execute("DELETE FROM responses")
+            self._db.commit()
+            self._entries = 0
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+    def _evict(self, count):
+        # Removes the count least recently used entries (caller holds the lock)
+        self._db.execute(
+            "DELETE FROM responses WHERE key IN (SELECT key FROM responses ORDER BY last_used LIMIT ?)", (count,))
+        self._entries -= count
+        self.stats['evicted'] += count
+
+    @staticmethod
+    def _key(canonical, size, mark, prompt_version):
+        return f"v{prompt_version}|{mark}|{size}|{canonical}"
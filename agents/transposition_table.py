@@ -0,0 +1,132 @@
+"""
+Transposition Table
+
+This module implements the position-keyed table the search agents use to keep
+search results between consecutive get_action calls. After the agent moves and
+the opponent replies, most of the new search tree was already visited one call
+earlier; the table lets the next search start from those results instead of
+from nothing.
+
+Key Features:
+- Entries keyed by Board.get_key() plus the node type (max/min/chance)
+- Stores value, bound type (exact/lower/upper), best move and search depth
+- Entries are only reused where they give the same answer as a fresh search
+- Positions that can no longer be reached are dropped before every search
+  (agents playing a series keep them until the table is full: keep_unreachable)
+- Per-search statistics on how much work was served from the table
+
+Reuse Rules:
+- An entry searched to the same remaining depth can always be reused
+- An entry whose subtree ended in terminal positions only ("complete") can be
+  reused at any greater depth as well, since a deeper search sees the same tree
+- Lower/upper bounds from alpha-beta are only used to cut off, never to narrow
+  the window, so the root value never differs from a search without the table
+
+Date Created: 2026-10-19
+Version: 1.0
+
+Usage:
+    table = TranspositionTable(max_entries=500_000)
+    table.new_search(state)
+    entry = table.probe(key, depth)
+    table.store(key, depth, value, EXACT, best_action, complete, nodes)
+"""
+
+# transposition_table.py
+
+EXACT = 'exact'  # Value is the exact minimax value of the node
+LOWER = 'lower'  # Search failed high: the true value is >= value
+UPPER = 'upper'  # Search failed low: the true value is <= value
+
+
+class TableEntry:
+    __slots__ = ('depth', 'value', 'flag', 'best_move', 'complete', 'nodes', 'generation')
+
+    def __init__(self, depth, value, flag, best_move, complete, nodes, generation):
+        self.depth = depth  # Remaining depth the node was searched with
+        self.value = value
+        self.flag = flag  # EXACT, LOWER or UPPER
+        self.best_move = best_move
+        self.complete = complete  # True if no depth cut-off happened below the node
+        self.nodes = nodes  # Nodes the search of this subtree expanded
+        self.generation = generation  # Search (get_action call) that stored the entry
+
+
+class TranspositionTable:
+    def __init__(self, max_entries=500_000):
+        self.max_entries = max_entries  # Memory bound; new entries are dropped when full
+        self.entries = {}
+        self.generation = 0
+        self.last_stats = None  # Statistics of the current / last search
+        # Keep positions that can no longer be reached in this game, for the next games;
+        # the search agents' reset_for_new_game turns it on, so a reused agent's table
+        # keeps finished games' positions and drops them only once it is full
+        self.keep_unreachable = False
+
+    def new_search(self, state, retain=True):
+        # Starts a new search from state.
+        # Entries for positions that are no longer reachable (a stone was placed
+        # differently, or the position is behind the current one) are discarded.
+        self.generation += 1
+        if retain and (not self.keep_unreachable or len(self.entries) >= self.max_entries):
+            x_bits, o_bits = state.get_key()
+            self.entries = {key: entry for key, entry in self.entries.items()
+                            if key[0] & x_bits == x_bits and key[1] & o_bits == o_bits}
+        self.last_stats = {
+            'retained_entries': len(self.entries),
+            'probes': 0,
+            'hits': 0,
+            'retained_hits': 0,
+            'nodes_saved': 0,
+            'retained_nodes_saved': 0
+        }
+
+    def probe(self, key, depth, alpha=None, beta=None):
+        # Returns a reusable entry for the node or None.
+        # alpha/beta are the window of the caller; bounds only count as a hit
+        # when they fall outside it.
+        stats = self.last_stats
+        stats['probes'] += 1
+        entry = self.entries.get(key)
+        if entry is None:
+            return None
+        if entry.depth != depth and not (entry.complete and entry.depth <= depth):
+            return None
+        if entry.flag == LOWER and (beta is None or entry.value < beta):
+            return None
+        if entry.flag == UPPER and (alpha is None or entry.value > alpha):
+            return None
+
+        stats['hits'] += 1
+        stats['nodes_saved'] += entry.nodes
+        if entry.generation < self.generation:
+            stats['retained_hits'] += 1
+            stats['retained_nodes_saved'] += entry.nodes
+        return entry
+
+    def best_move(self, key):
+        # Returns the best move stored for a position at any depth (for move ordering)
+        entry = self.entries.get(key)
+        return entry.best_move if entry is not None else None
+
+    def store(self, key, depth, value, flag, best_move, complete, nodes):
+        # Saves a search result, keeping the deeper entry if one already exists
+        entry = self.entries.get(key)
+        if entry is None and len(self.entries) >= self.max_entries:
+            return
+        if entry is not None and entry.depth > depth and not complete:
+            return
+        self.entries[key] = TableEntry(depth, value, flag, best_move, complete, nodes, self.generation)
+
+    def search_stats(self, nodes_expanded):
+        # Summarizes the current search: how much of it was served from the table
+        stats = dict(self.last_stats)
+        stats['nodes_expanded'] = nodes_expanded
+        stats['table_entries'] = len(self.entries)
+        total = nodes_expanded + stats['nodes_saved']
+        stats['served_from_table'] = round(stats['nodes_saved'] / total, 4) if total else 0.0
+        stats['served_from_retained'] = round(stats['retained_nodes_saved'] / total, 4) if total else 0.0
+        return stats
+
+    def clear(self):
+        self.entries.clear()
@@ -0,0 +1,189 @@
+"""
+NumPy Value/Policy Network
+
+This module implements a small multi-layer perceptron (MLP) written in pure NumPy
+that estimates, for any board, the game value and which moves are worth trying.
+It replaces hand-written heuristic scoring: it is trained on positions labelled
+with their exact value (see train_value_network.py) and plugs into the search
+agents in three ways.
+
+Key Features:
+- Value head: expected result in [-1, 1] (+1 = the perspective mark wins)
+- Policy head: probability of each empty cell being a best move
+- Batched inference over stacked board arrays (Board.to_array()); a board's
+  value does not depend on the batch it is evaluated in
+- Use as eval_fn, as a move-ordering prior for AlphaBetaAgent, and as the
+  prior/value of MCTSAgent
+- Compact weights file (.npz) that stores the board size and layer sizes
+
+Network:
+- Input: 3 planes of size x size (X stones, O stones, X-to-move flag)
+- Hidden: one fully connected ReLU layer
+- Heads: tanh value, softmax policy masked to empty cells
+- Training: Adam on mean squared value error + policy cross-entropy
+
+Date Created: 2026-10-19
+Version: 1.0
+
+Usage:
+    network = ValueNetwork.load("models/value_net_3x3.npz", perspective='O')
+    agent = AlphaBetaAgent(eval_fn=network, max_depth=4, mark='O',
+                           move_ordering=network.order_moves)
+    values = network.evaluate_batch(np.stack([b.to_array() for b in boards]))
+"""
+
+# value_network.py
+
+import os
+import numpy as np
+
+# Where train_value_network.py saves the weights for each board size
+DEFAULT_MODEL_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "models")
+
+
+def default_model_path(size):
+    # Path of the shipped weights for a board size
+    return os.path.join(DEFAULT_MODEL_DIR, f"value_net_{size}x{size}.npz")
+
+
+class ValueNetwork:
+    def __init__(self, size=3, hidden=128, seed=0, perspective='X'):
+        self.size = size
+        self.hidden = hidden
+        self.perspective = perspective  # Mark whose win is scored +1
+        n_cells = size * size
+        n_inputs = 3 * n_cells
+        rng = np.random.default_rng(seed)
+        self.params = {
+            'w1': (rng.standard_normal((n_inputs, hidden)) * np.sqrt(2.0 / n_inputs)).astype(np.float32),
+            'b1': np.zeros(hidden, dtype=np.float32),
+            'w_value': (rng.standard_normal((hidden, 1)) * np.sqrt(1.0 / hidden)).astype(np.float32),
+            'b_value': np.zeros(1, dtype=np.float32),
+            'w_policy': (rng.standard_normal((hidden, n_cells)) * np.sqrt(1.0 / hidden)).astype(np.float32),
+            'b_policy': np.zeros(n_cells, dtype=np.float32)
+        }
+        self._adam = None  # Optimizer state, created on the first training step
+        self._value_weights = None  # float64 copy of the value path, built on first use
+
+    # === Inference ===
+
+    @staticmethod
+    def features(arrays):
+        # Converts stacked board arrays (k, size, size) into network inputs (k, 3 * size^2)
+        flat = np.asarray(arrays).reshape(len(arrays), -1)
+        x_stones = flat == 1
+        o_stones = flat == -1
+        x_to_move = x_stones.sum(axis=1) == o_stones.sum(axis=1)
+        to_move_plane = np.repeat(x_to_move[:, None], flat.shape[1], axis=1)
+        return np.concatenate([x_stones, o_stones, to_move_plane], axis=1).astype(np.float32)
+
+    def forward(self, features):
+        # Returns (hidden activations, values from X's view, policy logits)
+        p = self.params
+        hidden = np.maximum(features @ p['w1'] + p['b1'], 0.0)
+        values = np.tanh(hidden @ p['w_value'] + p['b_value'])[:, 0]
+        logits = hidden @ p['w_policy'] + p['b_policy']
+        return hidden, values, logits
+
+    def evaluate_batch(self, arrays):
+        # Values of stacked boards from the perspective mark's point of view.
+        # The value path runs in float64 and is rounded to float32, so a board gets
+        # the same value whether it is evaluated alone or in a batch (float32 matrix
+        # products differ in the last bits between batch sizes).
+        if self._value_weights is None:
+            p = self.params
+            self._value_weights = tuple(p[name].astype(np.float64) for name in ('w1', 'b1', 'w_value', 'b_value'))
+        w1, b1, w_value, b_value = self._value_weights
+        hidden = np.maximum(self.features(arrays).astype(np.float64) @ w1 + b1, 0.0)
+        values = np.tanh(hidden @ w_value + b_value)[:, 0].astype(np.float32)
+        return values if self.perspective == 'X' else -values
+
+    def policy_batch(self, arrays):
+        # Move probabilities of stacked boards (k, size^2), zero on occupied cells
+        arrays = np.asarray(arrays)
+        _, _, logits = self.forward(self.features(arrays))
+        empty = arrays.reshape(len(arrays), -1) == 0
+        logits = np.where(empty, logits, -np.inf)
+        logits -= logits.max(axis=1, keepdims=True)
+        probs = np.exp(logits)
+        return probs / probs.sum(axis=1, keepdims=True)
+
+    def __call__(self, state):
+        # eval_fn interface: value of a single Board
+        return float(self.evaluate_batch(state.to_array()[None])[0])
+
+    def policy(self, state):
+        # Returns {move: probability} over the legal moves of a single Board
+        probs = self.policy_batch(state.to_array()[None])[0]
+        return {(row, col): float(probs[row * self.size + col]) for row, col in state.get_valid_moves()}
+
+    def order_moves(self, state, actions):
+        # move_ordering interface: actions sorted by policy probability, best first
+        probs = self.policy_batch(state.to_array()[None])[0]
+        return sorted(actions, key=lambda move: -probs[move[0] * self.size + move[1]])
+
+    # === Training ===
+
+    def train_step(self, features, value_targets, policy_targets, learning_rate=1e-3):
+        # One Adam step on a mini-batch; returns (value loss, policy loss)
+        p = self.params
+        count = len(features)
+        hidden, values, logits = self.forward(features)
+
+        # Value head: mean squared error through tanh
+        value_error = values - value_targets
+        d_value = (2.0 / count) * value_error * (1.0 - values ** 2)
+
+        # Policy head: cross-entropy against the target distribution
+        # (all-zero target rows, e.g. finished games, add no policy loss)
+        logits = logits - logits.max(axis=1, keepdims=True)
+        probs = np.exp(logits)
+        probs /= probs.sum(axis=1, keepdims=True)
+        d_logits = (probs * policy_targets.sum(axis=1, keepdims=True) - policy_targets) / count
+
+        grads = {
+            'w_value': hidden.T @ d_value[:, None],
+            'b_value': d_value.sum(keepdims=True),
+            'w_policy': hidden.T @ d_logits,
+            'b_policy': d_logits.sum(axis=0)
+        }
+        d_hidden = d_value[:, None] @ p['w_value'].T + d_logits @ p['w_policy'].T
+        d_hidden *= hidden > 0
+        grads['w1'] = features.T @ d_hidden
+        grads['b1'] = d_hidden.sum(axis=0)
+
+        self._adam_update(grads, learning_rate)
+        value_loss = float(np.mean(value_error ** 2))
+        policy_loss = float(-np.mean(np.sum(policy_targets * np.log(probs + 1e-9), axis=1)))
+        return value_loss, policy_loss
+
+    def _adam_update(self, grads, learning_rate, beta1=0.9, beta2=0.999, eps=1e-8):
+        if self._adam is None:
+            self._adam = {'t': 0,
+                          'm': {k: np.zeros_like(v) for k, v in self.params.items()},
+                          'v': {k: np.zeros_like(v) for k, v in self.params.items()}}
+        adam = self._adam
+        adam['t'] += 1
+        self._value_weights = None
+        for name, grad in grads.items():
+            adam['m'][name] = beta1 * adam['m'][name] + (1 - beta1) * grad
+            adam['v'][name] = beta2 * adam['v'][name] + (1 - beta2) * grad ** 2
+            m_hat = adam['m'][name] / (1 - beta1 ** adam['t'])
+            v_hat = adam['v'][name] / (1 - beta2 ** adam['t'])
+            self.params[name] -= (learning_rate * m_hat / (np.sqrt(v_hat) + eps)).astype(np.float32)
+
+    # === Saving and loading ===
+
+    def save(self, path):
+        # Writes the weights (float32) and the network shape to a compressed .npz file
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        np.savez_compressed(path, size=self.size, hidden=self.hidden, **self.params)
+
+    @classmethod
+    def load(cls, path, perspective='X'):
+        # Reads a network written by save()
+        with np.load(path) as data:
+            network = cls(size=int(data['size']), hidden=int(data['hidden']), perspective=perspective)
+            for name in network.params:
+                network.params[name] = data[name].astype(np.float32)
+        return network
@@ -0,0 +1,36 @@
+"""
+Win/Loss Evaluation Function
+
+This module provides the simplest eval_fn for the search agents: a finished
+game is worth +1 or -1 to one player, everything else 0. Unlike a local
+function or lambda it is a small class, so it can be pickled and sent to the
+worker processes of parallel series, tournaments, suites and self-play.
+
+Key Features:
+- WinLossEval(mark) scores boards from mark's point of view
+- Picklable (module-level class with plain attributes)
+- One instance per side when agents must evaluate from their own side
+  (AgentConfig(eval_for_mark=WinLossEval)), or one shared instance
+  (WinLossEval('X')) for the X-side scoring of main.simple_eval_function
+
+Date Created: 2026-10-19
+Version: 1.0
+
+Usage:
+    eval_fn = WinLossEval('O')
+    agent = AlphaBetaAgent(eval_fn=eval_fn, max_depth=6, mark='O')
+"""
+
+# win_loss_eval.py
+
+
+class WinLossEval:
+    # Picklable eval_fn from one player's point of view: 1 if mark has won, -1 if it has lost, else 0
+    def __init__(self, mark):
+        self.mark = mark
+
+    def __call__(self, board):
+        winner = board.get_winner()
+        if winner is None:
+            return 0
+        return 1 if winner == self.mark else -1
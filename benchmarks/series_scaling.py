@@ -0,0 +1,51 @@
+# benchmarks/series_scaling.py
+# Measures how Metrics.run_series scales with worker processes (workers=1..16) and
+# checks that every parallel run returns exactly the records of the sequential run
+# (same winners, node counts and move counts, in the same order).
+#
+# Usage:
+#   python -m benchmarks.series_scaling
+#   python -m benchmarks.series_scaling --games 200 --depth 9 --workers 1 2 4 8 16
+
+# === Import libraries and modules ===
+import argparse
+import os
+from agents.win_loss_eval import WinLossEval
+from evaluation.metrics import Metrics
+# =========================================
+
+# Win/loss evaluation from X's side, shared by both players (picklable for worker processes)
+eval_fn = WinLossEval('X')
+
+
+def run(games, depth, workers, x_agent, o_agent, seed):
+    metrics = Metrics()
+    metrics.run_series(x_agent, o_agent, games=games, board_size=3, workers=workers, seed=seed,
+                       eval_fn=eval_fn, max_depth=depth)
+    outcome = [(r['winner'], r['nodes_x'], r['nodes_o'], r['total_moves']) for r in metrics.records]
+    return metrics.last_series_wall_sec, outcome
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Scaling of Metrics.run_series with worker processes")
+    parser.add_argument("--games", type=int, default=64)
+    parser.add_argument("--depth", type=int, default=4)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8, 16])
+    parser.add_argument("--x-agent", default="minimax")
+    parser.add_argument("--o-agent", default="alphabeta")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    print(f"{args.games} games {args.x_agent} vs {args.o_agent}, depth {args.depth}, {os.cpu_count()} CPUs")
+    print(f"{'workers':>8} {'wall':>9} {'games/s':>9} {'speedup':>8}  same records")
+    reference = None
+    for workers in args.workers:
+        wall, outcome = run(args.games, args.depth, workers, args.x_agent, args.o_agent, args.seed)
+        if reference is None:
+            reference = (wall, outcome)
+        print(f"{workers:>8} {wall:>8.2f}s {args.games / wall:>9.1f} {reference[0] / wall:>7.2f}x  "
+              f"{'yes' if outcome == reference[1] else 'NO'}")
+
+
+if __name__ == "__main__":
+    main()
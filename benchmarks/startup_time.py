@@ -0,0 +1,199 @@
+# benchmarks/startup_time.py
+# Measures how long the project's entry points take to import, each in a fresh
+# interpreter started with "python -X importtime". Batch jobs spawn many
+# short-lived processes, so every one of them pays this cost.
+#
+# Two checks, and the script exits with status 1 when either finds a regression:
+#   - a target loads one of HEAVY_MODULES that benchmarks/startup_heavy_modules.json
+#     (tracked, the same on every machine) does not list for it;
+#   - its median import time exceeds this machine's baseline by more than --tolerance
+#     (relative) plus --slack-ms. Times depend on the machine, so the timing baseline,
+#     benchmarks/startup_baseline.json, is a local file (not in git) that
+#     --update-baseline creates; without it only the heavy-modules check runs.
+#
+# Usage:
+#   python -m benchmarks.startup_time                    # compare with the baselines
+#   python -m benchmarks.startup_time --runs 10 --top 15
+#   python -m benchmarks.startup_time --update-baseline  # local timing baseline
+#   python -m benchmarks.startup_time --update-heavy-modules  # after an intended change
+
+# === Import libraries and modules ===
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+# =========================================
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BASELINE_PATH = os.path.join(ROOT, "benchmarks", "startup_baseline.json")
+HEAVY_MODULES_PATH = os.path.join(ROOT, "benchmarks", "startup_heavy_modules.json")
+
+# Name -> statement run in a fresh interpreter
+TARGETS = {
+    'main': "import main",
+    'agents': "import agents",
+    'registry': "import agents.registry",
+    'evaluation': "import evaluation",
+    'alphabeta': "from agents.alpha_beta_agent import AlphaBetaAgent",
+    'pruning_visual_test': "import pruning_visual_test",
+    'llm_benchmark': "import run_llm_benchmark"
+}
+
+# Slow optional dependencies a headless process should not load by accident
+HEAVY_MODULES = ('pygame', 'matplotlib', 'networkx', 'google.generativeai', 'dotenv', 'tkinter')
+
+MARKER = "--- startup benchmark: target starts here ---"
+
+# Runs in the child: only the imports after MARKER belong to the target
+CHILD_CODE = """
+import json, sys, time
+sys.stderr.write({marker!r} + "\\n")
+start = time.perf_counter()
+exec({statement!r})
+elapsed = time.perf_counter() - start
+print(json.dumps({{"elapsed": elapsed, "heavy": sorted(m for m in {heavy!r} if m in sys.modules)}}))
+"""
+
+
+def parse_importtime(stderr):
+    # {module: (self_us, cumulative_us)} and the total for the lines after MARKER
+    modules = {}
+    total_us = 0
+    started = False
+    for line in stderr.splitlines():
+        if line.strip() == MARKER:
+            started = True
+            continue
+        if not started or not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        modules[name.strip()] = (int(self_us), int(cumulative_us))
+        total_us += int(self_us)
+    return modules, total_us
+
+
+def measure(statement):
+    # One fresh interpreter: wall time, import time and heavy modules loaded
+    code = CHILD_CODE.format(marker=MARKER, statement=statement, heavy=HEAVY_MODULES)
+    env = dict(os.environ, PYTHONPATH=ROOT + os.pathsep + os.environ.get("PYTHONPATH", ""))
+    start = time.perf_counter()
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", code], cwd=ROOT, env=env,
+                            capture_output=True, text=True)
+    wall = time.perf_counter() - start
+    if result.returncode != 0:
+        raise RuntimeError(f"'{statement}' failed:\n{result.stderr[-2000:]}")
+    report = json.loads(result.stdout.strip().splitlines()[-1])
+    modules, total_us = parse_importtime(result.stderr)
+    return {'wall_ms': wall * 1000, 'import_ms': report['elapsed'] * 1000,
+            'importtime_ms': total_us / 1000, 'heavy_modules': report['heavy'], 'modules': modules}
+
+
+def benchmark_target(statement, runs, top):
+    # Median over runs (the first run also warms the bytecode cache)
+    samples = [measure(statement) for _ in range(runs)]
+    median_run = sorted(samples, key=lambda s: s['import_ms'])[len(samples) // 2]
+    slowest = sorted(median_run['modules'].items(), key=lambda item: -item[1][0])[:top]
+    return {
+        'import_ms': round(statistics.median(s['import_ms'] for s in samples), 2),
+        'importtime_ms': round(statistics.median(s['importtime_ms'] for s in samples), 2),
+        'wall_ms': round(statistics.median(s['wall_ms'] for s in samples), 2),
+        'module_count': len(median_run['modules']),
+        'heavy_modules': median_run['heavy_modules'],
+        'slowest_modules': [(name, round(self_us / 1000, 2)) for name, (self_us, _) in slowest]
+    }
+
+
+def compare(results, baseline, heavy_modules, tolerance, slack_ms):
+    # List of regression messages (empty when everything is within bounds);
+    # baseline (import times) may be None, heavy_modules is {target: allowed modules}
+    regressions = []
+    for name, result in results.items():
+        base = (baseline or {}).get('targets', {}).get(name)
+        if base is not None:
+            limit = base['import_ms'] * (1 + tolerance) + slack_ms
+            if result['import_ms'] > limit:
+                regressions.append(f"{name}: import {result['import_ms']:.1f} ms > limit {limit:.1f} ms "
+                                   f"(baseline {base['import_ms']:.1f} ms)")
+        if name in heavy_modules:
+            new_heavy = sorted(set(result['heavy_modules']) - set(heavy_modules[name]))
+            if new_heavy:
+                regressions.append(f"{name}: now loads {', '.join(new_heavy)}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure import/startup time of the project's entry points")
+    parser.add_argument("--targets", nargs="+", choices=list(TARGETS), default=list(TARGETS))
+    parser.add_argument("--runs", type=int, default=5, help="Fresh interpreters per target (median is reported)")
+    parser.add_argument("--top", type=int, default=5, help="Slowest modules listed per target")
+    parser.add_argument("--baseline", default=BASELINE_PATH, help="Local import-time baseline")
+    parser.add_argument("--heavy-modules", default=HEAVY_MODULES_PATH,
+                        help="Tracked heavy modules each target may load")
+    parser.add_argument("--tolerance", type=float, default=0.5, help="Allowed relative slowdown")
+    parser.add_argument("--slack-ms", type=float, default=25.0, help="Allowed absolute slowdown (noise floor)")
+    parser.add_argument("--update-baseline", action="store_true",
+                        help="Store these import times as this machine's baseline")
+    parser.add_argument("--update-heavy-modules", action="store_true",
+                        help="Store the heavy modules loaded now as the allowed ones")
+    parser.add_argument("--output", default=None, help="Also write the results to this JSON file")
+    args = parser.parse_args()
+
+    results = {}
+    for name in args.targets:
+        results[name] = benchmark_target(TARGETS[name], args.runs, args.top)
+        result = results[name]
+        print(f"{name:<20} import {result['import_ms']:8.1f} ms   process {result['wall_ms']:8.1f} ms   "
+              f"{result['module_count']:4d} modules   heavy: {', '.join(result['heavy_modules']) or '-'}")
+        for module, self_ms in result['slowest_modules']:
+            print(f"{'':<22}{self_ms:8.2f} ms  {module}")
+
+    report = {'python': platform.python_version(), 'platform': platform.platform(), 'runs': args.runs,
+              'targets': results}
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+
+    if args.update_baseline or args.update_heavy_modules:
+        if args.update_baseline:
+            baseline = {'python': report['python'], 'platform': report['platform'],
+                        'targets': {name: {'import_ms': r['import_ms']} for name, r in results.items()}}
+            with open(args.baseline, "w") as f:
+                json.dump(baseline, f, indent=2)
+                f.write("\n")
+            print(f"Baseline written to {args.baseline}")
+        if args.update_heavy_modules:
+            heavy_modules = {}
+            if os.path.exists(args.heavy_modules):
+                with open(args.heavy_modules) as f:
+                    heavy_modules = json.load(f)
+            heavy_modules.update({name: r['heavy_modules'] for name, r in results.items()})
+            with open(args.heavy_modules, "w") as f:
+                json.dump(heavy_modules, f, indent=2)
+                f.write("\n")
+            print(f"Heavy modules written to {args.heavy_modules}")
+        return
+
+    with open(args.heavy_modules) as f:
+        heavy_modules = json.load(f)
+    baseline = None
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+    else:
+        print(f"No import-time baseline at {args.baseline}; run with --update-baseline to create one. "
+              f"Checking heavy modules only.")
+    regressions = compare(results, baseline, heavy_modules, args.tolerance, args.slack_ms)
+    if regressions:
+        print("\nStartup regressions:")
+        for message in regressions:
+            print(f"  {message}")
+        sys.exit(1)
+    print("\nNo startup regressions against the baselines.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,307 @@
+# benchmarks/suite.py
+# Headless micro- and macro-benchmarks of the engine:
+#   board.*   Board primitives (check_win, get_valid_moves, generate_successor) on fixed positions
+#   search.*  one full get_action per agent on fixed positions (time and nodes expanded)
+#   series.*  Metrics.run_series throughput (games per second)
+#   logger.*  Logger I/O: logging games, saving JSON/CSV and loading JSON
+#
+# Results are written to results/benchmarks/<machine>/<commit>.json and compared with
+# this machine's entry in benchmarks/suite_baseline.json, a local file (not in git)
+# that --update-baseline creates. Every time is the best of --repeat runs (the least
+# disturbed by other processes). A benchmark regresses when its time exceeds the
+# baseline by more than --tolerance, or when a deterministic search expands more
+# nodes than the baseline did (beyond --node-tolerance, 0 by default); the script
+# then exits with status 1.
+#
+# Usage:
+#   python -m benchmarks.suite                      # run everything, compare with the baseline
+#   python -m benchmarks.suite --filter board search.alphabeta --repeat 7
+#   python -m benchmarks.suite --update-baseline    # store this machine's baseline
+#   python -m benchmarks.suite --filter search --profile   # also profile one run of each search
+
+# === Import libraries and modules ===
+import argparse
+import fnmatch
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import timeit
+from agents.registry import create_agent
+from agents.win_loss_eval import WinLossEval
+from evaluation.metrics import Metrics
+from evaluation.profiling import Profiler
+from evaluation.results_logger import Logger
+from game.board import Board
+# =========================================
+
+# Win/loss evaluation from X's side for both players, like main.simple_eval_function
+eval_fn = WinLossEval('X')
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BASELINE_PATH = os.path.join(ROOT, "benchmarks", "suite_baseline.json")
+RESULTS_DIR = os.path.join(ROOT, "results", "benchmarks")
+
+# Fixed positions as (board size, moves in play order, X first)
+POSITIONS = {
+    'empty3': (3, []),
+    'opening3': (3, [(1, 1), (0, 0)]),
+    'midgame3': (3, [(1, 1), (0, 0), (0, 2), (2, 0)]),
+    'midgame5': (5, [(2, 2), (1, 1), (2, 3), (3, 3), (1, 2), (3, 1)])
+}
+
+
+def make_position(name):
+    size, moves = POSITIONS[name]
+    board = Board(size)
+    for i, (row, col) in enumerate(moves):
+        board.make_move(row, col, 'X' if i % 2 == 0 else 'O')
+    return board
+
+
+# === Micro-benchmarks: seconds per call ===
+
+def time_call(fn, repeat):
+    # Best seconds per call over repeat timeit runs of about 0.05 s each
+    timer = timeit.Timer(fn)
+    number, _ = timer.autorange()
+    number = max(1, number // 4)  # autorange aims at 0.2 s
+    samples = timer.repeat(repeat=repeat, number=number)
+    return {'sec': min(samples) / number, 'calls': number}
+
+
+def bench_check_win(position):
+    board = make_position(position)
+    return lambda repeat: time_call(lambda: board.check_win('X'), repeat)
+
+
+def bench_valid_moves(position):
+    board = make_position(position)
+    return lambda repeat: time_call(board.get_valid_moves, repeat)
+
+
+def bench_successor(position):
+    board = make_position(position)
+    move = board.get_valid_moves()[0]
+    mark = board.get_current_player()
+    return lambda repeat: time_call(lambda: board.generate_successor(move, mark), repeat)
+
+
+# === Macro-benchmarks: best seconds per run ===
+
+def time_runs(run, repeat):
+    # run() -> extra fields (e.g. nodes); a fresh object per run, best time reported
+    samples, extra = [], {}
+    for _ in range(repeat):
+        start = time.perf_counter()
+        extra = run() or {}
+        samples.append(time.perf_counter() - start)
+    return dict(sec=min(samples), **extra)
+
+
+def timed_runs(run):
+    # Benchmark function; .run is the untimed body, for --profile
+    def timed(repeat):
+        return time_runs(run, repeat)
+    timed.run = run
+    return timed
+
+
+def bench_search(agent, position, **kwargs):
+    def run():
+        board = make_position(position)
+        mark = board.get_current_player()
+        player = create_agent(agent, mark, eval_fn=eval_fn, **kwargs)
+        player.get_action(board)
+        return {'nodes': player.nodes_expanded}
+    return timed_runs(run)
+
+
+def bench_series(games, **kwargs):
+    def run():
+        metrics = Metrics()
+        metrics.run_series('minimax', 'alphabeta', games=games, board_size=3, seed=0, eval_fn=eval_fn, **kwargs)
+        return {'games_per_sec': round(games / metrics.last_series_wall_sec, 2),
+                'nodes': sum(metrics.get_nodes_evaluated().values())}
+    return timed_runs(run)
+
+
+def bench_logger(step, games=2000):
+    # step: 'log', 'save_json', 'save_csv' or 'load_json'; files go to a temporary folder
+    def run():
+        cwd = os.getcwd()
+        with tempfile.TemporaryDirectory() as folder:
+            os.chdir(folder)
+            try:
+                logger = Logger()
+                start = time.perf_counter()
+                for i in range(games):
+                    logger.log_game('minimax', 'alphabeta', 'XO'[i % 2], 7, 0.01, 3, 1000 + i, 500 + i,
+                                    additional_data={'max_depth': 6})
+                elapsed = {'log': time.perf_counter() - start}
+                for name, action in (('save_json', lambda: logger.save_to_file("bench.json", "json")),
+                                     ('save_csv', lambda: logger.save_to_file("bench.csv", "csv")),
+                                     ('load_json', lambda: logger.load_from_file("bench.json"))):
+                    start = time.perf_counter()
+                    action()
+                    elapsed[name] = time.perf_counter() - start
+            finally:
+                os.chdir(cwd)
+        return elapsed[step]
+
+    def timed(repeat):
+        # The Logger prints a line per save/load; keep the report readable
+        with open(os.devnull, "w") as devnull:
+            stdout, sys.stdout = sys.stdout, devnull
+            try:
+                samples = [run() for _ in range(repeat)]
+            finally:
+                sys.stdout = stdout
+        return {'sec': min(samples), 'games': games}
+    return timed
+
+
+# Name -> function(repeat) returning {'sec': ..., optional 'nodes' and extra fields}
+BENCHMARKS = {
+    'board.check_win.midgame3': bench_check_win('midgame3'),
+    'board.check_win.midgame5': bench_check_win('midgame5'),
+    'board.get_valid_moves.midgame3': bench_valid_moves('midgame3'),
+    'board.get_valid_moves.midgame5': bench_valid_moves('midgame5'),
+    'board.generate_successor.midgame3': bench_successor('midgame3'),
+    'board.generate_successor.midgame5': bench_successor('midgame5'),
+    'search.minimax.opening3.d6': bench_search('minimax', 'opening3', max_depth=6),
+    'search.alphabeta.empty3.d9': bench_search('alphabeta', 'empty3', max_depth=9),
+    'search.alphabeta.midgame5.d2': bench_search('alphabeta', 'midgame5', max_depth=2),
+    'search.expectiminimax.opening3.d5': bench_search('expectiminimax', 'opening3', max_depth=5),
+    'search.proofnumber.opening3': bench_search('proofnumber', 'opening3'),
+    'search.mcts.empty3.200': bench_search('mcts', 'empty3', simulations=200, seed=0),
+    'series.minimax_vs_alphabeta.d4': bench_series(games=10, max_depth=4),
+    'logger.log': bench_logger('log'),
+    'logger.save_json': bench_logger('save_json'),
+    'logger.save_csv': bench_logger('save_csv'),
+    'logger.load_json': bench_logger('load_json')
+}
+
+
+def machine_id():
+    # Baselines are only comparable on the same machine and Python version
+    return f"{platform.node() or 'unknown'}-{platform.machine()}-py{platform.python_version()}"
+
+
+def git_commit():
+    # Short commit hash, "-dirty" with uncommitted changes; "unknown" outside a git checkout
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True,
+                                text=True, check=True).stdout.strip()
+        dirty = subprocess.run(["git", "diff", "--quiet", "HEAD"], cwd=ROOT).returncode != 0
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+    return commit + ("-dirty" if dirty else "")
+
+
+def compare(results, baseline, tolerance, node_tolerance=0.0):
+    # List of regression messages (empty when everything is within bounds)
+    regressions = []
+    for name, result in results.items():
+        base = baseline.get(name)
+        if base is None:
+            continue
+        limit = base['sec'] * (1 + tolerance)
+        if result['sec'] > limit:
+            regressions.append(f"{name}: {format_time(result['sec'])} > limit {format_time(limit)} "
+                               f"(baseline {format_time(base['sec'])}, {result['sec'] / base['sec']:.2f}x)")
+        # Node counts are deterministic, so they get their own (normally zero) tolerance
+        if base.get('nodes') and result.get('nodes', 0) > base['nodes'] * (1 + node_tolerance):
+            regressions.append(f"{name}: {result['nodes']} nodes > baseline {base['nodes']}")
+    return regressions
+
+
+def format_time(sec):
+    if sec < 1e-3:
+        return f"{sec * 1e6:.2f} us"
+    if sec < 1:
+        return f"{sec * 1e3:.2f} ms"
+    return f"{sec:.3f} s"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark Board primitives, agent searches, run_series and Logger I/O")
+    parser.add_argument("--filter", nargs="+", default=None,
+                        help="Only benchmarks whose name starts with or matches (glob) one of these")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per benchmark (the best is reported)")
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--tolerance", type=float, default=0.5,
+                        help="Allowed relative slowdown (shared or virtual machines are noisy)")
+    parser.add_argument("--node-tolerance", type=float, default=0.0,
+                        help="Allowed relative increase in nodes expanded (default: none)")
+    parser.add_argument("--update-baseline", action="store_true", help="Store these results as this machine's baseline")
+    parser.add_argument("--output", default=None,
+                        help="Results file (default: results/benchmarks/<machine>/<commit>.json)")
+    parser.add_argument("--profile", action="store_true",
+                        help="Profile one extra run of each search/series benchmark (results/profiles/suite_<commit>)")
+    parser.add_argument("--list", action="store_true", help="List the benchmarks and exit")
+    args = parser.parse_args()
+
+    names = [name for name in BENCHMARKS if not args.filter or
+             any(name.startswith(f) or fnmatch.fnmatch(name, f) for f in args.filter)]
+    if args.list or not names:
+        print("\n".join(names or ["No benchmark matches the filter."]))
+        return
+
+    machine, commit = machine_id(), git_commit()
+    print(f"Machine {machine}, commit {commit}, {args.repeat} runs per benchmark")
+    results = {}
+    for name in names:
+        result = BENCHMARKS[name](args.repeat)
+        results[name] = {key: round(value, 9) if key == 'sec' else value for key, value in result.items()}
+        extra = "  ".join(f"{key} {value}" for key, value in result.items() if key != 'sec')
+        print(f"{name:<40} {format_time(result['sec']):>12}  {extra}")
+
+    if args.profile:
+        profiler = Profiler(cprofile=True, stacks=True, memory=True, name=f"suite_{commit}")
+        for name in names:
+            if hasattr(BENCHMARKS[name], 'run'):
+                profiler.capture(BENCHMARKS[name].run, label=name, benchmark=name)
+        profiler.print_summary(limit=len(names))
+
+    report = {'machine': machine, 'commit': commit, 'python': platform.python_version(),
+              'platform': platform.platform(), 'cpu_count': os.cpu_count(), 'repeat': args.repeat,
+              'timestamp': time.strftime("%Y-%m-%dT%H:%M:%S"), 'benchmarks': results}
+    output = args.output or os.path.join(RESULTS_DIR, machine, f"{commit}.json")
+    os.makedirs(os.path.dirname(output) or ".", exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"\nResults written to {output}")
+
+    baselines = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            baselines = json.load(f)
+
+    if args.update_baseline:
+        entry = baselines.setdefault(machine, {'benchmarks': {}})
+        entry.update(commit=commit, platform=report['platform'])
+        entry['benchmarks'].update(results)
+        with open(args.baseline, "w") as f:
+            json.dump(baselines, f, indent=2)
+            f.write("\n")
+        print(f"Baseline for {machine} written to {args.baseline}")
+        return
+
+    if machine not in baselines:
+        print(f"No baseline for {machine} in {args.baseline}; run with --update-baseline to create one.")
+        return
+    regressions = compare(results, baselines[machine]['benchmarks'], args.tolerance, args.node_tolerance)
+    if regressions:
+        print(f"\nRegressions against {baselines[machine]['commit']}:")
+        for message in regressions:
+            print(f"  {message}")
+        sys.exit(1)
+    print(f"\nNo regressions against the baseline of commit {baselines[machine]['commit']}.")
+
+
+if __name__ == "__main__":
+    main()
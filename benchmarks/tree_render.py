@@ -0,0 +1,80 @@
+# benchmarks/tree_render.py
+# Times TreeDiagram on synthetic search traces of 1k, 10k and 100k nodes: level-of-
+# detail selection plus layout, drawing to a PNG (matplotlib Agg backend, nothing is
+# shown), and the DOT and JSON exports of the whole tree.
+#
+# Usage:
+#   python -m benchmarks.tree_render
+#   python -m benchmarks.tree_render --sizes 1000 10000 100000 1000000 --max-nodes 2000
+
+# === Import libraries and modules ===
+import argparse
+import os
+import random
+import shutil
+import tempfile
+import time
+import matplotlib
+matplotlib.use("Agg")
+from visualization.search_trace import SearchTrace
+from visualization.tree_diagram import TreeDiagram
+# =========================================
+
+
+def make_trace(nodes, branching=7, cut_rate=0.35, max_depth=12, seed=0):
+    # Alpha-beta shaped random tree: a node's children are searched one after another
+    # and the remaining siblings are recorded as pruned after a cut-off
+    rng = random.Random(seed)
+    trace = SearchTrace(max_nodes=nodes)
+    root = trace.add(None, None, float('-inf'), float('inf'), is_max=True)
+    stack = [(root, 0, True)]
+    while stack and len(trace) < nodes:
+        node, depth, is_max = stack.pop()
+        if depth == max_depth:
+            trace.finish(node, rng.uniform(-1, 1))
+            continue
+        moves = [(r, c) for r in range(3) for c in range(3)][:rng.randint(1, branching)]
+        searched = moves if rng.random() > cut_rate else moves[:rng.randint(1, len(moves))]
+        children = [trace.add(node, move, -1.0, 1.0, not is_max) for move in searched]
+        for move in moves[len(searched):]:
+            trace.add(node, move, -1.0, 1.0, not is_max, pruned=True)
+        trace.finish(node, rng.uniform(-1, 1))
+        stack.extend((child, depth + 1, not is_max) for child in reversed(children) if child >= 0)
+    return trace
+
+
+def timed(function, *args, **kwargs):
+    start_time = time.perf_counter()
+    result = function(*args, **kwargs)
+    return result, time.perf_counter() - start_time
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark TreeDiagram layout, rendering and export")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--max-nodes", type=int, default=400, help="Level-of-detail budget for drawing")
+    args = parser.parse_args()
+
+    work_dir = tempfile.mkdtemp(prefix="tree_render_")
+    cwd = os.getcwd()
+    os.chdir(work_dir)  # draw() saves under ./pruning visualization
+    try:
+        print(f"{'nodes':>8} {'select+layout':>14} {'draw (LOD)':>11} {'draw PV':>8} {'dot':>8} {'json':>8}")
+        for size in args.sizes:
+            trace = make_trace(size)
+            diagram = TreeDiagram(trace)
+            (nodes, _), select_time = timed(diagram.select, max_nodes=args.max_nodes)
+            _, layout_time = timed(diagram.layout, nodes)
+            _, draw_time = timed(diagram.draw, max_nodes=args.max_nodes, show=False)
+            _, pv_time = timed(diagram.draw, view='pv', show=False)
+            _, dot_time = timed(diagram.export_dot, "tree.dot")
+            _, json_time = timed(diagram.export_json, "tree.json")
+            print(f"{len(trace):>8} {select_time + layout_time:>13.3f}s {draw_time:>10.3f}s {pv_time:>7.3f}s "
+                  f"{dot_time:>7.3f}s {json_time:>7.3f}s")
+    finally:
+        os.chdir(cwd)
+        shutil.rmtree(work_dir)
+
+
+if __name__ == "__main__":
+    main()
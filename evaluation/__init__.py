@@ -1,2 +1,3 @@
 from .metrics import Metrics
-from .results_logger import Logger
\ No newline at end of file
+from .results_logger import Logger
+from .sprt import SPRT
\ No newline at end of file
@@ -0,0 +1,307 @@
+# === Import libraries and modules ===
+import json
+import multiprocessing
+import pickle
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Dict, List, Optional
+import numpy as np
+from agents.minimax_agent import MinimaxAgent
+from agents.win_loss_eval import WinLossEval
+from evaluation.metrics import AgentPool, accepts_seed, agent_factory, search_depth, seed_for_game
+from evaluation.position_suite import Position
+from game.board import Board
+# =========================================
+
+# === Differential testing ===
+# Checks optimized agents (and alternative board backends) against the plain
+# reference: MinimaxAgent on Board, searching every move of a position to the same
+# depth with the same evaluation. Per position the reference gives the root value
+# and the set of moves reaching it; a candidate must
+#   - play a move from that set (when it searches to the same depth, or has no depth limit
+#     and the reference searched to the end of the game), and
+#   - report the same root value in last_value (when it searches to the same depth and sets one).
+# Positions are typically every reachable 3x3 position plus random positions on
+# larger boards (evaluation.position_suite); every position gets a new candidate agent.
+# run_differential_games instead lets each candidate play whole games against itself,
+# with one agent per side kept for the whole game and across games (AgentPool), so
+# state carried from move to move (reuse_search tables, pondering, reset_for_new_game)
+# is checked as well. Work is split over a process pool and the report gives
+# mismatches and the node and time ratios candidate / reference.
+#
+# Usage:
+#   candidates = [AgentConfig('ab', 'alphabeta', eval_for_mark=WinLossEval, max_depth=9),
+#                 AgentConfig('mm-tt', 'minimax', eval_for_mark=WinLossEval, max_depth=9, reuse_search=True)]
+#   results = run_differential(all_positions(3), candidates, workers=4)
+#   results = run_differential_games(candidates, games=50, board_size=3, workers=4, seed=0)
+#   report = summarize(results)
+#   print_report(report)   # report[name]['move_mismatches'] == 0 for a correct candidate
+# =========================
+
+
+def reference_search(board, mark: str, depth: Optional[int] = None, eval_for_mark=WinLossEval) -> Dict:
+    # Minimax value of every legal move to depth plies (None = to the end of the game);
+    # capped at the empty cells like the candidates' depth, so late positions stay comparable
+    empty_cells = len(board.get_valid_moves())
+    depth = min(depth, empty_cells) if depth else empty_cells
+    reference = MinimaxAgent(eval_for_mark(mark), depth, mark)
+    reference.nodes_expanded = 1  # The root, as in get_action
+    start_ns = time.perf_counter_ns()
+    values = {tuple(action): reference.minimax(board.generate_successor(action, mark), depth - 1, False)[0]
+              for action in board.get_legal_actions()}
+    latency_ns = time.perf_counter_ns() - start_ns
+    value = max(values.values())
+    return {
+        'depth': depth,
+        'value': value,
+        'best_moves': sorted(move for move, move_value in values.items() if move_value == value),
+        'nodes': reference.nodes_expanded,
+        'latency_ns': latency_ns
+    }
+
+
+def run_differential(positions: List[Position], candidates: List, depth: Optional[int] = None,
+                     eval_for_mark=WinLossEval, board_backend: Optional[Callable] = None,
+                     workers: int = 1) -> List[Dict]:
+    # One result dict per (candidate, position). board_backend (optional, picklable) turns the
+    # Board into the object the candidates search, so a new board implementation can be
+    # checked with unchanged agents.
+    lines = [position.to_line() for position in positions]
+    settings = (candidates, depth, eval_for_mark, board_backend)
+    if workers > 1 and len(lines) > 1:
+        try:
+            pickle.dumps(settings)
+        except (pickle.PicklingError, AttributeError, TypeError) as e:
+            raise ValueError("run_differential(workers > 1) needs picklable candidates, eval_for_mark and "
+                             f"board_backend (module-level classes/functions or registry names): {e}")
+        # Positions near the start of the game cost far more, so chunks are small
+        chunk = max(1, len(lines) // (workers * 16))
+        tasks = [lines[i:i + chunk] for i in range(0, len(lines), chunk)]
+        context = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(workers, mp_context=context, initializer=_init_differential_worker,
+                                 initargs=(settings,)) as pool:
+            chunks = list(pool.map(_compare_positions, tasks))
+    else:
+        _init_differential_worker(settings)
+        chunks = [_compare_positions(lines)]
+    return [result for chunk in chunks for result in chunk]
+
+
+def run_differential_games(candidates: List, games: int = 10, board_size: int = 3,
+                           winning_length: Optional[int] = None, depth: Optional[int] = None,
+                           eval_for_mark=WinLossEval, board_backend: Optional[Callable] = None,
+                           workers: int = 1, seed: Optional[int] = None, random_plies: int = 2) -> List[Dict]:
+    # One result dict per candidate move (as run_differential, plus 'game' and 'ply'). Each candidate
+    # plays the games against itself; random_plies opens every game at random so deterministic
+    # agents do not replay one game. Agents are kept per worker process, so with workers > 1 each
+    # worker's agents carry their state over the games it plays.
+    settings = (candidates, depth, eval_for_mark, board_backend, board_size, winning_length, seed, random_plies)
+    if workers > 1 and games > 1:
+        try:
+            pickle.dumps(settings)
+        except (pickle.PicklingError, AttributeError, TypeError) as e:
+            raise ValueError("run_differential_games(workers > 1) needs picklable candidates, eval_for_mark and "
+                             f"board_backend (module-level classes/functions or registry names): {e}")
+        chunk = max(1, games // (workers * 4))
+        tasks = [(start, min(chunk, games - start)) for start in range(0, games, chunk)]
+        context = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(workers, mp_context=context, initializer=_init_differential_games_worker,
+                                 initargs=(settings,)) as pool:
+            chunks = list(pool.map(_play_differential_games, tasks))
+    else:
+        _init_differential_games_worker(settings)
+        try:
+            chunks = [_play_differential_games((0, games))]
+        finally:
+            _close_worker_pools()
+    return [result for chunk in chunks for result in chunk]
+
+
+def summarize(results: List[Dict]) -> Dict[str, Dict]:
+    # Per candidate: checked positions, mismatches, and node / time ratios against the reference
+    summary = {}
+    for agent in dict.fromkeys(r['agent'] for r in results):
+        rows = [r for r in results if r['agent'] == agent]
+        move_checked = [r for r in rows if r['move_ok'] is not None]
+        value_checked = [r for r in rows if r['value_ok'] is not None]
+        reference_nodes = sum(r['reference_nodes'] for r in rows)
+        reference_ms = sum(r['reference_ms'] for r in rows)
+        ratios = [r['nodes'] / r['reference_nodes'] for r in rows]
+        summary[agent] = {
+            'positions': len(rows),
+            'moves_checked': len(move_checked),
+            'move_mismatches': sum(not r['move_ok'] for r in move_checked),
+            'values_checked': len(value_checked),
+            'value_mismatches': sum(not r['value_ok'] for r in value_checked),
+            'nodes': int(sum(r['nodes'] for r in rows)),
+            'reference_nodes': int(reference_nodes),
+            'node_ratio': round(sum(r['nodes'] for r in rows) / reference_nodes, 4) if reference_nodes else None,
+            'median_node_ratio': round(float(np.median(ratios)), 4),
+            'time_ratio': round(sum(r['latency_ms'] for r in rows) / reference_ms, 4) if reference_ms else None
+        }
+    return summary
+
+
+def mismatches(results: List[Dict]) -> List[Dict]:
+    return [r for r in results if r['move_ok'] is False or r['value_ok'] is False]
+
+
+def print_report(summary: Dict[str, Dict], results: Optional[List[Dict]] = None, limit: int = 10,
+                 title: str = "Differential test") -> None:
+    print(f"\n=== {title} ===")
+    print(f"{'agent':<16} {'positions':>9} {'moves':>14} {'values':>14} {'node ratio':>11} {'median':>8} "
+          f"{'time ratio':>11}")
+    for agent, s in summary.items():
+        moves = f"{s['move_mismatches']} / {s['moves_checked']}"
+        values = f"{s['value_mismatches']} / {s['values_checked']}"
+        time_ratio = f"{s['time_ratio']:.3f}" if s['time_ratio'] is not None else "-"
+        print(f"{agent:<16} {s['positions']:>9} {moves:>14} {values:>14} {s['node_ratio']:>11.4f} "
+              f"{s['median_node_ratio']:>8.4f} {time_ratio:>11}")
+    print("(moves / values: mismatches / positions checked; ratios: candidate / reference)")
+    if results:
+        wrong = mismatches(results)
+        for r in wrong[:limit]:
+            print(f"  {r['agent']}: {r['position']} {r['to_move']} played {tuple(r['move'])} "
+                  f"value {r['candidate_value']}, reference {r['reference_value']} "
+                  f"bm {';'.join(f'{row},{col}' for row, col in r['best_moves'])}")
+        if len(wrong) > limit:
+            print(f"  ... {len(wrong) - limit} more mismatches")
+
+
+def save_results(path: str, results: List[Dict], summary: Dict[str, Dict]) -> None:
+    with open(path, "w") as f:
+        json.dump({'summary': summary, 'mismatches': mismatches(results), 'results': results}, f, indent=2)
+
+
+# Candidates, reference depth, evaluation and board backend of the current process
+# (set once by _init_differential_worker)
+_worker_settings = None
+
+
+def _init_differential_worker(settings) -> None:
+    global _worker_settings
+    _worker_settings = settings
+
+
+# Runs in a worker: the reference and every candidate on a chunk of positions (as suite lines)
+def _compare_positions(lines) -> List[Dict]:
+    candidates, depth, eval_for_mark, board_backend = _worker_settings
+    results = []
+    for line in lines:
+        position = Position.from_line(line)
+        board = position.board()
+        empty_cells = len(board.get_valid_moves())
+        reference = reference_search(board, position.to_move, depth, eval_for_mark)
+        for config in candidates:
+            agent = config.create(position.to_move)
+            state = board_backend(position.board()) if board_backend is not None else position.board()
+            results.append(_check_move(config.name, agent, state, position, reference, empty_cells))
+            if getattr(agent, 'ponderer', None) is not None:
+                agent.ponderer.stop()
+    return results
+
+
+# Game settings, agent pools (one per candidate) and reference results of the current
+# process (set by _init_differential_games_worker)
+_worker_game_settings = None
+_worker_pools = {}
+_worker_references = {}
+
+
+def _init_differential_games_worker(settings) -> None:
+    global _worker_game_settings, _worker_pools, _worker_references
+    _worker_game_settings = settings
+    _worker_pools = {}
+    _worker_references = {}
+
+
+def _close_worker_pools() -> None:
+    for pool in _worker_pools.values():
+        pool.close()
+    _worker_pools.clear()
+
+
+# Runs in a worker: games start .. start + count - 1 for every candidate
+def _play_differential_games(task) -> List[Dict]:
+    start, count = task
+    candidates = _worker_game_settings[0]
+    return [result for game in range(start, start + count) for config in candidates
+            for result in _play_differential_game(config, game)]
+
+
+def _play_differential_game(config, game: int) -> List[Dict]:
+    _, depth, eval_for_mark, board_backend, board_size, winning_length, seed, random_plies = _worker_game_settings
+    game_seed = seed_for_game(seed, game) if seed is not None else None
+    if game_seed is not None:
+        random.seed(game_seed)
+        np.random.seed(game_seed)
+    rng = random.Random(game_seed)
+    pool = _worker_pools.setdefault(config.name, AgentPool())
+    agents = {}
+    for side, mark in enumerate('XO'):
+        kwargs = config.kwargs_for(mark)
+        if game_seed is not None and 'seed' not in kwargs and accepts_seed(agent_factory(config.agent)):
+            kwargs['seed'] = game_seed * 2 + side
+        agents[mark] = pool.acquire(config.agent, mark, **kwargs)
+
+    board = Board(board_size)
+    if winning_length is not None:
+        board.winning_length = winning_length
+    results = []
+    ply = 0
+    try:
+        while not board.is_game_over():
+            mark = board.get_current_player()
+            if ply < random_plies:
+                move = tuple(rng.choice(board.get_valid_moves()))
+            else:
+                position = Position.from_board(board, mark, id=f"g{game}p{ply}")
+                empty_cells = len(board.get_valid_moves())
+                key = (board.get_key(), board.size, board.winning_length, mark)
+                if key not in _worker_references:
+                    _worker_references[key] = reference_search(board, mark, depth, eval_for_mark)
+                state = board_backend(position.board()) if board_backend is not None else position.board()
+                result = _check_move(config.name, agents[mark], state, position, _worker_references[key],
+                                     empty_cells)
+                result.update(game=game, ply=ply)
+                results.append(result)
+                move = tuple(result['move'])
+            board = board.generate_successor(move, mark)
+            ply += 1
+    finally:
+        for agent in agents.values():
+            if getattr(agent, 'ponderer', None) is not None:
+                agent.ponderer.stop()
+    return results
+
+
+# One candidate move on state (position as a Board in state's backend) against the reference
+def _check_move(name: str, agent, state, position: Position, reference: Dict, empty_cells: int) -> Dict:
+    start_ns = time.perf_counter_ns()
+    move = tuple(agent.get_action(state))
+    latency_ns = time.perf_counter_ns() - start_ns
+    agent_depth = search_depth(agent, empty_cells)
+    # Depth-limited candidates are only comparable at the reference depth, and candidates
+    # without a depth limit only with a reference that searched to the end of the game
+    same_depth = agent_depth == reference['depth']
+    move_comparable = same_depth or (agent_depth is None and reference['depth'] == empty_cells)
+    value = getattr(agent, 'last_value', None)
+    return {
+        'agent': name,
+        'id': position.id,
+        'position': position.rows,
+        'to_move': position.to_move,
+        'move': list(move),
+        'best_moves': [list(m) for m in reference['best_moves']],
+        'candidate_value': value,
+        'reference_value': reference['value'],
+        'move_ok': (move in reference['best_moves']) if move_comparable else None,
+        'value_ok': (value == reference['value']) if same_depth and value is not None else None,
+        'depth': agent_depth,
+        'reference_depth': reference['depth'],
+        'nodes': getattr(agent, 'nodes_expanded', 0) or 0,
+        'reference_nodes': reference['nodes'],
+        'latency_ms': round(latency_ns / 1e6, 4),
+        'reference_ms': round(reference['latency_ns'] / 1e6, 4)
+    }
@@ -1,8 +1,17 @@
 # === Import libraries and modules ===
+import asyncio
+import inspect
+import multiprocessing
+import pickle
+import random
 import time
-from typing import Dict, List, Type
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Tuple, Type
+import numpy as np
 from game.board import Board
 from game.game import Game
+from agents.eval_cache import CachedEvaluator
+from evaluation.sprt import SPRT
 # =========================================
 
 class Metrics:
@@ -11,28 +20,49 @@ class Metrics:
         self.records: List[Dict] = []
         # Accumulated wall-clock time
         self._total_time: float = 0.0
+        # Memoized eval_fn shared by the agents of the last series (if enabled)
+        self.eval_cache: Optional[CachedEvaluator] = None
+        # Wall-clock time of the last run_series (less than the summed game times with workers > 1)
+        self.last_series_wall_sec: float = 0.0
+        # SPRT outcome of the last run_series (None if it ran without one)
+        self.sprt_result: Optional[Dict] = None
 
-    def run_match(self, agent1, agent2, board_size, show_board=False):
+    def run_match(self, agent1, agent2, board_size, show_board=False, profiler=None):
+        # profiler: optional evaluation.profiling.Profiler capturing each move or the whole game
+        # (its overhead is included in the measured latencies)
         # Create game objects
         board = Board(size=board_size)
         game = Game(board, agent1, agent2)
         move_count = 0
-
-        # Start timer
-        start_time = time.time()
+        moves: List[Dict] = []
+        stats_before = (_agent_stats(agent1), _agent_stats(agent2))
+        if profiler is not None:
+            profiler.begin_game(agent1, agent2, game.board)
 
         if show_board:
             print(f"\nStarting game: {agent1.mark} vs {agent2.mark}")
             print(f"Initial board:")
             print(game.board)
 
+        # Game time counts the agents' thinking only, not printing
+        elapsed_ns = 0
+
         while not game.board.is_game_over():
             current_agent = game.get_current_agent()
 
             if show_board:
                 print(f"\nPlayer {game.current_player}'s turn:")
 
+            empty_cells = len(game.board.get_valid_moves())
+            if profiler is not None:
+                profiler.begin_move(current_agent, game.board, game.current_player)
+            start_ns = time.perf_counter_ns()
             move = current_agent.get_action(game.board)
+            latency_ns = time.perf_counter_ns() - start_ns
+            if profiler is not None:
+                profiler.end_move(current_agent, move, latency_ns)
+            elapsed_ns += latency_ns
+            moves.append(_move_telemetry(current_agent, game.current_player, latency_ns, empty_cells))
 
             if game.board.make_move(move[0], move[1], game.current_player):
                 move_count += 1
@@ -44,9 +74,7 @@ class Metrics:
                 if not game.board.is_game_over():
                     game.switch_player()
 
-        # Stop timer
-        end_time = time.time()
-        elapsed_time = end_time - start_time
+        elapsed_time = elapsed_ns / 1e9
 
         if show_board:
             winner = game.board.get_winner()
@@ -58,21 +86,55 @@ class Metrics:
         # Update total time
         self._total_time += elapsed_time
 
-        # Build result dict
-        result = {
-            'winner': game.board.get_winner() or 'Draw',
-            'elapsed_sec': elapsed_time,
-            'nodes_x': getattr(agent1, 'nodes_expanded', 0),
-            'nodes_o': getattr(agent2, 'nodes_expanded', 0),
-            'total_moves': move_count
-        }
-
-        # Save record
+        # Build result dict, save and return it
+        result = _game_record(game, agent1, agent2, elapsed_time, move_count, moves, stats_before)
+        if profiler is not None:
+            profiler.end_game(result)
         self.records.append(result)
+        return result
+
+    # Play one match without blocking the event loop on LLM agents
+    async def run_match_async(self, agent1, agent2, board_size: int) -> Dict:
+        # Same as run_match, but awaits get_action_async where an agent has it,
+        # so many games (e.g. GeminiAgent on a mock backend) can run concurrently
+        board = Board(size=board_size)
+        game = Game(board, agent1, agent2)
+        move_count = 0
+        moves: List[Dict] = []
+        stats_before = (_agent_stats(agent1), _agent_stats(agent2))
+        start_time = time.perf_counter()
+
+        while not game.board.is_game_over():
+            current_agent = game.get_current_agent()
+            empty_cells = len(game.board.get_valid_moves())
+            # Latency of an awaited move includes time spent waiting on other games
+            start_ns = time.perf_counter_ns()
+            if hasattr(current_agent, 'get_action_async'):
+                move = await current_agent.get_action_async(game.board)
+            else:
+                move = current_agent.get_action(game.board)
+            latency_ns = time.perf_counter_ns() - start_ns
+            moves.append(_move_telemetry(current_agent, game.current_player, latency_ns, empty_cells))
+
+            if game.board.make_move(move[0], move[1], game.current_player):
+                move_count += 1
+                if not game.board.is_game_over():
+                    game.switch_player()
 
-        # Return result
+        elapsed_time = time.perf_counter() - start_time
+        self._total_time += elapsed_time
+        result = _game_record(game, agent1, agent2, elapsed_time, move_count, moves, stats_before)
+        self.records.append(result)
         return result
 
+    # Play several matches at the same time
+    def run_concurrent_matches(self, agent_pairs: List, board_size: int = 3) -> List[Dict]:
+        # agent_pairs: [(agent_x, agent_o), ...], each pair with its own agent objects
+        async def play_all():
+            return await asyncio.gather(
+                *(self.run_match_async(ax, ao, board_size) for ax, ao in agent_pairs))
+        return asyncio.run(play_all())
+
     # Run N games and alternate first player
     def run_series(
         self,
@@ -80,28 +142,171 @@ class Metrics:
         agent_cls_o: Type,
         games: int = 20,
         board_size: int = 3,
+        cache_eval: bool = False,
+        workers: int = 1,
+        seed: Optional[int] = None,
+        sprt: Optional[SPRT] = None,
+        profiler=None,
+        reuse_agents: bool = False,
         **agent_kwargs
     ) -> None:
+        # agent_cls_x / agent_cls_o: agent class, functools.partial or agent registry name ('minimax', ...).
+        # workers > 1 plays the games in a process pool; the agents are built inside the workers,
+        # so the classes and agent_kwargs (e.g. eval_fn) must be picklable (defined at module level).
+        # seed makes every game reproducible: game g seeds random, numpy and agents that take a seed
+        # from (seed, g), so sequential and parallel runs give the same records.
+        # sprt (evaluation.sprt.SPRT) tests agent_cls_x against agent_cls_o as the games come in and
+        # stops the series once it accepts H0 or H1 (checked after each colour-swapped pair of games);
+        # games is then the maximum. The decision and games used are in sprt.result() / sprt_result.
+        # profiler (evaluation.profiling.Profiler) profiles every game; it needs workers=1.
+        # reuse_agents keeps one agent per (class, mark) for the whole series (AgentPool) and calls its
+        # reset_for_new_game() between games, so transposition tables, solver memos, network weights
+        # and API clients stay warm; with workers > 1 each worker process keeps its own pool.
+        if profiler is not None and workers > 1:
+            raise ValueError("run_series(profiler=...) profiles in this process; use workers=1.")
+        self.sprt_result = None
+        series_start = time.perf_counter()
 
-        # Loop over requested game count
-        for g in range(games):
-            # Even games: X = agent_cls_x, O = agent_cls_o
-            if g % 2 == 0:
-                ax = agent_cls_x(mark="X", **agent_kwargs)
-                ao = agent_cls_o(mark="O", **agent_kwargs)
-            # Odd games: swap roles
-            else:
-                ax = agent_cls_o(mark="X", **agent_kwargs)
-                ao = agent_cls_x(mark="O", **agent_kwargs)
+        # Share one memoized eval_fn across every agent and game of the series
+        # (with workers > 1: one cache per worker process, statistics merged here)
+        if cache_eval and agent_kwargs.get('eval_fn') is not None:
+            if not isinstance(agent_kwargs['eval_fn'], CachedEvaluator):
+                agent_kwargs['eval_fn'] = CachedEvaluator(agent_kwargs['eval_fn'])
+            self.eval_cache = agent_kwargs['eval_fn']
+
+        if workers > 1 and games > 1:
+            self._run_series_parallel(agent_cls_x, agent_cls_o, games, board_size, workers, seed, agent_kwargs, sprt,
+                                      reuse_agents)
+            self.sprt_result = sprt.result() if sprt is not None else None
+            self.last_series_wall_sec = time.perf_counter() - series_start
+            return
 
-            # Run match
-            self.run_match(ax, ao, board_size)
+        pool = AgentPool() if reuse_agents else None
+        try:
+            # Loop over requested game count
+            for g in range(games):
+                # Even games: X = agent_cls_x, O = agent_cls_o; odd games: swap roles
+                ax, ao = _build_game_agents(agent_cls_x, agent_cls_o, g, seed, agent_kwargs, pool)
+
+                # Run match, then stop the agents' background pondering (as the workers do)
+                try:
+                    result = self.run_match(ax, ao, board_size, profiler=profiler)
+                finally:
+                    for agent in (ax, ao):
+                        if getattr(agent, 'ponderer', None) is not None:
+                            agent.ponderer.stop()
+                if sprt is not None and _sprt_update(sprt, result, g):
+                    break
+        finally:
+            if pool is not None:
+                pool.close()
+        self.sprt_result = sprt.result() if sprt is not None else None
+        self.last_series_wall_sec = time.perf_counter() - series_start
+
+    # Play the games of a series in worker processes
+    def _run_series_parallel(self, agent_cls_x, agent_cls_o, games, board_size, workers, seed, agent_kwargs,
+                             sprt=None, reuse_agents=False) -> None:
+        series = (agent_cls_x, agent_cls_o, board_size, seed, agent_kwargs, reuse_agents)
+        try:
+            pickle.dumps(series)
+        except (pickle.PicklingError, AttributeError, TypeError) as e:
+            raise ValueError("run_series(workers > 1) needs picklable agent classes and agent_kwargs "
+                             f"(module-level classes/functions, functools.partial or registry names): {e}")
+
+        # "spawn": workers start clean instead of inheriting the parent's threads (e.g. ponderers)
+        context = multiprocessing.get_context("spawn")
+        # One game per task under an SPRT, so stopping early does not wait for whole chunks
+        chunksize = 1 if sprt is not None else max(1, games // (workers * 8))
+        with ProcessPoolExecutor(workers, mp_context=context, initializer=_init_series_worker,
+                                 initargs=(series,)) as pool:
+            # map returns results in game order, so records (and the SPRT decision) match a sequential run
+            for g, (result, cache_delta) in enumerate(pool.map(_play_series_game, range(games), chunksize=chunksize)):
+                self.records.append(result)
+                self._total_time += result['elapsed_sec']
+                if self.eval_cache is not None and cache_delta:
+                    self.eval_cache.hits += cache_delta[0]
+                    self.eval_cache.misses += cache_delta[1]
+                    self.eval_cache._eval_time += cache_delta[2]
+                if sprt is not None and _sprt_update(sprt, result, g):
+                    # Drop the queued games; games already running finish and are discarded
+                    pool.shutdown(wait=True, cancel_futures=True)
+                    break
 
     # Return total execution time
     def get_execution_time(self) -> float:
         # Rounded to 4 dp
         return round(self._total_time, 4)
 
+    # Return hit rate and time saved by the memoized eval_fn
+    def get_eval_cache_stats(self) -> Dict[str, float]:
+        # Empty if the series ran without cache_eval
+        return self.eval_cache.get_stats() if self.eval_cache is not None else {}
+
+    # Return counters reported by the agents' get_agent_stats() (e.g. API calls, cache hits)
+    def get_agent_stats(self) -> Dict[str, Dict[str, float]]:
+        # Summed over all games, per side
+        totals: Dict[str, Dict[str, float]] = {"X": {}, "O": {}}
+        for r in self.records:
+            for side, key in (("X", "agent_stats_x"), ("O", "agent_stats_o")):
+                for name, value in r.get(key, {}).items():
+                    totals[side][name] = totals[side].get(name, 0) + value
+        return totals
+
+    # Return the SPRT decision of the last run_series and the games it used
+    def get_sprt_result(self) -> Dict:
+        # Empty if the series ran without an SPRT
+        return self.sprt_result or {}
+
+    # Return per-move telemetry of every game (latency, nodes, nodes/sec, depth)
+    def get_move_telemetry(self, agent: Optional[str] = None) -> List[Dict]:
+        # Flat list in play order; agent filters by agent class name (e.g. 'AlphaBetaAgent')
+        return [dict(m, game=g) for g, r in enumerate(self.records) for m in r.get('moves', [])
+                if agent is None or m['agent'] == agent]
+
+    # Return move latency percentiles and node rates per agent
+    def get_move_latency_stats(self, percentiles: Tuple[float, ...] = (50, 95, 99)) -> Dict[str, Dict[str, float]]:
+        # {agent class name: {'moves', 'mean_ms', 'p50_ms', 'p95_ms', 'p99_ms', 'max_ms',
+        #                     'avg_nodes', 'nodes_per_sec', 'avg_depth'}}
+        stats: Dict[str, Dict[str, float]] = {}
+        for agent, moves in self._moves_by_agent().items():
+            latency_ms = np.array([m['latency_ns'] for m in moves]) / 1e6
+            nodes = np.array([m['nodes'] for m in moves])
+            depths = [m['depth'] for m in moves if m['depth'] is not None]
+            summary = {'moves': len(moves), 'mean_ms': round(float(latency_ms.mean()), 4)}
+            for p, value in zip(percentiles, np.percentile(latency_ms, percentiles)):
+                summary[f"p{p:g}_ms"] = round(float(value), 4)
+            summary['max_ms'] = round(float(latency_ms.max()), 4)
+            summary['avg_nodes'] = round(float(nodes.mean()), 1)
+            # Overall rate: all nodes over all thinking time (not the mean of per-move rates)
+            total_sec = latency_ms.sum() / 1000
+            summary['nodes_per_sec'] = round(float(nodes.sum() / total_sec), 1) if total_sec > 0 else 0.0
+            summary['avg_depth'] = round(sum(depths) / len(depths), 2) if depths else None
+            stats[agent] = summary
+        return stats
+
+    # Return move latency histograms per agent
+    def get_move_latency_histogram(self, bins: int = 20) -> Dict[str, Dict[str, List[float]]]:
+        # Log-spaced millisecond buckets shared by all agents: {agent: {'edges_ms', 'counts'}}
+        by_agent = self._moves_by_agent()
+        if not by_agent:
+            return {}
+        latency_ms = {agent: np.array([m['latency_ns'] for m in moves]) / 1e6 for agent, moves in by_agent.items()}
+        low = max(min(float(v.min()) for v in latency_ms.values()), 1e-3)
+        high = max(max(float(v.max()) for v in latency_ms.values()), low * 10)
+        edges = np.geomspace(low, high, bins + 1)
+        histograms = {}
+        for agent, values in latency_ms.items():
+            counts, _ = np.histogram(np.clip(values, low, high), bins=edges)
+            histograms[agent] = {'edges_ms': [round(float(e), 4) for e in edges], 'counts': counts.tolist()}
+        return histograms
+
+    def _moves_by_agent(self) -> Dict[str, List[Dict]]:
+        by_agent: Dict[str, List[Dict]] = {}
+        for r in self.records:
+            for m in r.get('moves', []):
+                by_agent.setdefault(m['agent'], []).append(m)
+        return by_agent
+
     # Return cumulative node counts
     def get_nodes_evaluated(self) -> Dict[str, int]:
         # Sum nodes for each side
@@ -118,4 +323,174 @@ class Metrics:
             tally[r["winner"]] += 1
         total = len(self.records) or 1
         # Compute proportions
-        return {k: round(v / total, 3) for k, v in tally.items()}
\ No newline at end of file
+        return {k: round(v / total, 3) for k, v in tally.items()}
+
+
+class AgentPool:
+    # Agents of a series kept from game to game instead of being built for every game:
+    # one instance per (agent class/partial/registry name, mark). Before every game,
+    # the first included, the agent's reset_for_new_game() clears its per-game state
+    # (nodes_expanded, last search results, pondering) while warm state (transposition
+    # tables, solver memos, network weights, API clients) carries over. Agents without
+    # the hook are built anew for every game.
+    def __init__(self) -> None:
+        self.agents: Dict[Tuple, object] = {}
+        self.created = 0  # Full constructions
+        self.reused = 0  # Games started with reset_for_new_game()
+
+    def acquire(self, spec, mark: str, **kwargs):
+        # Agent for spec playing mark; kwargs are the constructor arguments (a seed in them
+        # is passed on to reset_for_new_game(seed=...) if the agent takes one)
+        key = (spec, mark)
+        agent = self.agents.get(key)
+        if agent is None or not hasattr(agent, 'reset_for_new_game'):
+            agent = agent_factory(spec)(mark=mark, **kwargs)
+            self.agents[key] = agent
+            self.created += 1
+        else:
+            self.reused += 1
+        reset = getattr(agent, 'reset_for_new_game', None)
+        if reset is not None:
+            if 'seed' in kwargs and accepts_seed(reset):
+                reset(seed=kwargs['seed'])
+            else:
+                reset()
+        return agent
+
+    def close(self) -> None:
+        # Stops background pondering and drops the agents
+        for agent in self.agents.values():
+            if getattr(agent, 'ponderer', None) is not None:
+                agent.ponderer.stop()
+        self.agents.clear()
+
+
+# Counters an agent exposes through an optional get_agent_stats() hook
+def _agent_stats(agent) -> Dict[str, float]:
+    get_stats = getattr(agent, 'get_agent_stats', None)
+    return get_stats() if get_stats is not None else {}
+
+
+# Per-game change of an agent's cumulative counters
+def _stats_delta(before: Dict[str, float], after: Dict[str, float]) -> Dict[str, float]:
+    return {name: value - before.get(name, 0) for name, value in after.items()
+            if isinstance(value, (int, float))}
+
+
+# Result dict of a finished game
+def _game_record(game, agent1, agent2, elapsed_time, move_count, moves, stats_before) -> Dict:
+    return {
+        'winner': game.board.get_winner() or 'Draw',
+        'elapsed_sec': elapsed_time,
+        # Agents reset nodes_expanded on every get_action, so sum the moves for the game total
+        'nodes_x': sum(m['nodes'] for m in moves if m['mark'] == agent1.mark),
+        'nodes_o': sum(m['nodes'] for m in moves if m['mark'] == agent2.mark),
+        'total_moves': move_count,
+        'agent_stats_x': _stats_delta(stats_before[0], _agent_stats(agent1)),
+        'agent_stats_o': _stats_delta(stats_before[1], _agent_stats(agent2)),
+        'moves': moves
+    }
+
+
+# Telemetry of one get_action call
+def _move_telemetry(agent, mark: str, latency_ns: int, empty_cells: int) -> Dict:
+    nodes = getattr(agent, 'nodes_expanded', 0) or 0
+    return {
+        'mark': mark,
+        'agent': type(agent).__name__,
+        'latency_ns': latency_ns,
+        'nodes': nodes,
+        'nodes_per_sec': round(nodes * 1e9 / latency_ns, 1) if latency_ns > 0 else 0.0,
+        'depth': search_depth(agent, empty_cells)
+    }
+
+
+# Plies searched for a move: max_depth capped by the empty cells, or all of them when
+# the endgame solver took over; None for agents without a depth limit (MCTS, Gemini, human)
+def search_depth(agent, empty_cells: int) -> Optional[int]:
+    max_depth = getattr(agent, 'max_depth', None)
+    if max_depth is None:
+        return None
+    if getattr(agent, 'endgame', None) is not None and empty_cells <= getattr(agent, 'endgame_threshold', 0):
+        return empty_cells
+    return min(max_depth, empty_cells)
+
+
+# Feeds game g of a series to the SPRT from agent_cls_x's side (X on even games);
+# True once a colour-swapped pair is complete and the test has decided
+def _sprt_update(sprt: SPRT, result: Dict, game: int) -> bool:
+    tested_mark = 'X' if game % 2 == 0 else 'O'
+    points = 0.5 if result['winner'] == 'Draw' else float(result['winner'] == tested_mark)
+    sprt.update(points)
+    return game % 2 == 1 and sprt.decision() is not None
+
+
+# Seed of game g in a seeded series
+def seed_for_game(seed: int, game: int) -> int:
+    return (seed * 1_000_003 + game) % 2**32
+
+
+# Agent class from a class, partial or agent registry name
+def agent_factory(spec):
+    if isinstance(spec, str):
+        from agents.registry import load_agent
+        return load_agent(spec)
+    return spec
+
+
+# Agents of game g of a series (X first on even games), seeded if seed is given;
+# taken from pool (AgentPool) when the series reuses its agents
+def _build_game_agents(agent_cls_x, agent_cls_o, game: int, seed: Optional[int], agent_kwargs: Dict,
+                       pool: Optional[AgentPool] = None) -> Tuple:
+    first, second = (agent_cls_x, agent_cls_o) if game % 2 == 0 else (agent_cls_o, agent_cls_x)
+    if seed is not None:
+        random.seed(seed_for_game(seed, game))
+        np.random.seed(seed_for_game(seed, game))
+    agents = []
+    for side, (spec, mark) in enumerate(((first, 'X'), (second, 'O'))):
+        factory = agent_factory(spec)
+        kwargs = dict(agent_kwargs)
+        # Agents with their own random generator (e.g. MCTSAgent) get a seed too
+        if seed is not None and 'seed' not in kwargs and accepts_seed(factory):
+            kwargs['seed'] = seed_for_game(seed, game) * 2 + side
+        agents.append(pool.acquire(spec, mark, **kwargs) if pool is not None else factory(mark=mark, **kwargs))
+    return tuple(agents)
+
+
+# True if the agent factory (class, partial or function) takes a seed argument
+def accepts_seed(factory) -> bool:
+    try:
+        return 'seed' in inspect.signature(factory).parameters
+    except (TypeError, ValueError):
+        return False
+
+
+# Series settings and agent pool of the current worker process (set once by _init_series_worker)
+_worker_series = None
+_worker_pool = None
+
+
+def _init_series_worker(series) -> None:
+    global _worker_series, _worker_pool
+    _worker_series = series
+    _worker_pool = AgentPool() if series[5] else None
+
+
+# Runs in a worker: plays game g, returns its record and the eval cache counters it added
+def _play_series_game(game: int):
+    agent_cls_x, agent_cls_o, board_size, seed, agent_kwargs, _ = _worker_series
+    eval_cache = agent_kwargs.get('eval_fn')
+    if not isinstance(eval_cache, CachedEvaluator):
+        eval_cache = None
+    before = (eval_cache.hits, eval_cache.misses, eval_cache._eval_time) if eval_cache else None
+
+    ax, ao = _build_game_agents(agent_cls_x, agent_cls_o, game, seed, agent_kwargs, _worker_pool)
+    result = Metrics().run_match(ax, ao, board_size)
+    for agent in (ax, ao):
+        if getattr(agent, 'ponderer', None) is not None:
+            agent.ponderer.stop()
+
+    cache_delta = None
+    if eval_cache is not None:
+        cache_delta = (eval_cache.hits - before[0], eval_cache.misses - before[1], eval_cache._eval_time - before[2])
+    return result, cache_delta
\ No newline at end of file
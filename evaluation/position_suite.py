@@ -0,0 +1,301 @@
+# === Import libraries and modules ===
+import json
+import multiprocessing
+import pickle
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+from agents.endgame_solver import EndgameSolver
+from evaluation.metrics import search_depth
+from game.board import Board
+# =========================================
+
+# === Position suites ===
+# Fixed test positions for measuring agents on more than whole games from the empty
+# board. A suite is a text file with one position per line:
+#
+#   <rows> <side to move> [key=value ...]          # comment
+#   X.O/.X./... O id=3x3-0042 value=-1 bm=2,2
+#
+#   rows   cells row by row ('X', 'O' or '.'), rows separated by '/'
+#   side   'X' or 'O', the player to move
+#   id     name of the position
+#   value  exact game value for the side to move: 1 win, 0 draw, -1 loss
+#   bm     best moves (row,col;row,col...): every move that keeps the game value
+#   k      winning length when it differs from the Board default (3 on 3x3, 5 otherwise)
+#
+# Known answers come from agents/endgame_solver.py. run_suite() lets every agent
+# configuration (evaluation.tournament.AgentConfig) pick a move in every position,
+# optionally in a process pool across positions, and summarize() reports accuracy
+# against bm, nodes, time and depth. Shipped suites are in positions/.
+#
+# Usage:
+#   positions = load_suite("positions/3x3_all.txt")
+#   results = run_suite(positions, [AgentConfig('ab4', 'alphabeta', eval_for_mark=WinLossEval, max_depth=4)],
+#                       workers=4)
+#   print_report(summarize(results))
+# =========================
+
+
+class Position:
+    def __init__(self, rows: str, to_move: str, id: Optional[str] = None, value: Optional[int] = None,
+                 best_moves: Optional[List[Tuple[int, int]]] = None, winning_length: Optional[int] = None) -> None:
+        self.rows = rows  # e.g. "X.O/.X./..."
+        self.to_move = to_move
+        self.id = id
+        self.value = value  # Exact value for to_move (None if unknown)
+        self.best_moves = best_moves  # Moves that keep the value (None if unknown)
+        self.winning_length = winning_length  # None = Board default
+
+    @property
+    def size(self) -> int:
+        return self.rows.count("/") + 1
+
+    def board(self) -> Board:
+        board = Board(self.size)
+        if self.winning_length is not None:
+            board.winning_length = self.winning_length
+        for row, line in enumerate(self.rows.split("/")):
+            for col, cell in enumerate(line):
+                if cell in "XO":
+                    board.board[row, col] = cell
+                    board.move_log.append((row, col, cell))
+                    board.total_move += 1
+        return board
+
+    @classmethod
+    def from_board(cls, board: Board, to_move: str, **kwargs) -> "Position":
+        rows = "/".join("".join(cell or '.' for cell in row) for row in board.board)
+        default_length = Board(board.size).winning_length
+        if board.winning_length != default_length:
+            kwargs.setdefault('winning_length', board.winning_length)
+        return cls(rows, to_move, **kwargs)
+
+    @classmethod
+    def from_line(cls, line: str) -> Optional["Position"]:
+        # None for blank and comment lines
+        fields = line.split("#", 1)[0].split()
+        if not fields:
+            return None
+        if len(fields) < 2 or fields[1] not in ('X', 'O'):
+            raise ValueError(f"Expected '<rows> <X|O> [key=value ...]', got: {line.strip()}")
+        options = dict(field.split("=", 1) for field in fields[2:])
+        best_moves = None
+        if 'bm' in options:
+            best_moves = [tuple(int(v) for v in move.split(",")) for move in options['bm'].split(";")]
+        return cls(fields[0], fields[1], id=options.get('id'),
+                   value=int(options['value']) if 'value' in options else None, best_moves=best_moves,
+                   winning_length=int(options['k']) if 'k' in options else None)
+
+    def to_line(self) -> str:
+        fields = [self.rows, self.to_move]
+        if self.id is not None:
+            fields.append(f"id={self.id}")
+        if self.winning_length is not None:
+            fields.append(f"k={self.winning_length}")
+        if self.value is not None:
+            fields.append(f"value={self.value}")
+        if self.best_moves is not None:
+            fields.append("bm=" + ";".join(f"{row},{col}" for row, col in self.best_moves))
+        return " ".join(fields)
+
+    def __repr__(self) -> str:
+        return f"Position({self.to_line()!r})"
+
+
+def load_suite(path: str) -> List[Position]:
+    positions = []
+    with open(path) as f:
+        for number, line in enumerate(f, 1):
+            try:
+                position = Position.from_line(line)
+            except ValueError as e:
+                raise ValueError(f"{path}:{number}: {e}")
+            if position is not None:
+                positions.append(position)
+    return positions
+
+
+def save_suite(path: str, positions: List[Position], header: str = "") -> None:
+    with open(path, "w") as f:
+        for line in header.splitlines():
+            f.write(f"# {line}\n".replace("# \n", "#\n"))
+        for position in positions:
+            f.write(position.to_line() + "\n")
+
+
+# === Known answers ===
+
+def solve_position(position: Position, solver: Optional[EndgameSolver] = None) -> Position:
+    # Fills in value and best_moves with the exact solver (all moves that keep the game value)
+    solver = solver or EndgameSolver(max_entries=2_000_000)
+    scores = solver.move_scores(position.board(), position.to_move)
+    values = {move: (score > 0) - (score < 0) for move, score in scores.items()}
+    position.value = max(values.values())
+    position.best_moves = sorted(move for move, value in values.items() if value == position.value)
+    return position
+
+
+def all_positions(size: int = 3, winning_length: Optional[int] = None) -> List[Position]:
+    # Every reachable non-terminal position (X moves first), in order of move count
+    start = Board(size)
+    if winning_length is not None:
+        start.winning_length = winning_length
+    positions, seen, frontier = [], set(), [start]
+    while frontier:
+        next_frontier = []
+        for board in frontier:
+            if board.is_game_over():
+                continue
+            to_move = board.get_current_player()
+            positions.append(Position.from_board(board, to_move))
+            for move in board.get_valid_moves():
+                child = board.generate_successor(move, to_move)
+                key = child.get_key()
+                if key not in seen:
+                    seen.add(key)
+                    next_frontier.append(child)
+        frontier = next_frontier
+    return positions
+
+
+def sample_positions(size: int, count: int, min_empty: int, max_empty: int,
+                     winning_length: Optional[int] = None, seed: int = 0) -> List[Position]:
+    # Distinct non-terminal positions from random playouts, with min_empty..max_empty empty cells
+    rng = random.Random(seed)
+    positions, seen = [], set()
+    attempts = 0
+    while len(positions) < count and attempts < count * 100:
+        attempts += 1
+        board = Board(size)
+        if winning_length is not None:
+            board.winning_length = winning_length
+        target = rng.randint(min_empty, max_empty)
+        while len(board.get_valid_moves()) > target and not board.is_game_over():
+            row, col = rng.choice(board.get_valid_moves())
+            board.make_move(row, col, board.get_current_player())
+        if board.is_game_over() or board.get_key() in seen:
+            continue
+        seen.add(board.get_key())
+        positions.append(Position.from_board(board, board.get_current_player()))
+    return positions
+
+
+# === Runner ===
+
+def run_suite(positions: List[Position], configs: List, workers: int = 1) -> List[Dict]:
+    # One result dict per (agent configuration, position): move, correct, nodes, time, depth
+    lines = [position.to_line() for position in positions]
+    if workers > 1 and len(lines) > 1:
+        try:
+            pickle.dumps(configs)
+        except (pickle.PicklingError, AttributeError, TypeError) as e:
+            raise ValueError("run_suite(workers > 1) needs picklable agent configurations "
+                             f"(module-level classes/functions, functools.partial or registry names): {e}")
+        # Small chunks of positions keep the workers evenly loaded
+        chunk = max(1, len(lines) // (workers * 16))
+        tasks = [(c, lines[i:i + chunk]) for c in range(len(configs)) for i in range(0, len(lines), chunk)]
+        context = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(workers, mp_context=context, initializer=_init_suite_worker,
+                                 initargs=(configs,)) as pool:
+            chunks = list(pool.map(_solve_positions, tasks))
+    else:
+        _init_suite_worker(configs)
+        chunks = [_solve_positions((c, lines)) for c in range(len(configs))]
+    return [result for chunk in chunks for result in chunk]
+
+
+def summarize(results: List[Dict]) -> Dict[str, Dict]:
+    # Per agent: accuracy (all positions with known answers, and non-trivial ones where some
+    # move loses value), accuracy per game value, time, nodes and depth
+    summary = {}
+    for agent in dict.fromkeys(r['agent'] for r in results):
+        rows = [r for r in results if r['agent'] == agent]
+        graded = [r for r in rows if r['correct'] is not None]
+        critical = [r for r in graded if r['critical']]
+        latency_ms = np.array([r['latency_ms'] for r in rows])
+        depths = [r['depth'] for r in rows if r['depth'] is not None]
+        by_value = {}
+        for value, label in ((1, 'win'), (0, 'draw'), (-1, 'loss')):
+            subset = [r for r in graded if r['value'] == value]
+            if subset:
+                by_value[label] = round(sum(r['correct'] for r in subset) / len(subset), 4)
+        summary[agent] = {
+            'positions': len(rows),
+            'accuracy': round(sum(r['correct'] for r in graded) / len(graded), 4) if graded else None,
+            'critical_positions': len(critical),
+            'critical_accuracy': round(sum(r['correct'] for r in critical) / len(critical), 4) if critical else None,
+            'accuracy_by_value': by_value,
+            'total_sec': round(float(latency_ms.sum()) / 1000, 4),
+            'mean_ms': round(float(latency_ms.mean()), 4),
+            'p95_ms': round(float(np.percentile(latency_ms, 95)), 4),
+            'mean_nodes': round(float(np.mean([r['nodes'] for r in rows])), 1),
+            'total_nodes': int(sum(r['nodes'] for r in rows)),
+            'mean_depth': round(sum(depths) / len(depths), 2) if depths else None
+        }
+    return summary
+
+
+def print_report(summary: Dict[str, Dict], title: str = "Position suite") -> None:
+    print(f"\n=== {title} ===")
+    print(f"{'agent':<16} {'positions':>9} {'accuracy':>9} {'critical':>16} {'mean ms':>9} {'p95 ms':>9} "
+          f"{'nodes/pos':>10} {'depth':>6}")
+    for agent, s in summary.items():
+        accuracy = f"{s['accuracy'] * 100:.1f}%" if s['accuracy'] is not None else "-"
+        critical = f"{s['critical_accuracy'] * 100:.1f}% of {s['critical_positions']}" \
+            if s['critical_accuracy'] is not None else "-"
+        depth = f"{s['mean_depth']:.1f}" if s['mean_depth'] is not None else "-"
+        print(f"{agent:<16} {s['positions']:>9} {accuracy:>9} {critical:>16} {s['mean_ms']:>9.2f} "
+              f"{s['p95_ms']:>9.2f} {s['mean_nodes']:>10.1f} {depth:>6}")
+        if s['accuracy_by_value']:
+            print(f"{'':<16} by value: " + ", ".join(f"{label} {acc * 100:.1f}%"
+                                                    for label, acc in s['accuracy_by_value'].items()))
+
+
+def save_results(path: str, results: List[Dict], summary: Dict[str, Dict]) -> None:
+    with open(path, "w") as f:
+        json.dump({'summary': summary, 'results': results}, f, indent=2)
+
+
+# Agent configurations of the current process (set once by _init_suite_worker)
+_worker_configs = None
+
+
+def _init_suite_worker(configs) -> None:
+    global _worker_configs
+    _worker_configs = configs
+
+
+# Runs in a worker: one agent configuration on a chunk of positions (as suite lines)
+def _solve_positions(task) -> List[Dict]:
+    config_index, lines = task
+    config = _worker_configs[config_index]
+    results = []
+    for line in lines:
+        position = Position.from_line(line)
+        board = position.board()
+        agent = config.create(position.to_move)
+        empty_cells = len(board.get_valid_moves())
+        start_ns = time.perf_counter_ns()
+        move = tuple(agent.get_action(board))
+        latency_ns = time.perf_counter_ns() - start_ns
+        if getattr(agent, 'ponderer', None) is not None:
+            agent.ponderer.stop()
+        known = position.best_moves is not None
+        results.append({
+            'agent': config.name,
+            'id': position.id,
+            'position': position.rows,
+            'to_move': position.to_move,
+            'move': list(move),
+            'value': position.value,
+            'correct': (move in position.best_moves) if known else None,
+            # Critical: not every move keeps the value, so the choice matters
+            'critical': known and len(position.best_moves) < empty_cells,
+            'latency_ms': round(latency_ns / 1e6, 4),
+            'nodes': getattr(agent, 'nodes_expanded', 0) or 0,
+            'depth': search_depth(agent, empty_cells)
+        })
+    return results
@@ -0,0 +1,252 @@
+# === Import libraries and modules ===
+import cProfile
+import io
+import json
+import os
+import pstats
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from typing import Dict, List, Optional
+from evaluation.metrics import search_depth
+# =========================================
+
+# === Search profiler ===
+# Opt-in profiling of agent moves, for finding hot spots (check_win, node allocation,
+# eval_fn, ...) straight from games and benchmark runs. Pass a Profiler to
+# Metrics.run_match / run_series (or wrap any call with capture()) and it records,
+# per move or per game:
+#   cprofile  cProfile statistics: <name>.prof (pstats / snakeviz) and a <name>.txt summary
+#   stacks    sampled call stacks in collapsed format: <name>.folded (flamegraph.pl, speedscope)
+#   memory    tracemalloc peak and the sites of memory still held afterwards (slows allocations down)
+# Files go to results/profiles next to the Logger output, with an index.json describing
+# every capture: agent, mark, search depth, position, move number, time and nodes.
+#
+# Usage:
+#   profiler = Profiler(cprofile=True, stacks=True, memory=True, per='move')
+#   metrics.run_series(MinimaxAgent, AlphaBetaAgent, games=2, profiler=profiler, ...)
+#   profiler.print_summary()
+# =========================
+
+
+class StackSampler:
+    def __init__(self, interval: float = 0.001) -> None:
+        self.interval = interval  # Seconds between samples (at least the interpreter's switch interval)
+        self.counts: Counter = Counter()
+        self._thread_id = None
+        self._stop = threading.Event()
+        self._sampler = None
+
+    def start(self) -> None:
+        # Samples the calling thread until stop()
+        self._thread_id = threading.get_ident()
+        self._stop.clear()
+        self._sampler = threading.Thread(target=self._run, name="stack-sampler", daemon=True)
+        self._sampler.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._sampler.join()
+
+    def folded(self) -> str:
+        # One "outer;...;inner count" line per distinct stack
+        return "".join(f"{stack} {count}\n" for stack, count in self.counts.most_common())
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self._thread_id)
+            names = []
+            while frame is not None:
+                code = frame.f_code
+                names.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+                frame = frame.f_back
+            if names:
+                self.counts[";".join(reversed(names))] += 1
+
+
+class Profiler:
+    def __init__(self, cprofile: bool = True, stacks: bool = False, memory: bool = False, per: str = 'move',
+                 output_dir: Optional[str] = None, sample_interval: float = 0.001, top: int = 25,
+                 name: Optional[str] = None) -> None:
+        if per not in ('move', 'game'):
+            raise ValueError(f"per must be 'move' or 'game', not {per!r}")
+        self.cprofile = cprofile
+        self.stacks = stacks
+        self.memory = memory
+        self.per = per  # One capture per agent move or per whole game
+        self.output_dir = output_dir or os.path.join("results", "profiles", name or time.strftime("%Y%m%d_%H%M%S"))
+        self.sample_interval = sample_interval
+        self.top = top  # Functions / allocation sites kept in the summaries
+        self.entries: List[Dict] = []  # One metadata dict per capture (also in index.json)
+        self.game = -1
+        self._move = 0
+        self._active = None
+
+    # === Hooks called by Metrics.run_match ===
+
+    def begin_game(self, agent1, agent2, board) -> None:
+        self.game += 1
+        self._move = 0
+        if self.per == 'game':
+            self._start({'kind': 'game', 'game': self.game, 'agents': {agent1.mark: type(agent1).__name__,
+                                                                       agent2.mark: type(agent2).__name__},
+                         'board_size': board.size})
+
+    def begin_move(self, agent, board, mark: str) -> None:
+        self._move += 1
+        if self.per == 'move':
+            self._start({'kind': 'move', 'game': self.game, 'move': self._move, 'agent': type(agent).__name__,
+                         'mark': mark, 'depth': _depth_of(agent, board), 'position': _position(board),
+                         'empty_cells': len(board.get_valid_moves())})
+
+    def end_move(self, agent, action, latency_ns: int) -> None:
+        if self.per == 'move':
+            self._finish({'action': list(action), 'latency_ms': round(latency_ns / 1e6, 4),
+                          'nodes': getattr(agent, 'nodes_expanded', 0) or 0})
+
+    def end_game(self, result: Dict) -> None:
+        if self.per == 'game':
+            self._finish({'winner': result['winner'], 'total_moves': result['total_moves'],
+                          'elapsed_sec': round(result['elapsed_sec'], 4),
+                          'nodes': {'X': result['nodes_x'], 'O': result['nodes_o']}})
+
+    # === Standalone use ===
+
+    def capture(self, fn, *args, label: str = 'call', **metadata):
+        # Profiles one call fn(*args) and returns its result; metadata goes to the index
+        self._start(dict(kind=label, **metadata))
+        try:
+            return fn(*args)
+        finally:
+            self._finish({})
+
+    def print_summary(self, limit: int = 10) -> None:
+        # Slowest captures first
+        print(f"\n=== Profiles in {self.output_dir} ({len(self.entries)} captures) ===")
+        slowest = sorted(self.entries, key=lambda e: -e['wall_ms'])[:limit]
+        for entry in slowest:
+            where = f"game {entry['game']}" if 'game' in entry else entry['kind']
+            where += f" move {entry['move']}" if 'move' in entry else ""
+            who = entry.get('agent') or entry.get('agents') or ''
+            peak = f", peak {entry['peak_kb']:.0f} KB" if 'peak_kb' in entry else ""
+            print(f"  {where:<18} {str(who):<22} {entry['wall_ms']:10.2f} ms{peak}")
+            for function in entry.get('hot_functions', [])[:3]:
+                print(f"      {function['cumtime_ms']:10.2f} ms cumulative  {function['function']}")
+
+    # === Internals ===
+
+    def _start(self, metadata: Dict) -> None:
+        if self._active is not None:
+            raise RuntimeError("A profile capture is already running.")
+        active = {'metadata': metadata}
+        if self.memory:
+            active['tracemalloc_was_on'] = tracemalloc.is_tracing()
+            if not active['tracemalloc_was_on']:
+                tracemalloc.start()
+            else:
+                # Only allocations made from here on are reported
+                active['memory_snapshot'] = tracemalloc.take_snapshot()
+            tracemalloc.reset_peak()
+            active['memory_start'] = tracemalloc.get_traced_memory()[0]
+        if self.stacks:
+            active['sampler'] = StackSampler(self.sample_interval)
+            active['sampler'].start()
+        if self.cprofile:
+            active['profile'] = cProfile.Profile()
+            active['profile'].enable()
+        active['start'] = time.perf_counter()
+        self._active = active
+
+    def _finish(self, metadata: Dict) -> None:
+        active, self._active = self._active, None
+        if active is None:
+            return
+        wall = time.perf_counter() - active['start']
+        if 'profile' in active:
+            active['profile'].disable()
+        if 'sampler' in active:
+            active['sampler'].stop()
+
+        entry = dict(active['metadata'], **metadata)
+        entry['wall_ms'] = round(wall * 1000, 4)
+        if self.memory:
+            # Before the profile is processed, so its allocations are not counted
+            entry.update(_memory_stats(active, self.top))
+        os.makedirs(self.output_dir, exist_ok=True)
+        name = self._file_name(entry)
+        files = {}
+
+        if 'profile' in active:
+            files['cprofile'] = os.path.join(self.output_dir, name + ".prof")
+            active['profile'].dump_stats(files['cprofile'])
+            stats = pstats.Stats(active['profile'], stream=io.StringIO())
+            entry['hot_functions'] = _hot_functions(stats, self.top)
+            files['summary'] = os.path.join(self.output_dir, name + ".txt")
+            with open(files['summary'], "w") as f:
+                f.write(json.dumps({k: v for k, v in entry.items() if k != 'hot_functions'}) + "\n\n")
+                stats.stream = f
+                stats.sort_stats('cumulative').print_stats(self.top)
+
+        if 'sampler' in active:
+            files['stacks'] = os.path.join(self.output_dir, name + ".folded")
+            with open(files['stacks'], "w") as f:
+                f.write(active['sampler'].folded())
+            entry['stack_samples'] = sum(active['sampler'].counts.values())
+
+        entry['files'] = files
+        self.entries.append(entry)
+        with open(os.path.join(self.output_dir, "index.json"), "w") as f:
+            json.dump(self.entries, f, indent=2)
+
+    def _file_name(self, entry: Dict) -> str:
+        parts = [f"g{entry['game']:03d}"] if isinstance(entry.get('game'), int) and entry['game'] >= 0 else []
+        if 'move' in entry:
+            parts.append(f"m{entry['move']:03d}")
+        parts.append(entry.get('agent') or entry['kind'])
+        parts.append(str(len(self.entries)))
+        return "_".join(parts)
+
+
+# Files whose allocations belong to the profiler itself
+_PROFILER_FILES = ('*/cProfile.py', '*/pstats.py', '*/tracemalloc.py', '*/threading.py', __file__)
+
+
+# Peak and retained memory of a capture, and the sites holding the most retained memory
+def _memory_stats(active: Dict, top: int) -> Dict:
+    current, peak = tracemalloc.get_traced_memory()
+    snapshot = tracemalloc.take_snapshot().filter_traces(
+        [tracemalloc.Filter(False, pattern) for pattern in _PROFILER_FILES])
+    if 'memory_snapshot' in active:
+        stats = [stat for stat in snapshot.compare_to(active['memory_snapshot'], 'lineno') if stat.size_diff > 0]
+        sites = [(stat.traceback[0], stat.size_diff, stat.count_diff) for stat in stats]
+    else:
+        sites = [(stat.traceback[0], stat.size, stat.count) for stat in snapshot.statistics('lineno')]
+        tracemalloc.stop()
+    return {
+        'peak_kb': round((peak - active['memory_start']) / 1024, 1),
+        'retained_kb': round((current - active['memory_start']) / 1024, 1),
+        'top_allocations': [{'site': f"{frame.filename}:{frame.lineno}", 'kb': round(size / 1024, 1), 'count': count}
+                            for frame, size, count in sites[:top]]
+    }
+
+
+# Plies the agent will search from board (None for agents without a depth limit)
+def _depth_of(agent, board) -> Optional[int]:
+    return search_depth(agent, len(board.get_valid_moves()))
+
+
+# Board as rows of X, O and '.', separated by '/'
+def _position(board) -> str:
+    return "/".join("".join(cell or '.' for cell in row) for row in board.board)
+
+
+# Top functions by cumulative time from pstats
+def _hot_functions(stats: pstats.Stats, top: int) -> List[Dict]:
+    rows = []
+    for (filename, line, function), (_, calls, tottime, cumtime, _) in stats.stats.items():
+        rows.append({'function': f"{function} ({os.path.basename(filename)}:{line})", 'calls': calls,
+                     'tottime_ms': round(tottime * 1000, 3), 'cumtime_ms': round(cumtime * 1000, 3)})
+    rows.sort(key=lambda row: -row['cumtime_ms'])
+    return rows[:top]
@@ -88,6 +88,35 @@ class Logger:
 
         self.log(game_result)
 
+    def log_move_latency(self, latency_stats: Dict[str, Dict[str, Any]], label: Optional[str] = None,
+                         histograms: Optional[Dict[str, Dict[str, List[float]]]] = None,
+                         additional_data: Optional[Dict] = None):
+        """
+        Log per-agent move latency percentiles and node rates.
+
+        Args:
+            latency_stats (Dict): Output of Metrics.get_move_latency_stats()
+            label (str, optional): What was measured (e.g. 'minimax vs alphabeta')
+            histograms (Dict, optional): Output of Metrics.get_move_latency_histogram()
+            additional_data (Dict, optional): Extra fields to store with the entry
+        """
+        entry = {'record_type': 'move_latency', 'label': label, 'latency': latency_stats}
+        if histograms:
+            entry['histograms'] = histograms
+        if additional_data:
+            entry.update(additional_data)
+
+        self.log(entry)
+
+    def get_latency_logs(self) -> List[Dict[str, Any]]:
+        """
+        Get the move latency entries written by log_move_latency.
+
+        Returns:
+            List[Dict]: Latency entries, oldest first
+        """
+        return [log for log in self.logs if log.get('record_type') == 'move_latency']
+
     def get_logs(self) -> List[Dict[str, Any]]:
         """
         Get all logged results.
@@ -238,6 +267,15 @@ class Logger:
                 if summary['avg_nodes_evaluated']:
                     print(f"  Avg nodes evaluated: {summary['avg_nodes_evaluated']:.0f}")
 
+        # Latest move latency percentiles, if any were logged
+        latency_logs = self.get_latency_logs()
+        if latency_logs:
+            print(f"\nMove latency ({latency_logs[-1].get('label') or 'latest'}):")
+            for agent, stats in latency_logs[-1]['latency'].items():
+                print(f"  {agent}: p50 {stats['p50_ms']:.2f} ms, p95 {stats['p95_ms']:.2f} ms, "
+                      f"p99 {stats['p99_ms']:.2f} ms over {stats['moves']} moves, "
+                      f"{stats['nodes_per_sec']:.0f} nodes/s")
+
     def print_detailed_results(self, limit: Optional[int] = None):
         """
         Print detailed results of recent games.
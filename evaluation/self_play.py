@@ -0,0 +1,283 @@
+# === Import libraries and modules ===
+import json
+import math
+import multiprocessing
+import os
+import pickle
+import random
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterator, List, Optional
+import numpy as np
+from evaluation.metrics import seed_for_game
+from game.board import Board
+# =========================================
+
+# === Self-play data generation ===
+# Streams labelled positions from games between two agent configurations
+# (evaluation.tournament.AgentConfig), played in a process pool. self_play() is a
+# generator of rows, one per agent move:
+#   game     game number
+#   ply      moves played before this position
+#   board    int8 array (size x size): +1 X, -1 O, 0 empty
+#   to_move  +1 X, -1 O
+#   move     cell index row * size + col of the move played
+#   outcome  final result for the side to move: 1 win, 0 draw, -1 loss
+#   value    agent.last_value after the search (the agent's own estimate; NaN if it has none)
+# ShardWriter collects rows into fixed-size column buffers and writes a compressed
+# .npz (or Parquet, with pyarrow) shard whenever one fills up, plus an index.json.
+# Only a bounded number of games is in flight and one shard is buffered, so memory
+# stays flat however many games are generated.
+#
+# Deterministic agents replay the same game every time: random_plies plays the
+# first plies at random and epsilon replaces any later move by a random one with
+# that probability. Random moves are played but not recorded.
+#
+# Usage:
+#   config = AgentConfig('ab4', 'alphabeta', eval_for_mark=WinLossEval, max_depth=4)
+#   with ShardWriter("results/self_play/ab4", rows_per_shard=100_000) as writer:
+#       writer.write_all(self_play(config, games=100_000, workers=4, seed=0, random_plies=2))
+#   for shard in read_shards("results/self_play/ab4"):
+#       boards, outcomes = shard['board'], shard['outcome']
+# =========================
+
+COLUMNS = ('game', 'ply', 'board', 'to_move', 'move', 'outcome', 'value')
+FORMATS = ('npz', 'parquet')
+
+
+def self_play(agent_x, agent_o=None, games: int = 1, board_size: int = 3, workers: int = 1,
+              seed: Optional[int] = None, random_plies: int = 0, epsilon: float = 0.0,
+              winning_length: Optional[int] = None, games_per_task: int = 8) -> Iterator[Dict]:
+    # Yields the rows of every game, in game order; agent_o defaults to agent_x (true self-play)
+    for game in play_games(agent_x, agent_o, games, board_size, workers, seed, random_plies, epsilon,
+                           winning_length, games_per_task):
+        yield from game_rows(game)
+
+
+def play_games(agent_x, agent_o=None, games: int = 1, board_size: int = 3, workers: int = 1,
+               seed: Optional[int] = None, random_plies: int = 0, epsilon: float = 0.0,
+               winning_length: Optional[int] = None, games_per_task: int = 8) -> Iterator[Dict]:
+    # Yields one record of column arrays per game (see _play_one_game), in game order
+    settings = (agent_x, agent_o or agent_x, board_size, seed, random_plies, epsilon, winning_length)
+    tasks = ((start, min(games_per_task, games - start)) for start in range(0, games, games_per_task))
+    if workers <= 1:
+        _init_self_play_worker(settings)
+        for task in tasks:
+            yield from _play_self_play_games(task)
+        return
+
+    try:
+        pickle.dumps(settings)
+    except (pickle.PicklingError, AttributeError, TypeError) as e:
+        raise ValueError("self_play(workers > 1) needs picklable agent configurations "
+                         f"(module-level classes/functions, functools.partial or registry names): {e}")
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(workers, mp_context=context, initializer=_init_self_play_worker,
+                             initargs=(settings,)) as pool:
+        # At most a few tasks per worker are queued, so finished games never pile up
+        pending = deque()
+        try:
+            for task in tasks:
+                pending.append(pool.submit(_play_self_play_games, task))
+                if len(pending) >= workers * 2:
+                    yield from pending.popleft().result()
+            while pending:
+                yield from pending.popleft().result()
+        finally:
+            # The consumer may stop early (break, error): drop the queued games
+            pool.shutdown(cancel_futures=True)
+
+
+def game_rows(game: Dict) -> Iterator[Dict]:
+    # One row dict per recorded move of a game record
+    winner = game['winner']
+    for i in range(len(game['move'])):
+        to_move = int(game['to_move'][i])
+        yield {
+            'game': game['game'],
+            'ply': int(game['ply'][i]),
+            'board': game['board'][i],
+            'to_move': to_move,
+            'move': int(game['move'][i]),
+            'outcome': winner * to_move,
+            'value': float(game['value'][i])
+        }
+
+
+class ShardWriter:
+    def __init__(self, output_dir: str, rows_per_shard: int = 100_000, format: str = 'npz',
+                 prefix: str = 'shard') -> None:
+        if format not in FORMATS:
+            raise ValueError(f"format must be one of {FORMATS}, not {format!r}")
+        if format == 'parquet':
+            try:
+                import pyarrow  # noqa: F401
+            except ImportError:
+                raise ImportError("Parquet shards need pyarrow (pip install pyarrow); use format='npz' otherwise.")
+        self.output_dir = output_dir
+        self.rows_per_shard = rows_per_shard
+        self.format = format
+        self.prefix = prefix
+        self.shards: List[Dict] = []  # File name and row count of every shard written
+        self.rows = 0  # Rows written so far, including the buffered ones
+        self.board_size = None
+        self._buffer = None  # Column arrays of the current shard, allocated with the first row
+        self._filled = 0
+        os.makedirs(output_dir, exist_ok=True)
+
+    def write(self, row: Dict) -> None:
+        if self._buffer is None:
+            self._allocate(len(row['board']))
+        i = self._filled
+        for column in COLUMNS:
+            self._buffer[column][i] = row[column]
+        self._filled += 1
+        self.rows += 1
+        if self._filled == self.rows_per_shard:
+            self.flush()
+
+    def write_all(self, rows) -> int:
+        # Writes every row of an iterable (e.g. self_play(...)) and returns how many
+        count = 0
+        for row in rows:
+            self.write(row)
+            count += 1
+        return count
+
+    def flush(self) -> None:
+        # Writes the buffered rows as a shard
+        if not self._filled:
+            return
+        columns = {column: values[:self._filled] for column, values in self._buffer.items()}
+        name = f"{self.prefix}-{len(self.shards):05d}.{self.format}"
+        path = os.path.join(self.output_dir, name)
+        if self.format == 'npz':
+            np.savez_compressed(path, **columns)
+        else:
+            _write_parquet(path, columns)
+        self.shards.append({'file': name, 'rows': self._filled})
+        self._filled = 0
+        self._write_index()
+
+    def close(self) -> None:
+        self.flush()
+        self._write_index()
+
+    def __enter__(self) -> "ShardWriter":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def _allocate(self, size: int) -> None:
+        self.board_size = size
+        n = self.rows_per_shard
+        self._buffer = {
+            'game': np.zeros(n, dtype=np.int64),
+            'ply': np.zeros(n, dtype=np.int16),
+            'board': np.zeros((n, size, size), dtype=np.int8),
+            'to_move': np.zeros(n, dtype=np.int8),
+            'move': np.zeros(n, dtype=np.int16),
+            'outcome': np.zeros(n, dtype=np.int8),
+            'value': np.zeros(n, dtype=np.float32)
+        }
+
+    def _write_index(self) -> None:
+        index = {'format': self.format, 'board_size': self.board_size, 'columns': list(COLUMNS),
+                 'rows': sum(shard['rows'] for shard in self.shards), 'shards': self.shards}
+        with open(os.path.join(self.output_dir, "index.json"), "w") as f:
+            json.dump(index, f, indent=2)
+
+
+def read_shards(output_dir: str) -> Iterator[Dict[str, np.ndarray]]:
+    # Yields the columns of one shard at a time, in the order they were written
+    with open(os.path.join(output_dir, "index.json")) as f:
+        index = json.load(f)
+    for shard in index['shards']:
+        path = os.path.join(output_dir, shard['file'])
+        if index['format'] == 'npz':
+            with np.load(path) as data:
+                yield {column: data[column] for column in data.files}
+        else:
+            yield _read_parquet(path, index['board_size'])
+
+
+def _write_parquet(path: str, columns: Dict[str, np.ndarray]) -> None:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    boards = columns['board']
+    cells = boards.shape[1] * boards.shape[2]
+    arrays = {column: pa.array(values) for column, values in columns.items() if column != 'board'}
+    # Boards as fixed-size lists of size * size int8 cells
+    arrays['board'] = pa.FixedSizeListArray.from_arrays(pa.array(boards.reshape(-1)), cells)
+    pq.write_table(pa.table({column: arrays[column] for column in COLUMNS}), path, compression='zstd')
+
+
+def _read_parquet(path: str, board_size: int) -> Dict[str, np.ndarray]:
+    import pyarrow.parquet as pq
+    table = pq.read_table(path)
+    columns = {column: table.column(column).to_numpy() for column in COLUMNS if column != 'board'}
+    cells = table.column('board').combine_chunks().flatten().to_numpy()
+    columns['board'] = cells.reshape(-1, board_size, board_size)
+    return columns
+
+
+# Agent configurations and game settings of the current process (set once by _init_self_play_worker)
+_worker_settings = None
+
+
+def _init_self_play_worker(settings) -> None:
+    global _worker_settings
+    _worker_settings = settings
+
+
+# Runs in a worker: games start .. start + count - 1
+def _play_self_play_games(task) -> List[Dict]:
+    start, count = task
+    return [_play_one_game(game) for game in range(start, start + count)]
+
+
+def _play_one_game(game: int) -> Dict:
+    agent_x, agent_o, board_size, seed, random_plies, epsilon, winning_length = _worker_settings
+    game_seed = seed_for_game(seed, game) if seed is not None else None
+    if game_seed is not None:
+        random.seed(game_seed)
+        np.random.seed(game_seed)
+    rng = random.Random(game_seed)
+    agents = {'X': agent_x.create('X', None if game_seed is None else game_seed * 2),
+              'O': agent_o.create('O', None if game_seed is None else game_seed * 2 + 1)}
+    board = Board(board_size)
+    if winning_length is not None:
+        board.winning_length = winning_length
+
+    boards, to_move, moves, values, plies = [], [], [], [], []
+    ply = 0
+    while not board.is_game_over():
+        mark = board.get_current_player()
+        if ply < random_plies or (epsilon > 0 and rng.random() < epsilon):
+            row, col = rng.choice(board.get_valid_moves())
+        else:
+            agent = agents[mark]
+            row, col = agent.get_action(board)
+            value = getattr(agent, 'last_value', None)
+            boards.append(board.to_array())
+            to_move.append(1 if mark == 'X' else -1)
+            moves.append(row * board_size + col)
+            values.append(math.nan if value is None else value)
+            plies.append(ply)
+        board.make_move(row, col, mark)
+        ply += 1
+    for agent in agents.values():
+        if getattr(agent, 'ponderer', None) is not None:
+            agent.ponderer.stop()
+
+    winner = board.get_winner()
+    return {
+        'game': game,
+        'winner': 0 if winner is None else (1 if winner == 'X' else -1),
+        'board': np.array(boards, dtype=np.int8).reshape(-1, board_size, board_size),
+        'to_move': np.array(to_move, dtype=np.int8),
+        'move': np.array(moves, dtype=np.int16),
+        'value': np.array(values, dtype=np.float32),
+        'ply': np.array(plies, dtype=np.int16)
+    }
@@ -0,0 +1,111 @@
+# === Import libraries and modules ===
+import math
+from typing import Dict, Optional
+# =========================================
+
+# === Sequential probability ratio test ===
+# Decides between H0: "the tested agent is elo0 stronger than its opponent" and
+# H1: "it is elo1 stronger" while the games are played, instead of after a fixed
+# number of games. The log-likelihood ratio (LLR) of the game results uses the
+# trinomial (win/draw/loss) normal approximation of the generalized SPRT, with the
+# expected scores of the logistic Elo model. The test stops when the LLR leaves
+# [log(beta / (1 - alpha)), log((1 - beta) / alpha)]: alpha is the chance of
+# accepting H1 when H0 is true, beta the chance of accepting H0 when H1 is true.
+#
+# Usage:
+#   sprt = SPRT(elo0=0, elo1=50, alpha=0.05, beta=0.05)
+#   metrics.run_series(AlphaBetaAgent, MinimaxAgent, games=2000, sprt=sprt, ...)
+#   print(sprt.result())   # {'decision': 'H1', 'games': 38, 'llr': 2.97, ...}
+# =========================
+
+
+# Expected score of a player rated elo points above its opponent
+def elo_to_score(elo: float) -> float:
+    return 1 / (1 + 10 ** (-elo / 400))
+
+
+# Elo difference of a player with the given expected score
+def score_to_elo(score: float) -> float:
+    if score <= 0:
+        return float('-inf')
+    if score >= 1:
+        return float('inf')
+    return -400 * math.log10(1 / score - 1)
+
+
+class SPRT:
+    def __init__(self, elo0: float = 0.0, elo1: float = 10.0, alpha: float = 0.05, beta: float = 0.05) -> None:
+        if elo1 <= elo0:
+            raise ValueError(f"elo1 ({elo1}) must be greater than elo0 ({elo0}).")
+        if not (0 < alpha < 1 and 0 < beta < 1):
+            raise ValueError("alpha and beta must be between 0 and 1.")
+        self.elo0 = elo0
+        self.elo1 = elo1
+        self.alpha = alpha
+        self.beta = beta
+        self.lower = math.log(beta / (1 - alpha))  # Accept H0 at or below
+        self.upper = math.log((1 - beta) / alpha)  # Accept H1 at or above
+        # Results from the tested agent's side
+        self.wins = 0
+        self.draws = 0
+        self.losses = 0
+
+    @property
+    def games(self) -> int:
+        return self.wins + self.draws + self.losses
+
+    def update(self, points: float) -> Optional[str]:
+        # Adds one game (1 = win, 0.5 = draw, 0 = loss) and returns decision()
+        if points == 1:
+            self.wins += 1
+        elif points == 0:
+            self.losses += 1
+        else:
+            self.draws += 1
+        return self.decision()
+
+    def llr(self) -> float:
+        if self.games == 0:
+            return 0.0
+        wins, draws, losses = self.wins, self.draws, self.losses
+        if (wins > 0) + (draws > 0) + (losses > 0) == 1:
+            # Every game had the same result, so the score has no variance yet:
+            # count one virtual win and loss (e.g. deterministic agents that always draw)
+            wins, losses = wins + 1, losses + 1
+        n = wins + draws + losses
+        mean = (wins + 0.5 * draws) / n
+        variance = (wins * (1 - mean) ** 2 + draws * (0.5 - mean) ** 2 + losses * mean ** 2) / n
+        s0, s1 = elo_to_score(self.elo0), elo_to_score(self.elo1)
+        return n * (s1 - s0) * (2 * mean - s0 - s1) / (2 * variance)
+
+    def decision(self) -> Optional[str]:
+        # 'H1', 'H0', or None while the test has not decided
+        llr = self.llr()
+        if llr >= self.upper:
+            return 'H1'
+        if llr <= self.lower:
+            return 'H0'
+        return None
+
+    def elo_estimate(self) -> float:
+        # Elo difference implied by the score so far
+        if self.games == 0:
+            return 0.0
+        return score_to_elo((self.wins + 0.5 * self.draws) / self.games)
+
+    def result(self) -> Dict:
+        return {
+            'decision': self.decision() or 'inconclusive',
+            'games': self.games,
+            'wins': self.wins,
+            'draws': self.draws,
+            'losses': self.losses,
+            'llr': round(self.llr(), 4),
+            'lower_bound': round(self.lower, 4),
+            'upper_bound': round(self.upper, 4),
+            'elo_estimate': round(self.elo_estimate(), 1),
+            'elo0': self.elo0,
+            'elo1': self.elo1,
+            'alpha': self.alpha,
+            'beta': self.beta
+        }
@@ -0,0 +1,302 @@
+# === Import libraries and modules ===
+import json
+import math
+import multiprocessing
+import pickle
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+from itertools import combinations
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+from evaluation.metrics import Metrics, accepts_seed, agent_factory, seed_for_game
+# =========================================
+
+# === Round-robin tournament ===
+# Plays every pair of N agent configurations against each other on one board size,
+# with colours swapped every other game, optionally in a process pool.
+# Results: a win/draw/loss crosstable, maximum-likelihood Elo ratings with
+# confidence intervals, and time/node efficiency per agent from the per-move telemetry.
+#
+# Usage:
+#   configs = [AgentConfig('minimax-d3', 'minimax', eval_for_mark=WinLossEval, max_depth=3),
+#              AgentConfig('alphabeta-d6', 'alphabeta', eval_for_mark=WinLossEval, max_depth=6),
+#              AgentConfig('mcts', 'mcts', simulations=200)]
+#   tournament = Tournament(configs, board_size=3, games_per_pair=4, workers=4, seed=0)
+#   tournament.run()
+#   tournament.print_report()
+# =========================
+
+# Elo points per natural-log unit of the logistic model
+ELO_SCALE = 400 / math.log(10)
+
+
+class AgentConfig:
+    def __init__(self, name: str, agent, eval_for_mark=None, **kwargs) -> None:
+        self.name = name  # Unique name in the tables
+        self.agent = agent  # Agent class, functools.partial or registry name ('minimax', ...)
+        # Optional eval_fn factory called with the agent's mark (e.g. WinLossEval), for agents
+        # whose evaluation must be from their own side whichever colour they play
+        self.eval_for_mark = eval_for_mark
+        self.kwargs = kwargs  # Constructor arguments except mark (eval_fn, max_depth, ...)
+
+    def create(self, mark: str, seed: Optional[int] = None):
+        factory = agent_factory(self.agent)
+        kwargs = self.kwargs_for(mark)
+        if seed is not None and 'seed' not in kwargs and accepts_seed(factory):
+            kwargs['seed'] = seed
+        return factory(mark=mark, **kwargs)
+
+    def kwargs_for(self, mark: str) -> Dict:
+        # Constructor arguments except mark, with the eval_fn for mark
+        kwargs = dict(self.kwargs)
+        if self.eval_for_mark is not None:
+            kwargs['eval_fn'] = self.eval_for_mark(mark)
+        return kwargs
+
+    def __repr__(self) -> str:
+        return f"AgentConfig({self.name!r})"
+
+
+class Tournament:
+    def __init__(self, configs: List[AgentConfig], board_size: int = 3, games_per_pair: int = 2,
+                 workers: int = 1, seed: Optional[int] = None) -> None:
+        names = [config.name for config in configs]
+        if len(configs) < 2:
+            raise ValueError("A tournament needs at least two agent configurations.")
+        if len(set(names)) != len(names):
+            raise ValueError(f"Agent configuration names must be unique: {names}")
+        self.configs = configs
+        self.board_size = board_size
+        self.games_per_pair = games_per_pair  # Even numbers give every pairing equal X and O games
+        self.workers = workers
+        self.seed = seed  # Seeds random, numpy and seedable agents per game (reproducible results)
+        # One entry per game: {'x', 'o', 'winner', 'record'}
+        self.games: List[Dict] = []
+        self.wall_sec: float = 0.0
+
+    # All games as (x config index, o config index), colours swapped every other game
+    def schedule(self) -> List[Tuple[int, int]]:
+        pairings = []
+        for i, j in combinations(range(len(self.configs)), 2):
+            for g in range(self.games_per_pair):
+                pairings.append((i, j) if g % 2 == 0 else (j, i))
+        return pairings
+
+    # Play every scheduled game and return the game list
+    def run(self) -> List[Dict]:
+        start = time.perf_counter()
+        pairings = self.schedule()
+        tasks = [(n, x, o) for n, (x, o) in enumerate(pairings)]
+        settings = (self.configs, self.board_size, self.seed)
+
+        if self.workers > 1 and len(tasks) > 1:
+            try:
+                pickle.dumps(settings)
+            except (pickle.PicklingError, AttributeError, TypeError) as e:
+                raise ValueError("Tournament(workers > 1) needs picklable agent configurations "
+                                 f"(module-level classes/functions, functools.partial or registry names): {e}")
+            context = multiprocessing.get_context("spawn")
+            chunksize = max(1, len(tasks) // (self.workers * 8))
+            with ProcessPoolExecutor(self.workers, mp_context=context, initializer=_init_tournament_worker,
+                                     initargs=(settings,)) as pool:
+                records = list(pool.map(_play_tournament_game, tasks, chunksize=chunksize))
+        else:
+            _init_tournament_worker(settings)
+            records = [_play_tournament_game(task) for task in tasks]
+
+        for (x, o), record in zip(pairings, records):
+            self.games.append({'x': self.configs[x].name, 'o': self.configs[o].name,
+                               'winner': record['winner'], 'record': record})
+        self.wall_sec = time.perf_counter() - start
+        return self.games
+
+    # Win/draw/loss of every agent (row) against every opponent (column)
+    def crosstable(self) -> Dict[str, Dict[str, Dict[str, int]]]:
+        names = [config.name for config in self.configs]
+        table = {a: {b: {'W': 0, 'D': 0, 'L': 0} for b in names if b != a} for a in names}
+        for game in self.games:
+            x, o = game['x'], game['o']
+            if game['winner'] == 'Draw':
+                table[x][o]['D'] += 1
+                table[o][x]['D'] += 1
+            else:
+                winner, loser = (x, o) if game['winner'] == 'X' else (o, x)
+                table[winner][loser]['W'] += 1
+                table[loser][winner]['L'] += 1
+        return table
+
+    # Elo ratings fitted to all games at once, with confidence intervals
+    def ratings(self, confidence: float = 0.95, anchor: float = 1500.0,
+                prior_draws: float = 1.0) -> Dict[str, Dict[str, float]]:
+        # Maximum likelihood of the logistic (Bradley-Terry) model, draws counting half a win.
+        # prior_draws virtual draws per pairing keep ratings finite when one side wins every game.
+        # The ratings average to anchor; intervals come from the inverse Fisher information.
+        names = [config.name for config in self.configs]
+        index = {name: i for i, name in enumerate(names)}
+        n = len(names)
+        score = np.zeros((n, n))  # score[i, j]: points of i against j
+        played = np.zeros((n, n))
+        for game in self.games:
+            x, o = index[game['x']], index[game['o']]
+            points = {'X': 1.0, 'O': 0.0, 'Draw': 0.5}[game['winner']]
+            score[x, o] += points
+            score[o, x] += 1 - points
+            played[x, o] += 1
+            played[o, x] += 1
+        prior = np.where(played > 0, prior_draws, 0.0)
+        score += prior / 2
+        played += prior
+
+        strength = np.zeros(n)  # Ratings in natural-log units
+        for _ in range(100):
+            p = 1 / (1 + np.exp(strength[None, :] - strength[:, None]))
+            gradient = (score - played * p).sum(axis=1)
+            weights = played * p * (1 - p)
+            information = np.diag(weights.sum(axis=1)) - weights
+            step = np.linalg.lstsq(information, gradient, rcond=None)[0]
+            strength += step - step.mean()
+            if np.abs(step).max() < 1e-9:
+                break
+
+        p = 1 / (1 + np.exp(strength[None, :] - strength[:, None]))
+        weights = played * p * (1 - p)
+        covariance = np.linalg.pinv(np.diag(weights.sum(axis=1)) - weights)
+        z = _normal_quantile(0.5 + confidence / 2)
+        totals = self._totals()
+
+        ratings = {}
+        for i, name in enumerate(names):
+            elo = anchor + strength[i] * ELO_SCALE
+            margin = z * math.sqrt(max(covariance[i, i], 0.0)) * ELO_SCALE
+            ratings[name] = {
+                'elo': round(elo, 1),
+                'ci_low': round(elo - margin, 1),
+                'ci_high': round(elo + margin, 1),
+                'games': totals[name]['games'],
+                'score': round(totals[name]['points'] / totals[name]['games'], 3) if totals[name]['games'] else 0.0
+            }
+        return dict(sorted(ratings.items(), key=lambda item: -item[1]['elo']))
+
+    # Thinking time and search effort per agent, from the per-move telemetry
+    def efficiency(self) -> Dict[str, Dict[str, float]]:
+        moves: Dict[str, List[Dict]] = {config.name: [] for config in self.configs}
+        for game in self.games:
+            names = {'X': game['x'], 'O': game['o']}
+            for move in game['record'].get('moves', []):
+                moves[names[move['mark']]].append(move)
+
+        totals = self._totals()
+        efficiency = {}
+        for name, agent_moves in moves.items():
+            if not agent_moves:
+                continue
+            latency_ms = np.array([m['latency_ns'] for m in agent_moves]) / 1e6
+            nodes = np.array([m['nodes'] for m in agent_moves])
+            think_sec = latency_ms.sum() / 1000
+            efficiency[name] = {
+                'moves': len(agent_moves),
+                'think_sec': round(float(think_sec), 4),
+                'mean_ms_per_move': round(float(latency_ms.mean()), 4),
+                'p95_ms_per_move': round(float(np.percentile(latency_ms, 95)), 4),
+                'nodes_per_move': round(float(nodes.mean()), 1),
+                'nodes_per_sec': round(float(nodes.sum() / think_sec), 1) if think_sec > 0 else 0.0,
+                # Score per unit of effort, for comparing strength against cost
+                'points_per_think_sec': round(totals[name]['points'] / think_sec, 3) if think_sec > 0 else None
+            }
+        return efficiency
+
+    # Everything as one JSON-serializable dict
+    def to_dict(self) -> Dict:
+        return {
+            'board_size': self.board_size,
+            'games_per_pair': self.games_per_pair,
+            'seed': self.seed,
+            'agents': [config.name for config in self.configs],
+            'total_games': len(self.games),
+            'wall_sec': round(self.wall_sec, 4),
+            'crosstable': self.crosstable(),
+            'ratings': self.ratings(),
+            'efficiency': self.efficiency(),
+            'games': [{'x': g['x'], 'o': g['o'], 'winner': g['winner'], 'total_moves': g['record']['total_moves'],
+                       'elapsed_sec': g['record']['elapsed_sec']} for g in self.games]
+        }
+
+    def save_json(self, path: str) -> None:
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.to_dict(), f, indent=2)
+
+    def print_report(self) -> None:
+        names = [config.name for config in self.configs]
+        width = max(12, max(len(name) for name in names) + 2)
+        table = self.crosstable()
+
+        print(f"\n=== Round-robin: {len(names)} agents, {len(self.games)} games, "
+              f"{self.board_size}x{self.board_size} board, {self.wall_sec:.2f}s ===")
+        print("\nCrosstable (W-D-L of the row agent):")
+        print(f"{'':<{width}}" + "".join(f"{name:>{width}}" for name in names))
+        for a in names:
+            cells = "".join(f"{'-':>{width}}" if a == b else
+                            f"{table[a][b]['W']}-{table[a][b]['D']}-{table[a][b]['L']}".rjust(width)
+                            for b in names)
+            print(f"{a:<{width}}{cells}")
+
+        print("\nRatings (Elo, 95% CI):")
+        for name, r in self.ratings().items():
+            print(f"  {name:<{width}} {r['elo']:7.1f}  [{r['ci_low']:7.1f}, {r['ci_high']:7.1f}]  "
+                  f"score {r['score']*100:5.1f}% over {r['games']} games")
+
+        print("\nEfficiency:")
+        for name, e in self.efficiency().items():
+            print(f"  {name:<{width}} {e['mean_ms_per_move']:9.2f} ms/move  p95 {e['p95_ms_per_move']:9.2f} ms  "
+                  f"{e['nodes_per_move']:10.1f} nodes/move  {e['nodes_per_sec']:10.0f} nodes/s")
+
+    def _totals(self) -> Dict[str, Dict[str, float]]:
+        totals = {config.name: {'games': 0, 'points': 0.0} for config in self.configs}
+        for game in self.games:
+            points = {'X': 1.0, 'O': 0.0, 'Draw': 0.5}[game['winner']]
+            totals[game['x']]['games'] += 1
+            totals[game['o']]['games'] += 1
+            totals[game['x']]['points'] += points
+            totals[game['o']]['points'] += 1 - points
+        return totals
+
+
+# Inverse of the standard normal CDF (bisection on math.erf; no SciPy needed)
+def _normal_quantile(q: float) -> float:
+    low, high = -10.0, 10.0
+    for _ in range(100):
+        mid = (low + high) / 2
+        if 0.5 * (1 + math.erf(mid / math.sqrt(2))) < q:
+            low = mid
+        else:
+            high = mid
+    return (low + high) / 2
+
+
+# Tournament settings of the current process (set once by _init_tournament_worker)
+_worker_tournament = None
+
+
+def _init_tournament_worker(settings) -> None:
+    global _worker_tournament
+    _worker_tournament = settings
+
+
+# Plays scheduled game n between configs x (as X) and o (as O) and returns its record
+def _play_tournament_game(task):
+    n, x, o = task
+    configs, board_size, seed = _worker_tournament
+    agent_seeds = (None, None)
+    if seed is not None:
+        game_seed = seed_for_game(seed, n)
+        random.seed(game_seed)
+        np.random.seed(game_seed)
+        agent_seeds = (game_seed * 2, game_seed * 2 + 1)
+    ax = configs[x].create('X', agent_seeds[0])
+    ao = configs[o].create('O', agent_seeds[1])
+    record = Metrics().run_match(ax, ao, board_size)
+    for agent in (ax, ao):
+        if getattr(agent, 'ponderer', None) is not None:
+            agent.ponderer.stop()
+    return record
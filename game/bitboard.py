@@ -0,0 +1,73 @@
+# === Import libraries and modules ===
+from functools import lru_cache
+# =========================================
+
+# === Bitboard helpers ===
+# Compact integer encoding of a Board used by the solvers and caches.
+# Cell (row, col) maps to bit row * size + col; each player owns one integer
+# whose set bits are the cells holding that player's mark.
+# A winning line is a mask with winning_length bits set, so a win check is
+# a handful of integer ANDs instead of a full scan of the numpy board.
+# =========================
+
+@lru_cache(maxsize=None)
+def line_masks(size, winning_length):
+  # Returns every winning line on a size x size board as a bit mask
+  masks = []
+  directions = [(0, 1), (1, 0), (1, 1), (-1, 1)]
+  for row in range(size):
+    for col in range(size):
+      for d_row, d_col in directions:
+        end_row = row + d_row * (winning_length - 1)
+        end_col = col + d_col * (winning_length - 1)
+        if not (0 <= end_row < size and 0 <= end_col < size):
+          continue
+        mask = 0
+        for i in range(winning_length):
+          mask |= 1 << ((row + d_row * i) * size + col + d_col * i)
+        masks.append(mask)
+  return tuple(masks)
+
+
+@lru_cache(maxsize=None)
+def cell_line_masks(size, winning_length):
+  # Returns, for every cell index, the winning lines passing through that cell
+  masks = line_masks(size, winning_length)
+  return tuple(tuple(m for m in masks if m >> index & 1) for index in range(size * size))
+
+
+def encode(board):
+  # Converts a Board into an (x_bits, o_bits) pair
+  x_bits, o_bits = 0, 0
+  bit = 1
+  for cell in board.board.flat:
+    if cell == 'X':
+      x_bits |= bit
+    elif cell == 'O':
+      o_bits |= bit
+    bit <<= 1
+  return x_bits, o_bits
+
+
+def has_line(bits, masks):
+  # True if bits fully cover any of the given line masks
+  for mask in masks:
+    if bits & mask == mask:
+      return True
+  return False
+
+
+def has_live_line(blocker_bits, masks):
+  # True if at least one line is still free of the blocker's marks
+  for mask in masks:
+    if not blocker_bits & mask:
+      return True
+  return False
+
+
+def iter_cells(bits):
+  # Yields the index of every set bit, lowest first
+  while bits:
+    low = bits & -bits
+    yield low.bit_length() - 1
+    bits ^= low
@@ -1,5 +1,6 @@
 # === Import libraries and modules ===
 import numpy as np
+from game.bitboard import encode
 # =========================================
 
 # === Board class definition ===
@@ -117,6 +118,14 @@ class Board:
     # ADDED: Determine whose turn it is based on move count (X goes first)
     return 'X' if self.total_move % 2 == 0 else 'O'
 
+  def to_array(self):
+    # Returns the board as an int8 array: +1 for X, -1 for O, 0 for empty
+    return (self.board == 'X').astype(np.int8) - (self.board == 'O').astype(np.int8)
+
+  def get_key(self):
+    # Returns a compact hashable key of the position: (x_bits, o_bits)
+    return encode(self)
+
   def reset(self):
     # ADDED: Reset the board to initial state
     self.board = np.full((self.size, self.size), None)
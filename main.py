@@ -3,10 +3,11 @@
 import time
 from datetime import datetime
 from game import Game, Board
-from agents import MinimaxAgent, AlphaBetaAgent, ExpectiminimaxAgent, GeminiAgent, HumanAgent
-from evaluation import Metrics, Logger
-from visualization.tree_diagram import TreeDiagram
-from visualization.gui_view import GUIView
+from agents.alpha_beta_agent import AlphaBetaAgent
+from agents.registry import agent_names, get_agent_spec, load_agent, load_view
+from evaluation import Metrics, Logger, SPRT
+from agents.eval_cache import CachedEvaluator
+from visualization.render_queue import RenderQueue
 # ====================
 
 # This is a placeholder for the main module of the game.
@@ -15,6 +16,9 @@ from visualization.gui_view import GUIView
 # Global logger instance
 game_logger = Logger("game_session.json")
 
+# Search tree diagrams are drawn in background processes so games do not wait for them
+tree_render_queue = RenderQueue(workers=2)
+
 # Simple evaluation function for AI agents
 def simple_eval_function(board):
     """Simple evaluation function - returns random score for now"""
@@ -24,12 +28,24 @@ def simple_eval_function(board):
         return -100
     return 0 # if it's a draw
 
+# Memoized version shared by every agent get_agent creates
+cached_eval_function = CachedEvaluator(simple_eval_function)
+
+# Constructor defaults per agent type
+AGENT_DEFAULTS = {
+    'gemini': {'cache': True}  # Shared on-disk response cache
+}
+
+def get_agent_class(agent_type: str):
+    # Agent class from the lazy registry, with AGENT_DEFAULTS applied
+    return load_agent(agent_type, **AGENT_DEFAULTS.get(agent_type, {}))
+
 def get_agent(agent_type: str, mark: str, max_depth: int = 6):
     """
     Dynamically create an agent based on type.
 
     Args:
-        agent_type (str): Type of agent ('human', 'minimax', 'alphabeta', 'expectiminimax', 'gemini')
+        agent_type (str): Type of agent ('human', 'minimax', 'alphabeta', 'expectiminimax', 'gemini', 'proofnumber', 'mcts')
 
     Returns:
         Agent instance or None if invalid type
@@ -39,27 +55,19 @@ def get_agent(agent_type: str, mark: str, max_depth: int = 6):
 
     agent_type = agent_type.lower()
 
-    AVAILABLE_AGENTS  = {
-        'minimax': MinimaxAgent,
-        'alphabeta': AlphaBetaAgent,
-        'expectiminimax': ExpectiminimaxAgent,
-        'gemini': GeminiAgent,
-        'human': HumanAgent
-    }
-
-    if agent_type not in AVAILABLE_AGENTS :
+    if agent_type not in agent_names():
         print(f"Unknown agent type: {agent_type}")
         return None
 
-    # Create agent with appropriate parameters
-    if agent_type in ['minimax', 'alphabeta', 'expectiminimax']:
-        return AVAILABLE_AGENTS [agent_type](
-            eval_fn=simple_eval_function,
+    # Create agent with appropriate parameters (the agent's module is imported here, on first use)
+    if get_agent_spec(agent_type).search:
+        return get_agent_class(agent_type)(
+            eval_fn=cached_eval_function,
             max_depth=max_depth,
             mark=mark
         )
     else:
-        return AVAILABLE_AGENTS [agent_type](mark=mark)
+        return get_agent_class(agent_type)(mark=mark)
 
 # Game functions
 def play_one_match(agent1_type: str, agent2_type: str, board_size: int = 3, max_depth: int = 6, enable_logging: bool = True):
@@ -92,10 +100,10 @@ def play_one_match(agent1_type: str, agent2_type: str, board_size: int = 3, max_
 
             # Show pruning visualization if AlphaBetaAgent
             if isinstance(agent, AlphaBetaAgent):
-                print("Visualizing Alpha-Beta pruning tree for this move...")
+                print("Queueing Alpha-Beta pruning tree for this move...")
                 if hasattr(agent, 'last_search_tree') and agent.last_search_tree is not None:
-                    TreeDiagram(agent.last_search_tree).draw(
-                        title=f"Alpha-Beta Tree - Player {game.current_player}")
+                    tree_render_queue.submit(agent.last_search_tree,
+                                             title=f"Alpha-Beta Tree - Player {game.current_player}")
                 else:
                     print("No search tree available for visualization.")
 
@@ -105,6 +113,7 @@ def play_one_match(agent1_type: str, agent2_type: str, board_size: int = 3, max_
             game.switch_player()
 
         end_time = time.time()
+        tree_render_queue.flush()  # Diagrams of this game are saved before returning
 
         # Extract results manually
         winner = game.board.get_winner() or 'Draw'
@@ -147,7 +156,7 @@ def play_one_match(agent1_type: str, agent2_type: str, board_size: int = 3, max_
     print(f"  Time: {execution_time:.4f}s")
 
     # Only show node counts for AI search agents
-    search_agents = ['minimax', 'alphabeta', 'expectiminimax']
+    search_agents = ['minimax', 'alphabeta', 'expectiminimax', 'proofnumber', 'mcts']
 
     if agent1_type in search_agents:
         print(f"  {agent1_type.upper()} nodes: {agent1_nodes}")
@@ -198,10 +207,11 @@ def run_performance_comparison():
 
     try:
         metrics.run_series(
-            agent_cls_x=MinimaxAgent,
+            agent_cls_x=get_agent_class('minimax'),
             agent_cls_o=AlphaBetaAgent,
             games=games,
             board_size=3,
+            cache_eval=True,
             eval_fn=simple_eval_function,
             max_depth=6
         )
@@ -213,10 +223,16 @@ def run_performance_comparison():
 
         nodes_expanded = metrics.get_nodes_evaluated()
         print(f"Nodes - X: {nodes_expanded['X']}, O: {nodes_expanded['O']}")
+        for agent, latency in metrics.get_move_latency_stats().items():
+            print(f"{agent} move latency - p50: {latency['p50_ms']:.2f} ms, p95: {latency['p95_ms']:.2f} ms, "
+                  f"p99: {latency['p99_ms']:.2f} ms, {latency['nodes_per_sec']:.0f} nodes/s")
 
         success_rates = metrics.get_success_rate()
         print(f"Win rates - X: {success_rates['X']*100:.1f}%, O: {success_rates['O']*100:.1f}%, Draw: {success_rates['Draw']*100:.1f}%")
 
+        cache_stats = metrics.get_eval_cache_stats()
+        print(f"Eval cache - hit rate: {cache_stats['hit_rate']*100:.1f}%, time saved: {cache_stats['time_saved_sec']:.4f}s")
+
         # Log each individual game result
         for i, record in enumerate(metrics.records):
             game_logger.log_game(
@@ -239,8 +255,11 @@ def run_performance_comparison():
             'average_execution_time': metrics.get_execution_time() / len(metrics.records),
             'nodes_expanded': nodes_expanded ,
             'success_rates': success_rates,
+            'eval_cache': cache_stats,
             'timestamp': datetime.now().isoformat()
         })
+        game_logger.log_move_latency(metrics.get_move_latency_stats(), label='Minimax vs Alpha-Beta',
+                                     histograms=metrics.get_move_latency_histogram())
 
     except Exception as e:
         print(f"Error during performance comparison: {e}")
@@ -259,7 +278,7 @@ def run_series_evaluation():
     # Run series evaluation using Metrics.run_series()
     print("\nSeries Evaluation ")
 
-    valid_agents = ['minimax', 'alphabeta', 'expectiminimax', 'gemini', 'human']
+    valid_agents = agent_names()
     print(f"Available agents: {', '.join(valid_agents)}")
 
     agent1_type = input("Enter agent 1 type: ").strip().lower()
@@ -271,7 +290,13 @@ def run_series_evaluation():
 
     games = int(input("Enter number of games (default 10): ") or "10")
 
-    print(f"\nRunning {games} games: {agent1_type.upper()} vs {agent2_type.upper()}")
+    # Optional early stopping: games becomes the maximum
+    sprt = None
+    if input("Stop early with an SPRT (agent 1 vs agent 2)? (y/n, default n): ").strip().lower() == 'y':
+        elo1 = float(input("Elo difference to detect (default 50): ") or "50")
+        sprt = SPRT(elo0=0.0, elo1=elo1, alpha=0.05, beta=0.05)
+
+    print(f"\nRunning {'up to ' if sprt else ''}{games} games: {agent1_type.upper()} vs {agent2_type.upper()}")
 
     # Check if human player is involved
     has_human = agent1_type == 'human' or agent2_type == 'human'
@@ -289,14 +314,6 @@ def run_series_evaluation():
         return
 
     # For AI-only games, use Metrics.run_series() method
-    AVAILABLE_AGENTS  = {
-        'minimax': MinimaxAgent,
-        'alphabeta': AlphaBetaAgent,
-        'expectiminimax': ExpectiminimaxAgent,
-        'gemini': GeminiAgent,
-        'human': HumanAgent
-    }
-
     # Use Metrics.run_series() for structured evaluation
     metrics = Metrics()
 
@@ -311,20 +328,33 @@ def run_series_evaluation():
 
         # Run series using Metrics
         metrics.run_series(
-            agent_cls_x=AVAILABLE_AGENTS [agent1_type],
-            agent_cls_o=AVAILABLE_AGENTS [agent2_type],
+            agent_cls_x=get_agent_class(agent1_type),
+            agent_cls_o=get_agent_class(agent2_type),
             games=games,
             board_size=3,
+            cache_eval=True,
+            sprt=sprt,
+            # Build each agent once per series (the Gemini client and .env are set up once)
+            reuse_agents=True,
             **agent_kwargs
         )
+        games = len(metrics.records)
 
         # Display results
         print(f"\n Series Results ")
+        if sprt is not None:
+            result = metrics.get_sprt_result()
+            print(f"SPRT: {result['decision']} after {result['games']} games "
+                  f"(LLR {result['llr']:.2f} in [{result['lower_bound']:.2f}, {result['upper_bound']:.2f}], "
+                  f"Elo estimate {result['elo_estimate']:+.0f})")
         print(f"Total time: {metrics.get_execution_time():.4f}s")
         print(f"Avg time per game: {metrics.get_execution_time()/games:.4f}s")
 
         nodes_expanded = metrics.get_nodes_evaluated()
         print(f"Nodes - X: {nodes_expanded['X']}, O: {nodes_expanded['O']}")
+        for agent, latency in metrics.get_move_latency_stats().items():
+            print(f"{agent} move latency - p50: {latency['p50_ms']:.2f} ms, p95: {latency['p95_ms']:.2f} ms, "
+                  f"p99: {latency['p99_ms']:.2f} ms, {latency['nodes_per_sec']:.0f} nodes/s")
 
         success_rates = metrics.get_success_rate()
         print(f"Win rates - X: {success_rates['X']*100:.1f}%, O: {success_rates['O']*100:.1f}%, Draw: {success_rates['Draw']*100:.1f}%")
@@ -351,10 +381,15 @@ def run_series_evaluation():
             'average_execution_time': metrics.get_execution_time() / len(metrics.records),
             'nodes_expanded': nodes_expanded,
             'success_rates': success_rates,
+            'eval_cache': metrics.get_eval_cache_stats(),
+            'agent_stats': metrics.get_agent_stats(),
+            'sprt': metrics.get_sprt_result(),
             'board_size': 3,
             'max_depth': 6,
             'timestamp': datetime.now().isoformat()
         })
+        game_logger.log_move_latency(metrics.get_move_latency_stats(), label=f'{agent1_type} vs {agent2_type}',
+                                     histograms=metrics.get_move_latency_histogram())
 
     except Exception as e:
         print(f"Error during series evaluation: {e}")
@@ -373,7 +408,7 @@ def run_user_match():
     # Run a single match with user-specified agents
     print("\nSingle match setup ")
 
-    valid_agents = ['minimax', 'alphabeta', 'expectiminimax', 'gemini', 'human']
+    valid_agents = agent_names()
     print(f"Available agents: {', '.join(valid_agents)}")
 
     agent1_type = input("Enter agent 1 type (X): ").strip().lower()
@@ -405,11 +440,11 @@ def run_user_match():
 
                 # Show pruning visualization if AlphaBetaAgent
                 if isinstance(agent, AlphaBetaAgent):
-                    print("Visualizing Alpha-Beta pruning tree for this move...")
+                    print("Queueing Alpha-Beta pruning tree for this move...")
                     if hasattr(agent, 'last_search_tree') and agent.last_search_tree is not None:
-                        # Draw the tree diagram
-                        TreeDiagram(agent.last_search_tree).draw(
-                            title=f"Alpha-Beta Tree - Player {game.current_player}")
+                        # Queue the tree diagram
+                        tree_render_queue.submit(agent.last_search_tree,
+                                                 title=f"Alpha-Beta Tree - Player {game.current_player}")
                     else:
                         print("No search tree available for visualization.")
 
@@ -417,6 +452,7 @@ def run_user_match():
                     break
 
                 game.switch_player()
+            tree_render_queue.flush()
     else:
         # Use regular play_one_match
         play_one_match(agent1_type, agent2_type, 3, 6)
@@ -424,11 +460,11 @@ def run_user_match():
 def run_alpha_beta_visualization_test():
     # Run Alpha-Beta pruning visualization test (from pruning_visual_test.py)
     print("\nAlpha-Beta Pruning Visualization Test")
-    print("Options: minimax, alphabeta, expectiminimax, gemini, human")
+    print(f"Options: {', '.join(agent_names())}")
 
     opponent_type = input("Enter agent type for Player O: ").strip().lower()
 
-    valid_agents = ['minimax', 'alphabeta', 'expectiminimax', 'gemini', 'human']
+    valid_agents = agent_names()
     if opponent_type not in valid_agents:
         print("Invalid agent type. Please use one of:", valid_agents)
         return
@@ -475,10 +511,10 @@ def run_alpha_beta_visualization_test():
 
             # Show pruning visualization if AlphaBetaAgent
             if isinstance(agent, AlphaBetaAgent):
-                print("Visualizing Alpha-Beta pruning tree for this move...")
+                print("Queueing Alpha-Beta pruning tree for this move...")
                 if hasattr(agent, 'last_search_tree') and agent.last_search_tree is not None:
-                    TreeDiagram(agent.last_search_tree).draw(
-                        title=f"Alpha-Beta Tree - Player {game.current_player}")
+                    tree_render_queue.submit(agent.last_search_tree,
+                                             title=f"Alpha-Beta Tree - Player {game.current_player}")
                 else:
                     print("No search tree available for visualization.")
 
@@ -489,6 +525,7 @@ def run_alpha_beta_visualization_test():
 
         winner = board.get_winner()
         print(f"\nGame Over! Winner: {winner}" if winner else "\nIt's a draw.")
+        tree_render_queue.flush()
 
     except Exception as e:
         print(f"Error during visualization test: {e}")
@@ -496,15 +533,8 @@ def run_alpha_beta_visualization_test():
 
 def run_single_match_gui():
     """Run a single match (GUI) where any agent can play against any agent."""
-    from agents.human_agent import HumanAgent
-    from agents.minimax_agent import MinimaxAgent
-    from agents.alpha_beta_agent import AlphaBetaAgent
-    from agents.expectiminimax_agent import ExpectiminimaxAgent
-    from agents.gemini_agent import GeminiAgent
-    from visualization.gui_view import GUIView
-
     print("\nSingle match setup")
-    valid_agents = ['minimax', 'alphabeta', 'expectiminimax', 'gemini', 'human']
+    valid_agents = agent_names()
     print(f"Available agents: {', '.join(valid_agents)}")
 
     agent1_type = 'human' # Always start with human for GUI
@@ -515,8 +545,8 @@ def run_single_match_gui():
         return
 
     try:
-        # Import pygame to check if it's available
-        import pygame
+        # Import the GUI (and pygame) only now; raises ImportError if pygame is missing
+        GUIView = load_view('gui')
 
         # Simple evaluation function for AI agents
         def gui_eval_fn(board):
@@ -528,19 +558,15 @@ def run_single_match_gui():
         board_size = 3  # Default board size
 
         # Create agents - Player 1 is always human
-        agent1 = HumanAgent(mark='X')
+        agent1 = load_agent('human')(mark='X')
 
         # For Player 2, use the type selected by the user
         if agent2_type == 'human':
-            agent2 = HumanAgent(mark='O')
-        elif agent2_type == 'minimax':
-            agent2 = MinimaxAgent(mark='O', eval_fn=gui_eval_fn, max_depth=9)
-        elif agent2_type == 'alphabeta':
-            agent2 = AlphaBetaAgent(eval_fn=gui_eval_fn, max_depth=9, mark='O')
-        elif agent2_type == 'expectiminimax':
-            agent2 = ExpectiminimaxAgent(eval_fn=gui_eval_fn, max_depth=9, mark='O')
-        elif agent2_type == 'gemini':
-            agent2 = GeminiAgent(mark='O', eval_fn=gui_eval_fn, max_depth=9)
+            agent2 = load_agent('human')(mark='O')
+        elif get_agent_spec(agent2_type).search:
+            agent2 = load_agent(agent2_type)(eval_fn=gui_eval_fn, max_depth=9, mark='O', ponder=True)
+        else:
+            agent2 = get_agent_class(agent2_type)(mark='O', eval_fn=gui_eval_fn, max_depth=9)
 
         # Create and run GUI
         print(f"\nStarting GUI game on {board_size}x{board_size} board...")
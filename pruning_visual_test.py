@@ -1,8 +1,9 @@
 
 # === Import libraries and modules ===
 from game import Game, Board
-from agents import MinimaxAgent, AlphaBetaAgent, ExpectiminimaxAgent, GeminiAgent, HumanAgent
-from visualization.tree_diagram import TreeDiagram
+from agents.alpha_beta_agent import AlphaBetaAgent
+from agents.registry import load_agent
+from visualization.render_queue import RenderQueue
 
 # Evaluation function
 
@@ -16,20 +17,14 @@ def simple_eval_fn(board):
     return 0
 
 
-# Map string to agent classes
-AGENT_OPTIONS = {
-    'alphabeta': AlphaBetaAgent,
-    'minimax': MinimaxAgent,
-    'expectiminimax': ExpectiminimaxAgent,
-    'gemini': GeminiAgent,
-    'human': HumanAgent
-}
+# Agent types offered here; classes are imported from the registry only when chosen
+AGENT_OPTIONS = ('alphabeta', 'minimax', 'expectiminimax', 'gemini', 'human')
 
 
 def get_agent_by_type(agent_type, mark, depth=4):
-    cls = AGENT_OPTIONS.get(agent_type.lower())
-    if cls is None:
+    if agent_type.lower() not in AGENT_OPTIONS:
         raise ValueError(f"Invalid agent type: {agent_type}")
+    cls = load_agent(agent_type.lower())
 
     if agent_type in ['alphabeta', 'minimax', 'expectiminimax', 'gemini']:
         return cls(eval_fn=simple_eval_fn, max_depth=depth, mark=mark)
@@ -39,7 +34,7 @@ def get_agent_by_type(agent_type, mark, depth=4):
 
 def main():
     print("\nChoose opponent for AlphaBetaAgent (X):")
-    print("Options: minimax, alphabeta, expectiminimax, gemini, human")
+    print(f"Options: {', '.join(AGENT_OPTIONS)}")
     opponent_type = input("Enter agent type for Player O: ").strip().lower()
 
     try:
@@ -51,6 +46,7 @@ def main():
 
     board = Board(size=3)
     game = Game(board, agent1, agent2)
+    render_queue = RenderQueue(workers=2)  # Draws the trees without pausing the game
 
     while not board.is_game_over():
         agent = game.get_current_agent()
@@ -61,9 +57,9 @@ def main():
         print(board)
 
         if isinstance(agent, AlphaBetaAgent):
-            print("Visualizing Alpha-Beta pruning tree for this move...")
-            TreeDiagram(agent.last_search_tree).draw(
-                title=f"Alpha-Beta Tree - Player {game.current_player}")
+            print("Queueing Alpha-Beta pruning tree for this move...")
+            render_queue.submit(agent.last_search_tree,
+                                title=f"Alpha-Beta Tree - Player {game.current_player}")
 
         if board.is_game_over():
             break
@@ -73,6 +69,9 @@ def main():
     winner = board.get_winner()
     print(f"\nGame Over! Winner: {winner}" if winner else "\nGame Over! It's a draw.")
 
+    print("Waiting for the tree diagrams...")
+    render_queue.close()
+
 
 if __name__ == "__main__":
     main()
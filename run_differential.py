@@ -0,0 +1,89 @@
+# run_differential.py
+# Differential test of optimized agents against the reference MinimaxAgent on Board
+# (see evaluation/differential.py): same game values, moves from the reference's
+# best-move set, and node / time ratios. Exits with status 1 on any mismatch.
+# Candidates are given as in run_tournament.py: name=agent[,key=value...].
+#
+# Positions: every reachable 3x3 position (--size 3, the default), or --sample N
+# random positions with --min-empty..--max-empty empty cells on larger boards, or a suite file.
+# With --games N each candidate instead plays N whole games against itself on --size/--k,
+# keeping its agents from move to move and game to game, and every move is checked.
+#
+# Usage:
+#   python run_differential.py ab=alphabeta,max_depth=9 mm-tt=minimax,max_depth=9,reuse_search=True --workers 4
+#   python run_differential.py ab=alphabeta,max_depth=3 --size 4 --k 4 --sample 200 --depth 3
+#   python run_differential.py ab=alphabeta,max_depth=9 --suite positions/3x3_all.txt --limit 500
+#   python run_differential.py ab=alphabeta,max_depth=9 --backend mypackage.fast_board:from_board
+#   python run_differential.py ab-tt=alphabeta,max_depth=9,reuse_search=True,ponder=True --games 50 --seed 0
+
+# === Import libraries and modules ===
+import argparse
+import importlib
+import sys
+from evaluation.differential import print_report, run_differential, run_differential_games, save_results, summarize
+from evaluation.position_suite import all_positions, load_suite, sample_positions
+from run_tournament import parse_agent
+# =========================================
+
+
+def load_backend(target):
+    # "package.module:function" -> callable turning a Board into the candidates' board
+    module_name, _, attribute = target.partition(":")
+    if not attribute:
+        raise argparse.ArgumentTypeError(f"Expected module:function, got '{target}'")
+    return getattr(importlib.import_module(module_name), attribute)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Differential test of agents against the reference minimax")
+    parser.add_argument("agents", nargs="+", type=parse_agent, help="name=agent[,key=value...]")
+    parser.add_argument("--size", type=int, default=3, help="Board size")
+    parser.add_argument("--k", type=int, default=None, help="Winning length (default: the Board default)")
+    parser.add_argument("--sample", type=int, default=None,
+                        help="Random positions instead of every reachable one (needed above 3x3)")
+    parser.add_argument("--min-empty", type=int, default=6)
+    parser.add_argument("--max-empty", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--suite", default=None, help="Take the positions from a suite file instead")
+    parser.add_argument("--games", type=int, default=None,
+                        help="Play this many whole games per candidate instead of checking separate positions")
+    parser.add_argument("--random-plies", type=int, default=2, help="Random opening plies of every game (--games)")
+    parser.add_argument("--depth", type=int, default=None,
+                        help="Reference search depth (default: to the end of the game)")
+    parser.add_argument("--backend", type=load_backend, default=None,
+                        help="module:function turning a Board into the board the candidates search")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="Worker processes (positions or games are split between them)")
+    parser.add_argument("--limit", type=int, default=None, help="Only the first N positions")
+    parser.add_argument("--output", default=None, help="Write every result and the summary to this JSON file")
+    args = parser.parse_args()
+
+    if args.games:
+        results = run_differential_games(args.agents, args.games, args.size, winning_length=args.k, depth=args.depth,
+                                         board_backend=args.backend, workers=args.workers, seed=args.seed,
+                                         random_plies=args.random_plies)
+        title = f"Differential test: {args.games} games, {len(results)} moves"
+    else:
+        if args.suite:
+            positions = load_suite(args.suite)
+        elif args.sample:
+            positions = sample_positions(args.size, args.sample, args.min_empty, args.max_empty,
+                                         winning_length=args.k, seed=args.seed)
+        else:
+            positions = all_positions(args.size, winning_length=args.k)
+        positions = positions[:args.limit]
+        results = run_differential(positions, args.agents, depth=args.depth, board_backend=args.backend,
+                                   workers=args.workers)
+        title = f"Differential test: {len(positions)} positions"
+
+    summary = summarize(results)
+    print_report(summary, results, title=title)
+    if args.output:
+        save_results(args.output, results, summary)
+        print(f"\nResults written to {args.output}")
+    if any(s['move_mismatches'] or s['value_mismatches'] for s in summary.values()):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+# run_llm_benchmark.py
+# Plays many GeminiAgent vs GeminiAgent games at the same time against a local
+# stand-in of the Gemini API (agents/mock_llm.py), without an API key or network.
+# Reports game throughput, the agents' retry/timeout counters and the client
+# pool's rate-limit and coalescing counters.
+#
+# Usage:
+#   python run_llm_benchmark.py --games 200 --latency 0.2 --error-rate 0.1
+#   python run_llm_benchmark.py --games 50 --http      # through a localhost HTTP server
+#   python run_llm_benchmark.py --games 500 --rate-limit 20 --rps 18 --coalesce
+
+# === Import libraries and modules ===
+import argparse
+import time
+from agents.gemini_agent import GeminiAgent
+from agents.gemini_client import ClientPool
+from agents.mock_llm import MockGeminiModel, MockGeminiServer, HTTPModel
+from evaluation import Metrics
+# =========================================
+
+
+def run_benchmark(model, games, board_size, **agent_kwargs):
+    # Plays the games concurrently and returns a summary dict
+    pairs = []
+    for _ in range(games):
+        pairs.append(tuple(
+            GeminiAgent(mark=mark, model=model, verbose=False, **agent_kwargs)
+            for mark in ('X', 'O')))
+
+    metrics = Metrics()
+    start_time = time.perf_counter()
+    results = metrics.run_concurrent_matches(pairs, board_size=board_size)
+    elapsed = time.perf_counter() - start_time
+
+    # Sum the per-agent counters
+    totals = {}
+    for pair in pairs:
+        for agent in pair:
+            for name, count in agent.stats.items():
+                totals[name] = totals.get(name, 0) + count
+    moves = sum(r['total_moves'] for r in results)
+    return {
+        'games': games,
+        'elapsed_sec': round(elapsed, 3),
+        'games_per_sec': round(games / elapsed, 2),
+        'moves_per_sec': round(moves / elapsed, 2),
+        'success_rate': metrics.get_success_rate(),
+        'agent_stats': totals,
+        'client_pool': ClientPool.get_stats()
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark concurrent LLM-driven games offline")
+    parser.add_argument("--games", type=int, default=100)
+    parser.add_argument("--board-size", type=int, default=3)
+    parser.add_argument("--latency", type=float, default=0.1, help="Seconds per mock request")
+    parser.add_argument("--jitter", type=float, default=0.05, help="Extra random delay per request")
+    parser.add_argument("--error-rate", type=float, default=0.05, help="Share of failing requests")
+    parser.add_argument("--move-timeout", type=float, default=5.0)
+    parser.add_argument("--max-retries", type=int, default=2)
+    parser.add_argument("--max-concurrency", type=int, default=32)
+    parser.add_argument("--rate-limit", type=float, default=None, help="Mock server limit (requests/s) before 429s")
+    parser.add_argument("--rps", type=float, default=None, help="Client-side rate limit (requests/s)")
+    parser.add_argument("--coalesce", action="store_true", help="Merge concurrent requests into multi-board prompts")
+    parser.add_argument("--max-batch", type=int, default=8, help="Boards per multi-board prompt")
+    parser.add_argument("--hedge", action="store_true", help="Race a local engine against each API call")
+    parser.add_argument("--http", action="store_true", help="Use the localhost HTTP stand-in")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    agent_kwargs = {
+        'move_timeout': args.move_timeout,
+        'max_retries': args.max_retries,
+        'max_concurrency': args.max_concurrency,
+        'requests_per_second': args.rps,
+        'coalesce': args.coalesce,
+        'max_batch': args.max_batch,
+        'hedge': args.hedge
+    }
+    if args.http:
+        with MockGeminiServer(latency=args.latency, jitter=args.jitter, error_rate=args.error_rate,
+                              seed=args.seed, rate_limit=args.rate_limit) as server:
+            summary = run_benchmark(HTTPModel(server.url), args.games, args.board_size, **agent_kwargs)
+            summary['backend_stats'] = dict(server.model.stats)
+    else:
+        model = MockGeminiModel(latency=args.latency, jitter=args.jitter, error_rate=args.error_rate,
+                                seed=args.seed, rate_limit=args.rate_limit)
+        summary = run_benchmark(model, args.games, args.board_size, **agent_kwargs)
+        summary['backend_stats'] = dict(model.stats)
+
+    for name, value in summary.items():
+        print(f"{name}: {value}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+# run_position_suite.py
+# Runs agents on the fixed positions of a position suite (see evaluation/position_suite.py)
+# and reports accuracy against the known best moves, nodes, time and search depth.
+# Agents are given as in run_tournament.py: name=agent[,key=value...].
+#
+# Shipped suites (positions/, rebuilt with --generate):
+#   3x3_all.txt      every reachable non-terminal 3x3 position (4520)
+#   4x4_k4_sample.txt  200 sampled 4x4 positions, four in a row (4x4 with the default
+#                    five in a row cannot be won)
+#   5x5_sample.txt   200 sampled 5x5 positions with 8-12 empty cells
+#
+# Usage:
+#   python run_position_suite.py positions/3x3_all.txt --agents ab9=alphabeta,max_depth=9 mm2=minimax,max_depth=2
+#   python run_position_suite.py positions/5x5_sample.txt --agents ab2=alphabeta,max_depth=2 --workers 4 --limit 50
+#   python run_position_suite.py --generate
+
+# === Import libraries and modules ===
+import argparse
+import os
+from agents.endgame_solver import EndgameSolver
+from evaluation.position_suite import (all_positions, load_suite, print_report, run_suite, sample_positions,
+                                       save_results, save_suite, solve_position, summarize)
+from run_tournament import parse_agent
+# =========================================
+
+POSITIONS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "positions")
+
+# File name -> (description, function building the positions)
+SHIPPED_SUITES = {
+    '3x3_all.txt': ("Every reachable non-terminal 3x3 position",
+                    lambda: all_positions(3)),
+    '4x4_k4_sample.txt': ("200 sampled 4x4 positions with 6-12 empty cells, four in a row wins (k=4)",
+                          lambda: sample_positions(4, 200, 6, 12, winning_length=4, seed=1)),
+    '5x5_sample.txt': ("200 sampled 5x5 positions with 8-12 empty cells, five in a row wins",
+                       lambda: sample_positions(5, 200, 8, 12, seed=1))
+}
+
+
+def generate_suites():
+    # Builds and solves the shipped suites
+    os.makedirs(POSITIONS_DIR, exist_ok=True)
+    for filename, (description, build) in SHIPPED_SUITES.items():
+        positions = build()
+        solver = EndgameSolver(max_entries=2_000_000)
+        prefix = filename.split("_")[0]
+        for number, position in enumerate(positions, 1):
+            position.id = f"{prefix}-{number:04d}"
+            solve_position(position, solver)
+        header = (f"{description}.\nvalue: exact game value for the side to move (1 win, 0 draw, -1 loss);\n"
+                  "bm: every move that keeps that value. Generated by run_position_suite.py --generate.\n")
+        save_suite(os.path.join(POSITIONS_DIR, filename), positions, header)
+        print(f"{filename}: {len(positions)} positions")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run agents on a position suite")
+    parser.add_argument("suite", nargs="?", help="Suite file (positions/...)")
+    parser.add_argument("--agents", nargs="+", type=parse_agent, default=[], help="name=agent[,key=value...]")
+    parser.add_argument("--workers", type=int, default=1, help="Worker processes (positions are split between them)")
+    parser.add_argument("--limit", type=int, default=None, help="Only the first N positions")
+    parser.add_argument("--output", default=None, help="Write every result and the summary to this JSON file")
+    parser.add_argument("--generate", action="store_true", help="Rebuild the shipped suites in positions/")
+    args = parser.parse_args()
+
+    if args.generate:
+        generate_suites()
+        return
+    if not args.suite or not args.agents:
+        parser.error("a suite file and at least one --agents entry are required")
+
+    positions = load_suite(args.suite)[:args.limit]
+    results = run_suite(positions, args.agents, workers=args.workers)
+    summary = summarize(results)
+    print_report(summary, title=f"{os.path.basename(args.suite)}: {len(positions)} positions")
+    if args.output:
+        save_results(args.output, results, summary)
+        print(f"\nResults written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
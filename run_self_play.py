@@ -0,0 +1,56 @@
+# run_self_play.py
+# Generates labelled positions from self-play games (see evaluation/self_play.py)
+# and writes them to compressed .npz (or Parquet) shards with an index.json.
+# Agents are given as in run_tournament.py: name=agent[,key=value...]; the
+# second agent plays O and defaults to the first one.
+#
+# Usage:
+#   python run_self_play.py ab4=alphabeta,max_depth=4 --games 100000 --workers 4 --random-plies 2 --seed 0
+#   python run_self_play.py mcts=mcts,simulations=200 ab2=alphabeta,max_depth=2 --board-size 5 --games 1000 \
+#       --epsilon 0.1 --rows-per-shard 50000 --format parquet --output results/self_play/5x5
+
+# === Import libraries and modules ===
+import argparse
+import os
+import resource
+import time
+from evaluation.self_play import FORMATS, ShardWriter, self_play
+from run_tournament import parse_agent
+# =========================================
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Stream self-play games into compressed training shards")
+    parser.add_argument("agents", nargs="+", type=parse_agent, help="name=agent[,key=value...] for X (and O)")
+    parser.add_argument("--games", type=int, default=1000)
+    parser.add_argument("--board-size", type=int, default=3)
+    parser.add_argument("--k", type=int, default=None, help="Winning length (default: the Board default)")
+    parser.add_argument("--workers", type=int, default=1, help="Worker processes")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--random-plies", type=int, default=0, help="Opening plies played at random (not recorded)")
+    parser.add_argument("--epsilon", type=float, default=0.0, help="Chance of a random move after the opening")
+    parser.add_argument("--rows-per-shard", type=int, default=100_000)
+    parser.add_argument("--format", choices=FORMATS, default='npz')
+    parser.add_argument("--output", default=None, help="Shard directory (default: results/self_play/<agents>)")
+    args = parser.parse_args()
+    if len(args.agents) > 2:
+        parser.error("at most two agents (X and O)")
+
+    agent_x, agent_o = args.agents[0], args.agents[-1]
+    output = args.output or os.path.join("results", "self_play", "-vs-".join(dict.fromkeys(a.name for a in args.agents)))
+    start = time.perf_counter()
+    with ShardWriter(output, rows_per_shard=args.rows_per_shard, format=args.format) as writer:
+        writer.write_all(self_play(agent_x, agent_o, games=args.games, board_size=args.board_size,
+                                   workers=args.workers, seed=args.seed, random_plies=args.random_plies,
+                                   epsilon=args.epsilon, winning_length=args.k))
+    elapsed = time.perf_counter() - start
+
+    # ru_maxrss is in KB on Linux
+    peak_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    print(f"{args.games} games, {writer.rows} rows in {len(writer.shards)} shards ({output})")
+    print(f"{elapsed:.2f} s: {args.games / elapsed:.1f} games/s, {writer.rows / elapsed:.1f} rows/s, "
+          f"peak memory {peak_mb:.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+# run_tournament.py
+# Round-robin tournament between any number of agent configurations (see
+# evaluation/tournament.py): crosstable, Elo ratings with confidence intervals
+# and time/node efficiency per agent. Tree-search agents evaluate won and lost
+# positions from their own side (agents.win_loss_eval.WinLossEval).
+#
+# An agent is given as name=agent[,key=value...], where agent is a registry name
+# (minimax, alphabeta, expectiminimax, mcts, proofnumber, gemini) and the values
+# are Python literals passed to the constructor.
+#
+# Usage:
+#   python run_tournament.py minimax-d3=minimax,max_depth=3 alphabeta-d6=alphabeta,max_depth=6 \
+#       mcts=mcts,simulations=200 --games-per-pair 4 --workers 4 --seed 0
+#   python run_tournament.py ab-d2=alphabeta,max_depth=2 ab-d4=alphabeta,max_depth=4 --board-size 5 \
+#       --output results/tournament.json
+
+# === Import libraries and modules ===
+import argparse
+import ast
+from agents.registry import get_agent_spec
+from agents.win_loss_eval import WinLossEval
+from evaluation.tournament import AgentConfig, Tournament
+# =========================================
+
+
+def parse_agent(text):
+    # "name=agent,key=value,..." -> AgentConfig
+    name, _, spec = text.partition("=")
+    if not spec:
+        raise argparse.ArgumentTypeError(f"Expected name=agent[,key=value...], got '{text}'")
+    agent, *options = spec.split(",")
+    try:
+        search = get_agent_spec(agent).search
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(str(e))
+    kwargs = {'eval_for_mark': WinLossEval} if search else {}
+    for option in options:
+        key, _, value = option.partition("=")
+        try:
+            kwargs[key] = ast.literal_eval(value)
+        except (ValueError, SyntaxError):
+            kwargs[key] = value
+    return AgentConfig(name, agent, **kwargs)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Round-robin tournament between agent configurations")
+    parser.add_argument("agents", nargs="+", type=parse_agent, help="name=agent[,key=value...]")
+    parser.add_argument("--board-size", type=int, default=3)
+    parser.add_argument("--games-per-pair", type=int, default=2, help="Games per pairing, colours alternating")
+    parser.add_argument("--workers", type=int, default=1, help="Worker processes")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--output", default=None, help="Write the full results to this JSON file")
+    args = parser.parse_args()
+
+    tournament = Tournament(args.agents, board_size=args.board_size, games_per_pair=args.games_per_pair,
+                            workers=args.workers, seed=args.seed)
+    tournament.run()
+    tournament.print_report()
+    if args.output:
+        tournament.save_json(args.output)
+        print(f"\nResults written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,26 @@
+# === Import libraries and modules ===
+from agents.win_loss_eval import WinLossEval
+from evaluation.differential import run_differential, run_differential_games, summarize
+from evaluation.position_suite import Position
+from evaluation.tournament import AgentConfig
+# =========================================
+
+
+def test_whole_games_keep_agents_across_moves():
+    candidates = [AgentConfig('ab-tt', 'alphabeta', eval_for_mark=WinLossEval, max_depth=9,
+                              reuse_search=True, ponder=True)]
+    results = run_differential_games(candidates, games=3, seed=0)
+    summary = summarize(results)['ab-tt']
+    assert summary['moves_checked'] == len(results) > 3
+    assert summary['move_mismatches'] == 0 and summary['value_mismatches'] == 0
+    assert {r['game'] for r in results} == {0, 1, 2}
+
+
+def test_capped_reference_skips_unlimited_candidates():
+    # Five empty cells, reference to depth 2: only the depth-limited candidate is comparable
+    position = Position.from_line("XO./X../.O. X")
+    candidates = [AgentConfig('ab2', 'alphabeta', eval_for_mark=WinLossEval, max_depth=2),
+                  AgentConfig('pn', 'proofnumber')]
+    results = {r['agent']: r for r in run_differential([position], candidates, depth=2)}
+    assert results['ab2']['move_ok'] is not None
+    assert results['pn']['move_ok'] is None
@@ -0,0 +1,18 @@
+# === Import libraries and modules ===
+from agents.registry import create_agent
+from agents.win_loss_eval import WinLossEval
+from game.board import Board
+# =========================================
+
+
+def test_pondered_reply_reports_its_nodes():
+    for kind in ('minimax', 'alphabeta', 'expectiminimax'):
+        agent = create_agent(kind, 'O', eval_fn=WinLossEval('O'), max_depth=3, ponder=True)
+        board = Board(4).generate_successor((0, 0), 'X')
+        board = board.generate_successor(agent.get_action(board), 'O')
+        agent.ponderer._thread.join()  # Let pondering search every reply
+        board = board.generate_successor(board.get_legal_actions()[0], 'X')
+        agent.get_action(board)
+        agent.ponderer.stop()
+        assert agent.ponderer.stats['ponder_hits'] == 1
+        assert agent.nodes_expanded > 0
@@ -0,0 +1,42 @@
+# === Import libraries and modules ===
+from agents.endgame_solver import EndgameSolver
+from agents.proof_number_agent import ProofNumberAgent, ProofNumberSolver
+from evaluation.position_suite import Position
+from game.board import Board
+# =========================================
+
+
+def test_small_memory_bound_still_solves():
+    # The bound binds (garbage collection runs) and the value is the unbounded one
+    for max_entries in (50, 200, 500):
+        result = ProofNumberSolver(max_entries=max_entries).solve(Board(3))
+        assert result['value'] == 'draw'
+        assert result['gc_runs'] > 0
+        assert result['best_move'] is not None
+
+
+def test_small_memory_bound_keeps_table_size():
+    solver = ProofNumberSolver(max_entries=200)
+    solver.solve(Board(3))
+    assert len(solver.table) <= 200
+
+
+def test_lost_position_delays_the_loss():
+    # O has lost; (2, 0) blocks the column and loses two moves later than the rest
+    board = Position.from_line("XO./X../... O").board()
+    agent = ProofNumberAgent('O')
+    move = agent.get_action(board)
+    scores = EndgameSolver().move_scores(board, 'O')
+    assert agent.last_result['value'] == 'loss'
+    assert move == (2, 0)
+    assert scores[move] == max(scores.values())
+
+
+def test_5x5_five_in_a_row_under_a_small_bound():
+    # 5x5, k=5 (the Board default) after eight plies: a draw, also with a 300-entry table
+    position = Position.from_line("...O./.OX../.XXO./.XO../..... X")
+    assert position.board().winning_length == 5
+    unbounded = ProofNumberSolver().solve(position.board())
+    bounded = ProofNumberSolver(max_entries=300).solve(position.board())
+    assert unbounded['value'] == bounded['value'] == 'draw'
+    assert bounded['gc_runs'] > 0
@@ -0,0 +1,196 @@
+# train_value_network.py
+# Trains the NumPy value/policy network (agents/value_network.py) on positions
+# generated and labelled locally, then reports its accuracy against the exact
+# values and its inference speed at batch sizes 1, 64 and 1024.
+#
+# Training data:
+# - 3x3: every reachable position (tablebase), labelled by the exact endgame solver
+# - larger boards: positions from random self-play games once at most
+#   --max-empty cells are left, labelled by the same solver
+#
+# Usage:
+#   python train_value_network.py                      # 3x3 -> models/value_net_3x3.npz
+#   python train_value_network.py --size 5 --games 2000 --max-empty 10
+
+# === Import libraries and modules ===
+import argparse
+import random
+import time
+import numpy as np
+from game.board import Board
+from agents.endgame_solver import EndgameSolver
+from agents.value_network import ValueNetwork, default_model_path
+# =========================================
+
+
+# === Labelling ===
+
+def label_position(board, solver):
+    # Returns (value from X's view, policy target over the cells) for one position
+    n_cells = board.size * board.size
+    policy = np.zeros(n_cells, dtype=np.float32)
+    winner = board.get_winner()
+    if winner is not None:
+        return (1.0 if winner == 'X' else -1.0), policy
+    if board.is_full():
+        return 0.0, policy
+
+    # Exact score of every move for the side to move
+    to_move = board.get_current_player()
+    opponent = 'O' if to_move == 'X' else 'X'
+    scores = {}
+    for move in board.get_valid_moves():
+        successor = board.generate_successor(move, to_move)
+        if successor.check_win(to_move):
+            scores[move] = 1
+        elif successor.is_full():
+            scores[move] = 0
+        else:
+            scores[move] = -solver.solve(successor, opponent)[0]
+
+    best = max(scores.values())
+    for (row, col), score in scores.items():
+        if score == best:
+            policy[row * board.size + col] = 1.0
+    policy /= policy.sum()
+
+    value = float(np.sign(best))
+    return (value if to_move == 'X' else -value), policy
+
+
+def tablebase_positions(size):
+    # Every position reachable from the empty board (X moves first)
+    positions, seen = [], set()
+    frontier = [Board(size)]
+    while frontier:
+        board = frontier.pop()
+        key = board.get_key()
+        if key in seen:
+            continue
+        seen.add(key)
+        positions.append(board)
+        if not board.is_terminal():
+            mark = board.get_current_player()
+            for move in board.get_valid_moves():
+                frontier.append(board.generate_successor(move, mark))
+    return positions
+
+
+def self_play_positions(size, games, max_empty, seed):
+    # Positions with at most max_empty cells left from random games
+    rng = random.Random(seed)
+    positions, seen = [], set()
+    for _ in range(games):
+        board = Board(size)
+        while not board.is_terminal():
+            if len(board.get_valid_moves()) <= max_empty and board.get_key() not in seen:
+                seen.add(board.get_key())
+                positions.append(board)
+            board = board.generate_successor(rng.choice(board.get_valid_moves()), board.get_current_player())
+    return positions
+
+
+def build_dataset(positions):
+    # Stacked board arrays with value and policy targets
+    solver = EndgameSolver()
+    arrays, values, policies = [], [], []
+    for board in positions:
+        value, policy = label_position(board, solver)
+        arrays.append(board.to_array())
+        values.append(value)
+        policies.append(policy)
+    return np.stack(arrays), np.array(values, dtype=np.float32), np.stack(policies)
+
+
+# === Training and reporting ===
+
+def train(network, arrays, values, policies, epochs, batch_size, learning_rate, seed):
+    features = ValueNetwork.features(arrays)
+    rng = np.random.default_rng(seed)
+    for epoch in range(1, epochs + 1):
+        order = rng.permutation(len(features))
+        value_losses, policy_losses = [], []
+        for start in range(0, len(order), batch_size):
+            batch = order[start:start + batch_size]
+            value_loss, policy_loss = network.train_step(features[batch], values[batch], policies[batch], learning_rate)
+            value_losses.append(value_loss)
+            policy_losses.append(policy_loss)
+        if epoch == 1 or epoch % max(1, epochs // 10) == 0:
+            print(f"  epoch {epoch:4d}  value loss {np.mean(value_losses):.4f}  policy loss {np.mean(policy_losses):.4f}")
+
+
+def accuracy(network, arrays, values, policies):
+    # Share of positions whose rounded value is exact, and whose top move is optimal
+    predicted = network.evaluate_batch(arrays)
+    value_accuracy = float(np.mean(np.round(predicted) == values))
+    has_moves = policies.sum(axis=1) > 0
+    top_moves = network.policy_batch(arrays[has_moves]).argmax(axis=1)
+    policy_accuracy = float(np.mean(policies[has_moves][np.arange(len(top_moves)), top_moves] > 0))
+    return {'value_accuracy': round(value_accuracy, 4), 'policy_accuracy': round(policy_accuracy, 4)}
+
+
+def inference_speed(network, arrays, batch_sizes=(1, 64, 1024), min_seconds=0.5):
+    # Positions evaluated per second for each batch size
+    rng = np.random.default_rng(0)
+    speeds = {}
+    for batch_size in batch_sizes:
+        batch = arrays[rng.integers(0, len(arrays), batch_size)]
+        calls, start_time = 0, time.perf_counter()
+        while time.perf_counter() - start_time < min_seconds:
+            network.evaluate_batch(batch)
+            calls += 1
+        speeds[batch_size] = round(calls * batch_size / (time.perf_counter() - start_time))
+    return speeds
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Train the NumPy value/policy network")
+    parser.add_argument("--size", type=int, default=3, help="Board size")
+    parser.add_argument("--games", type=int, default=2000, help="Self-play games (boards larger than 3x3)")
+    parser.add_argument("--max-empty", type=int, default=10, help="Label positions with at most this many empty cells")
+    parser.add_argument("--hidden", type=int, default=128, help="Hidden layer size")
+    parser.add_argument("--epochs", type=int, default=800)
+    parser.add_argument("--batch-size", type=int, default=128)
+    parser.add_argument("--learning-rate", type=float, default=3e-3)
+    parser.add_argument("--holdout", type=float, default=0.1, help="Share of positions kept for testing")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default=None, help="Weights file (default: models/value_net_<size>x<size>.npz)")
+    args = parser.parse_args()
+
+    # Generate and label the positions
+    start_time = time.perf_counter()
+    if args.size == 3:
+        positions = tablebase_positions(args.size)
+    else:
+        positions = self_play_positions(args.size, args.games, args.max_empty, args.seed)
+    arrays, values, policies = build_dataset(positions)
+    print(f"Labelled {len(arrays)} positions in {time.perf_counter() - start_time:.1f}s "
+          f"(X wins {int(np.sum(values > 0))}, draws {int(np.sum(values == 0))}, O wins {int(np.sum(values < 0))})")
+
+    # Hold out a test split
+    order = np.random.default_rng(args.seed).permutation(len(arrays))
+    n_test = int(len(order) * args.holdout)
+    test, training = order[:n_test], order[n_test:]
+
+    network = ValueNetwork(size=args.size, hidden=args.hidden, seed=args.seed)
+    start_time = time.perf_counter()
+    train(network, arrays[training], values[training], policies[training],
+          args.epochs, args.batch_size, args.learning_rate, args.seed)
+    print(f"Trained in {time.perf_counter() - start_time:.1f}s")
+
+    print("Accuracy against exact values:")
+    print(f"  training set: {accuracy(network, arrays[training], values[training], policies[training])}")
+    if n_test:
+        print(f"  held-out set: {accuracy(network, arrays[test], values[test], policies[test])}")
+
+    print("Evaluations per second:")
+    for batch_size, speed in inference_speed(network, arrays).items():
+        print(f"  batch {batch_size:5d}: {speed:,} positions/s")
+
+    output = args.output or default_model_path(args.size)
+    network.save(output)
+    print(f"Saved weights to {output}")
+
+
+if __name__ == "__main__":
+    main()
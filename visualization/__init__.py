@@ -1,4 +1,25 @@
 #import classes from visualization directory
-from .cli_view import CLIView
-from .gui_view import GUIView
-from .tree_diagram import TreeDiagram
\ No newline at end of file
+# Views are imported on first use (PEP 562 module __getattr__): GUIView needs pygame,
+# TreeDiagram.draw needs matplotlib and networkx
+import importlib
+
+_EXPORTS = {
+    'CLIView': 'cli_view',
+    'GUIView': 'gui_view',
+    'TreeDiagram': 'tree_diagram'
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    module_name = _EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module_name}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
\ No newline at end of file
@@ -6,30 +6,22 @@ from game.board import Board
 import os, sys
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
-try:
-    from agents.gemini_agent import GeminiAgent
-except ImportError:
-    GeminiAgent = None
+from agents.registry import agent_available, load_agent
 
 def eval_fn(board):
     winner = board.get_winner()
     return 1 if winner == 'O' else (-1 if winner == 'X' else 0)
 
 def select_agent(mark):
-    # ===== Import agents locally to avoid circular imports =====
-    from agents.expectiminimax_agent import ExpectiminimaxAgent
-    from agents.alpha_beta_agent import AlphaBetaAgent
-    from agents.minimax_agent import MinimaxAgent
-    from agents.human_agent import HumanAgent
-
+    # ===== Agents are imported from the registry only once chosen =====
     options = [
-        ("Human",      lambda: HumanAgent(mark=mark)),
-        ("Minimax",    lambda: MinimaxAgent(mark=mark, eval_fn=eval_fn, max_depth=9)),
-        ("Alpha-Beta", lambda: AlphaBetaAgent(eval_fn=eval_fn, max_depth=9, mark=mark)),
-        ("ExpectiMin", lambda: ExpectiminimaxAgent(eval_fn=eval_fn, max_depth=9, mark=mark)),
+        ("Human",      lambda: load_agent('human')(mark=mark)),
+        ("Minimax",    lambda: load_agent('minimax')(mark=mark, eval_fn=eval_fn, max_depth=9, ponder=True)),
+        ("Alpha-Beta", lambda: load_agent('alphabeta')(eval_fn=eval_fn, max_depth=9, mark=mark, ponder=True)),
+        ("ExpectiMin", lambda: load_agent('expectiminimax')(eval_fn=eval_fn, max_depth=9, mark=mark, ponder=True)),
     ]
-    if GeminiAgent:
-        options.append(("Gemini", lambda: GeminiAgent(mark=mark, eval_fn=eval_fn, max_depth=9)))
+    if agent_available('gemini'):
+        options.append(("Gemini", lambda: load_agent('gemini')(mark=mark, eval_fn=eval_fn, max_depth=9)))
 
     print(f"Select opponent for Player {mark}:")
     for i, (name, _) in enumerate(options, start=1):
@@ -75,6 +67,11 @@ class CLIView:
                 continue
             self.game.switch_player()
 
+        # Stop any agent still searching on the opponent's time
+        for agent in (self.agent1, self.agent2):
+            if getattr(agent, 'ponderer', None) is not None:
+                agent.ponderer.stop()
+
         self.display_board()
         winner = self.board.get_winner()
         if winner:
@@ -7,10 +7,7 @@ import pygame
 import os
 import sys
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
-try:
-    from agents.gemini_agent import GeminiAgent
-except ImportError:
-    GeminiAgent = None
+from agents.registry import agent_available, load_agent
 
 # Config
 CELL_SIZE = 100
@@ -33,20 +30,15 @@ def eval_fn(board):
 
 
 def select_agent(mark):
-    # ===== Import agents locally to avoid circular imports =====
-    from agents.expectiminimax_agent import ExpectiminimaxAgent
-    from agents.alpha_beta_agent import AlphaBetaAgent
-    from agents.minimax_agent import MinimaxAgent
-    from agents.human_agent import HumanAgent
-
+    # ===== Agents are imported from the registry only once chosen =====
     options = [
-        ("Human", lambda: HumanAgent(mark=mark)),
-        ("Minimax", lambda: MinimaxAgent(mark=mark, eval_fn=eval_fn, max_depth=9)),
-        ("Alpha-Beta", lambda: AlphaBetaAgent(eval_fn=eval_fn, max_depth=9, mark=mark)),
-        ("Expectiminimax", lambda: ExpectiminimaxAgent(eval_fn=eval_fn, max_depth=9, mark=mark)),
+        ("Human", lambda: load_agent('human')(mark=mark)),
+        ("Minimax", lambda: load_agent('minimax')(mark=mark, eval_fn=eval_fn, max_depth=9, ponder=True)),
+        ("Alpha-Beta", lambda: load_agent('alphabeta')(eval_fn=eval_fn, max_depth=9, mark=mark, ponder=True)),
+        ("Expectiminimax", lambda: load_agent('expectiminimax')(eval_fn=eval_fn, max_depth=9, mark=mark, ponder=True)),
     ]
-    if GeminiAgent:
-        options.append(("Gemini", lambda: GeminiAgent(mark=mark, eval_fn=eval_fn, max_depth=9)))
+    if agent_available('gemini'):
+        options.append(("Gemini", lambda: load_agent('gemini')(mark=mark, eval_fn=eval_fn, max_depth=9)))
 
     print(f"Select opponent for Player X:")
     for idx, (name, _) in enumerate(options, start=1):
@@ -136,6 +128,10 @@ class GUIView:
                 print(f"Game Over: {'Draw' if not winner else f'Player {winner} wins!'}")
                 self.running = False
 
+        # Stop any agent still searching on the opponent's time
+        for agent in (self.agent1, self.agent2):
+            if getattr(agent, 'ponderer', None) is not None:
+                agent.ponderer.stop()
         pygame.quit()
 
 
@@ -0,0 +1,134 @@
+"""
+Background Rendering of Search Tree Diagrams
+
+This module draws tree diagrams without stalling the game. TreeDiagram.draw
+saves a PNG at 300 dpi and then blocks in plt.show(), which costs seconds per
+move. RenderQueue instead takes a snapshot of the search trace (a few NumPy
+arrays), hands it to a pool of worker processes that draw with the
+non-interactive Agg backend, and returns immediately.
+
+Key Features:
+- submit() returns at once; the images are saved by worker processes
+- flush() waits until every queued image is saved (also on leaving a with block)
+- workers=0 draws inline instead (Agg if there is no display)
+- display_available / use_headless_backend for machines without a display
+
+Date Created: 2026-10-19
+Version: 1.0
+
+Usage:
+    with RenderQueue(workers=2) as render_queue:
+        ...
+        render_queue.submit(agent.last_search_tree, title="Alpha-Beta Tree - Player X")
+        ...
+    # leaving the block waits for the remaining images
+
+    render_queue = RenderQueue(workers=0)   # draw inline instead
+"""
+
+# render_queue.py
+
+import multiprocessing
+import os
+import sys
+from datetime import datetime
+from concurrent.futures import ProcessPoolExecutor, wait
+
+
+def display_available():
+    # True if an interactive matplotlib window could be opened
+    if sys.platform.startswith("linux"):
+        return bool(os.environ.get("DISPLAY") or os.environ.get("WAYLAND_DISPLAY"))
+    return True
+
+
+def use_headless_backend(force=False):
+    # Switches matplotlib to Agg (files only) when there is no display, or always if force
+    if force or not display_available():
+        import matplotlib
+        matplotlib.use("Agg", force=True)
+
+
+def _init_worker():
+    # Worker processes only write files
+    use_headless_backend(force=True)
+
+
+def _render(columns, draw_kwargs):
+    # Runs in a worker: rebuilds the trace and draws it; returns the image path
+    from visualization.search_trace import SearchTrace
+    from visualization.tree_diagram import TreeDiagram
+    return TreeDiagram(SearchTrace.from_columns(columns)).draw(show=False, **draw_kwargs)
+
+
+class RenderQueue:
+    def __init__(self, workers=1, verbose=True):
+        self.workers = workers  # Worker processes (0 = draw inline, blocking)
+        self.verbose = verbose
+        self._futures = []
+        self._executor = None
+        self._submitted = 0
+        self.saved = []  # Image paths, in submission order, once flushed
+        self.errors = []
+
+    def submit(self, trace, **draw_kwargs):
+        # Queues a diagram of trace (a SearchTrace or root Node); draw_kwargs go to TreeDiagram.draw
+        if trace is None:
+            return
+        from visualization.search_trace import SearchTrace
+        if not isinstance(trace, SearchTrace):
+            trace = SearchTrace.from_nodes(trace)
+
+        if self.workers <= 0:
+            from visualization.tree_diagram import TreeDiagram
+            use_headless_backend()
+            show = draw_kwargs.pop('show', display_available())
+            self.saved.append(TreeDiagram(trace).draw(show=show, **draw_kwargs))
+            return
+
+        if self._executor is None:
+            # "spawn" so workers never inherit a GUI backend or running threads from the game
+            self._executor = ProcessPoolExecutor(self.workers, mp_context=multiprocessing.get_context("spawn"),
+                                                 initializer=_init_worker)
+        draw_kwargs.pop('show', None)
+        if 'filename' not in draw_kwargs:
+            # Workers may finish in the same millisecond, so timestamps alone could collide
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S_%f")[:-3]
+            draw_kwargs['filename'] = f"alpha_beta_tree_{timestamp}_{os.getpid()}_{self._submitted}.png"
+        self._submitted += 1
+        self._futures.append(self._executor.submit(_render, trace.snapshot(), draw_kwargs))
+
+    @property
+    def pending(self):
+        # Diagrams not finished yet
+        return sum(not future.done() for future in self._futures)
+
+    def flush(self, timeout=None):
+        # Waits for the queued diagrams (at most timeout seconds); returns the paths
+        # saved since the last flush. Diagrams still running stay queued.
+        done, _ = wait(self._futures, timeout=timeout)
+        saved = []
+        for future in [f for f in self._futures if f in done]:
+            try:
+                saved.append(future.result())
+            except Exception as e:
+                self.errors.append(e)
+                if self.verbose:
+                    print(f"Tree rendering failed: {e}")
+        self._futures = [future for future in self._futures if future not in done]
+        self.saved.extend(saved)
+        return saved
+
+    def close(self):
+        # Flushes and shuts the workers down
+        saved = self.flush()
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+        return saved
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
@@ -0,0 +1,229 @@
+"""
+Search Trace Recording
+
+This module records the search tree of an alpha-beta search compactly. Instead
+of one Node object per visited or pruned child (with a children list and a
+parent reference), every node is one row in parallel NumPy arrays: parent index,
+move, value, alpha, beta, flags and depth (about 24 bytes per node).
+
+Key Features:
+- Array-backed nodes that grow in chunks (no Python object per node)
+- Optional node budget (max_nodes) and depth limit (max_depth)
+- Streams to a binary file (path=...) instead of keeping the nodes in memory
+- load() reads a streamed trace back; snapshot() / from_columns() hand a trace
+  to another process (see render_queue.py)
+
+Date Created: 2026-10-19
+Version: 1.0
+
+Usage:
+    trace = SearchTrace(max_nodes=100_000)
+    root = trace.add(None, None, float('-inf'), float('inf'), is_max=True)
+    child = trace.add(root, (1, 1), alpha, beta, is_max=False)
+    trace.finish(child, value, alpha, beta)
+    trace.finish(root, best_value)
+    TreeDiagram(trace).draw()
+
+    trace = SearchTrace(path="traces/move_12.trace")   # streams to disk
+    ...
+    trace.close()
+    trace = SearchTrace.load("traces/move_12.trace")
+"""
+
+# search_trace.py
+
+import os
+import numpy as np
+
+# Flags
+IS_MAX = 1  # Maximizing node
+PRUNED = 2  # Child skipped by an alpha-beta cut-off
+
+# One node in a streamed trace file
+RECORD_DTYPE = np.dtype([('index', '<i4'), ('parent', '<i4'), ('row', 'i1'), ('col', 'i1'),
+                         ('flags', 'u1'), ('depth', 'u1'), ('value', '<f4'), ('alpha', '<f4'), ('beta', '<f4')])
+FILE_MAGIC = b"ABTRACE1"
+
+# Column name -> dtype of the in-memory arrays
+COLUMNS = {name: RECORD_DTYPE[name] for name in ('parent', 'row', 'col', 'flags', 'depth', 'value', 'alpha', 'beta')}
+
+
+class SearchTrace:
+    def __init__(self, max_nodes=None, max_depth=None, path=None, chunk_size=65536, capacity=1024):
+        self.max_nodes = max_nodes  # Nodes recorded at most (None = no limit)
+        self.max_depth = max_depth  # Deepest level recorded, root = 0 (None = no limit)
+        self.path = path  # Stream finished nodes to this file instead of keeping them
+        self.dropped = 0  # Nodes refused by the budgets (descendants of a refused node are not counted)
+        self._count = 0
+        self._children = None  # (order, starts) built on first children() call
+        if path is None:
+            self._arrays = {name: np.empty(capacity, dtype) for name, dtype in COLUMNS.items()}
+        else:
+            # Open nodes wait here until finished; finished ones are written in chunks
+            self._arrays = None
+            self._open = {}
+            self._pending = []
+            self._chunk_size = chunk_size
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+            self._file = open(path, "wb")
+            self._file.write(FILE_MAGIC)
+
+    def __len__(self):
+        return self._count
+
+    @property
+    def nbytes(self):
+        # Memory held by the node arrays
+        if self._arrays is None:
+            return len(self._pending) * RECORD_DTYPE.itemsize
+        return sum(column.nbytes for column in self._arrays.values())
+
+    def add(self, parent, move, alpha, beta, is_max, pruned=False):
+        # Records a node and returns its index, or -1 if it is not recorded (budget reached
+        # or parent not recorded). parent is None for the root. Pruned nodes are finished
+        # immediately; others need finish() once their value is known.
+        if parent is None:
+            if self._count:
+                raise ValueError("The trace already has a root node.")
+            parent, depth = -1, 0
+        elif parent < 0:
+            self.dropped += 1
+            return -1
+        else:
+            depth = self._depth_of(parent) + 1
+        if (self.max_nodes is not None and self._count >= self.max_nodes) or \
+                (self.max_depth is not None and depth > self.max_depth):
+            self.dropped += 1
+            return -1
+
+        index = self._count
+        self._count += 1
+        row, col = move if move is not None else (-1, -1)
+        flags = (IS_MAX if is_max else 0) | (PRUNED if pruned else 0)
+        if self._arrays is None:
+            record = [index, parent, row, col, flags, depth, np.nan, alpha, beta]
+            if pruned:
+                self._write(record)
+            else:
+                self._open[index] = record
+            return index
+
+        if index == len(self._arrays['parent']):
+            self._grow()
+        arrays = self._arrays
+        arrays['parent'][index] = parent
+        arrays['row'][index] = row
+        arrays['col'][index] = col
+        arrays['flags'][index] = flags
+        arrays['depth'][index] = depth
+        arrays['value'][index] = np.nan
+        arrays['alpha'][index] = alpha
+        arrays['beta'][index] = beta
+        return index
+
+    def finish(self, index, value, alpha=None, beta=None):
+        # Stores a node's value (and final bounds); ignores nodes that were not recorded
+        if index < 0:
+            return
+        if self._arrays is None:
+            record = self._open.pop(index)
+            record[6] = value
+            if alpha is not None:
+                record[7], record[8] = alpha, beta
+            self._write(record)
+            return
+        self._arrays['value'][index] = value
+        if alpha is not None:
+            self._arrays['alpha'][index] = alpha
+            self._arrays['beta'][index] = beta
+
+    def close(self):
+        # Writes the remaining nodes of a streamed trace (unfinished ones without a value)
+        if self._arrays is None and not self._file.closed:
+            for index in sorted(self._open):
+                self._pending.append(tuple(self._open.pop(index)))
+            self._flush()
+            self._file.close()
+
+    def columns(self):
+        # {column name: array} with one entry per node, indexed by node id
+        if self._arrays is None:
+            self.close()
+            self._arrays = SearchTrace.load(self.path)._arrays
+        return {name: column[:self._count] for name, column in self._arrays.items()}
+
+    def children(self, index):
+        # Child indices of a node, in the order they were searched
+        if self._children is None:
+            parent = self.columns()['parent']
+            order = np.argsort(parent, kind='stable')
+            starts = np.searchsorted(parent[order], np.arange(self._count + 1))
+            self._children = (order, starts)
+        order, starts = self._children
+        return order[starts[index]:starts[index + 1]].tolist()
+
+    def move(self, index):
+        columns = self.columns()
+        row, col = int(columns['row'][index]), int(columns['col'][index])
+        return None if row < 0 else (row, col)
+
+    @classmethod
+    def load(cls, path):
+        # Reads a streamed trace file back into memory
+        with open(path, "rb") as f:
+            if f.read(len(FILE_MAGIC)) != FILE_MAGIC:
+                raise ValueError(f"{path} is not a search trace file.")
+            records = np.fromfile(f, dtype=RECORD_DTYPE)
+        trace = cls(capacity=max(1, len(records)))
+        for name in COLUMNS:
+            trace._arrays[name][records['index']] = records[name]
+        trace._count = len(records)
+        return trace
+
+    def snapshot(self):
+        # {column name: copy of the array}; small and picklable, e.g. for another process
+        return {name: column.copy() for name, column in self.columns().items()}
+
+    @classmethod
+    def from_columns(cls, columns):
+        # Rebuilds a trace from snapshot() / columns() output
+        count = len(columns['parent'])
+        trace = cls(capacity=max(1, count))
+        for name in COLUMNS:
+            trace._arrays[name][:count] = columns[name]
+        trace._count = count
+        return trace
+
+    @classmethod
+    def from_nodes(cls, root):
+        # Converts a tree of visualization.tree_diagram.Node objects
+        trace = cls()
+        stack = [(root, None)]
+        while stack:
+            node, parent = stack.pop()
+            index = trace.add(parent, node.move, node.alpha, node.beta, node.is_max, node.pruned)
+            if not node.pruned:
+                trace.finish(index, node.value if node.value is not None else np.nan)
+            stack.extend((child, index) for child in reversed(node.children))
+        return trace
+
+    def _depth_of(self, index):
+        if self._arrays is None:
+            return self._open[index][5]
+        return int(self._arrays['depth'][index])
+
+    def _grow(self):
+        for name, column in self._arrays.items():
+            grown = np.empty(2 * len(column), column.dtype)
+            grown[:len(column)] = column
+            self._arrays[name] = grown
+
+    def _write(self, record):
+        self._pending.append(tuple(record))
+        if len(self._pending) >= self._chunk_size:
+            self._flush()
+
+    def _flush(self):
+        if self._pending:
+            np.array(self._pending, dtype=RECORD_DTYPE).tofile(self._file)
+            self._pending = []
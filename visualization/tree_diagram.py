@@ -1,9 +1,10 @@
 # visualization/tree_diagram.py
 
-import matplotlib.pyplot as plt
-import networkx as nx
+import json
 import os
 from datetime import datetime
+import numpy as np
+from visualization.search_trace import SearchTrace, IS_MAX, PRUNED
 
 
 class Node:
@@ -25,84 +26,154 @@ class Node:
 
 class TreeDiagram:
     def __init__(self, root):
+        # root is a SearchTrace (what AlphaBetaAgent records) or the root Node of a tree
         self.root = root
+        self.trace = root if isinstance(root, SearchTrace) else SearchTrace.from_nodes(root)
+        self.columns = self.trace.columns()  # Node arrays, indexed by node id
+        self._sizes = None
 
-    def draw(self, title="Alpha-Beta Pruning Tree"):
-        import matplotlib.pyplot as plt
-        import networkx as nx
+    def subtree_sizes(self):
+        # Number of nodes in each node's subtree (itself included), in O(n):
+        # levels are folded into their parents from the deepest level up
+        if self._sizes is None:
+            columns = self.columns
+            parents, depths = columns['parent'], columns['depth']
+            sizes = np.ones(len(parents), dtype=np.int64)
+            order = np.argsort(depths, kind='stable')
+            bounds = np.searchsorted(depths[order], np.arange(int(depths.max(initial=0)) + 2))
+            for depth in range(len(bounds) - 2, 0, -1):
+                level = order[bounds[depth]:bounds[depth + 1]]
+                np.add.at(sizes, parents[level], sizes[level])
+            self._sizes = sizes
+        return self._sizes
 
-        G = nx.DiGraph()
-        labels = {}
-        pos = {}
-        node_levels = {}
+    def principal_variation(self):
+        # Node ids from the root along the best move at every level
+        columns = self.columns
+        flags, values = columns['flags'], columns['value']
+        path = [0] if len(self.trace) else []
+        while path:
+            node = path[-1]
+            children = [child for child in self.trace.children(node) if not flags[child] & PRUNED]
+            if not children:
+                break
+            # The first child that produced the node's value is the move the search kept
+            best = next((child for child in children if values[child] == values[node]), None)
+            if best is None:
+                child_values = [values[child] for child in children]
+                best = children[int(np.nanargmax(child_values) if flags[node] & IS_MAX else np.nanargmin(child_values))]
+            path.append(best)
+        return path
 
-        # Define format_val early so it's available in the loop
-        def format_val(val):
-            if val == float('inf'):
-                return '∞'
-            elif val == float('-inf'):
-                return '-∞'
-            elif val is None:
-                return '-'
-            else:
-                return f"{val: .1f}"
+    def select(self, view='full', max_nodes=None, max_depth=None, collapse_pruned=True):
+        # Level-of-detail selection. Returns (node ids in depth-first order, {id: note}):
+        # - pruned siblings are collapsed into their first pruned node ("N pruned")
+        # - levels deeper than max_depth are cut, and so are the deepest levels until at
+        #   most max_nodes remain; a cut node is marked with its hidden descendants ("+N")
+        columns = self.columns
+        parents, depths, flags = columns['parent'], columns['depth'], columns['flags']
+        if view == 'pv':
+            return self.principal_variation(), {}
+        if view != 'full':
+            raise ValueError(f"Unknown view: {view}")
 
-        # Assign level (depth) and gather nodes level by level
-        def assign_levels(node, depth=0):
-            node_levels.setdefault(depth, []).append(node)
-            for child in node.children:
-                assign_levels(child, depth + 1)
+        pruned = (flags & PRUNED) != 0
+        visible = ~pruned if collapse_pruned else np.ones(len(parents), dtype=bool)
+        notes = {}
+        if collapse_pruned and pruned.any():
+            pruned_ids = np.flatnonzero(pruned)
+            _, first, counts = np.unique(parents[pruned_ids], return_index=True, return_counts=True)
+            visible[pruned_ids[first]] = True
+            for node, count in zip(pruned_ids[first].tolist(), counts.tolist()):
+                notes[node] = f"{count} pruned"
 
-        assign_levels(self.root)
+        level_counts = np.bincount(depths[visible])
+        cut_depth = len(level_counts) - 1 if max_depth is None else min(max_depth, len(level_counts) - 1)
+        if max_nodes is not None:
+            while cut_depth > 0 and level_counts[:cut_depth + 1].sum() > max_nodes:
+                cut_depth -= 1
+        visible &= depths <= cut_depth
 
-        # Assign x positions to each node in each level (balanced spacing)
-        for depth, nodes in node_levels.items():
-            count = len(nodes)
-            for i, node in enumerate(nodes):
-                x = i - count / 2  # space nodes evenly around x=0
-                y = -depth
-                pos[node.id] = (x, y)
-
-                alpha_str = format_val(node.alpha)
-                beta_str = format_val(node.beta)
-                labels[node.id] = f"{'MAX' if node.is_max else 'MIN'}\n{node.move}\nV: {node.value}\nα: {alpha_str} β: {beta_str}"
-
-                for child in node.children:
-                    G.add_edge(node.id, child.id,
-                               color='red' if child.pruned else 'black')
-
-        edge_colors = [G[u][v]['color'] for u, v in G.edges()]
-        node_colors = []
-        for n in G.nodes():
-            node_obj = None
-            # Find node object by ID
-            for level_nodes in node_levels.values():
-                for node in level_nodes:
-                    if node.id == n:
-                        node_obj = node
-                        break
-                if node_obj:
-                    break
-            # Assign color based on pruning status
-            if node_obj is not None:
-                if node_obj.pruned:
-                    node_colors.append('red')
-                elif node_obj == self.root:
-                    node_colors.append('lightgreen')
-                else:
-                    node_colors.append('skyblue')
-            else:
-                node_colors.append('gray')  # fallback
+        # Nodes at the cut with a hidden subtree below them
+        sizes = self.subtree_sizes()
+        for node in np.flatnonzero(visible & (depths == cut_depth) & (sizes > 1) & ~pruned).tolist():
+            notes[node] = f"+{int(sizes[node]) - 1}"
+        return np.flatnonzero(visible).tolist(), notes
+
+    def layout(self, nodes):
+        # {id: (x, y)} in O(n): leaves get consecutive x in depth-first order and
+        # every parent is centered over its first and last child
+        columns = self.columns
+        parents, depths = columns['parent'], columns['depth']
+        ids = np.asarray(nodes, dtype=np.int64)
+        if len(ids) == 0:
+            return {}
+        position = np.full(len(parents), -1, dtype=np.int64)
+        position[ids] = np.arange(len(ids))
+        node_parents = parents[ids]
+        has_parent = (node_parents >= 0) & (position[np.maximum(node_parents, 0)] >= 0)
+        child_count = np.bincount(position[node_parents[has_parent]], minlength=len(ids))
+
+        x = np.zeros(len(ids))
+        leaves = child_count == 0
+        x[leaves] = np.arange(int(leaves.sum()))
+        low = np.full(len(ids), np.inf)
+        high = np.full(len(ids), -np.inf)
+        node_depths = depths[ids]
+        for depth in range(int(node_depths.max()), 0, -1):
+            level = np.flatnonzero((node_depths == depth) & has_parent)
+            if len(level) == 0:
+                continue
+            targets = position[node_parents[level]]
+            inner = child_count[level] > 0
+            x[level[inner]] = (low[level[inner]] + high[level[inner]]) / 2
+            np.minimum.at(low, targets, x[level])
+            np.maximum.at(high, targets, x[level])
+        roots = (child_count > 0) & ~has_parent
+        x[roots] = (low[roots] + high[roots]) / 2
+        return {node: (float(x[i]), -float(node_depths[i])) for i, node in enumerate(nodes)}
+
+    def draw(self, title="Alpha-Beta Pruning Tree", view='full', max_nodes=400, max_depth=None,
+             collapse_pruned=True, label_limit=80, show=True, filename=None):
+        # Draws the selected nodes with matplotlib and saves a PNG; returns its path.
+        # Labels are drawn only when at most label_limit nodes are shown.
+        # filename defaults to a timestamped name in "pruning visualization".
+        import matplotlib.pyplot as plt
+        from matplotlib.collections import LineCollection
+
+        nodes, notes = self.select(view, max_nodes, max_depth, collapse_pruned)
+        pos = self.layout(nodes)
+        parents, flags = self.columns['parent'].tolist(), self.columns['flags'].tolist()
 
+        # Assign color based on pruning status
+        segments, edge_colors, node_colors = [], [], []
+        for node in nodes:
+            pruned = flags[node] & PRUNED
+            if parents[node] >= 0 and parents[node] in pos:
+                segments.append((pos[parents[node]], pos[node]))
+                edge_colors.append('red' if pruned else 'black')
+            node_colors.append('red' if pruned else 'lightgreen' if parents[node] < 0 else 'skyblue')
 
-        plt.figure(figsize=(14, 8))
-        nx.draw(G, pos, labels=labels, with_labels=True, node_size=2500,
-                node_color=node_colors, edge_color=edge_colors,
-                font_size=7, font_weight='bold', arrows=True)
+        count = len(nodes)
+        width = min(30, max(14, 0.15 * len({x for x, _ in pos.values()})))
+        fig, ax = plt.subplots(figsize=(width, 8))
+        ax.add_collection(LineCollection(segments, colors=edge_colors, linewidths=0.5 if count > label_limit else 1))
+        xs, ys = zip(*(pos[node] for node in nodes)) if nodes else ((), ())
+        ax.scatter(xs, ys, s=2500 if count <= label_limit else max(4, 2500 * (label_limit / count) ** 2),
+                   c=node_colors, zorder=2)
+        if count <= label_limit:
+            for node in nodes:
+                ax.text(*pos[node], self._label(node, notes.get(node)), ha='center', va='center',
+                        fontsize=7, fontweight='bold', zorder=3)
+        elif nodes:
+            ax.text(*pos[nodes[0]], self._label(nodes[0], notes.get(nodes[0])), ha='center', va='center',
+                    fontsize=7, fontweight='bold', zorder=3)
 
-        plt.title(title)
-        plt.axis('off')
-        plt.tight_layout()
+        hidden = len(self.trace) - count
+        ax.set_title(title if not hidden else f"{title} ({count} of {len(self.trace)} nodes shown)")
+        ax.axis('off')
+        ax.autoscale()
+        fig.tight_layout()
 
         # Create the "pruning visualization" folder if it doesn't exist
         save_folder = "pruning visualization"
@@ -111,11 +182,86 @@ class TreeDiagram:
 
         # Generate a unique filename with timestamp
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S_%f")[:-3]  # Include milliseconds
-        filename = f"alpha_beta_tree_{timestamp}.png"
+        filename = filename or f"alpha_beta_tree_{timestamp}.png"
         filepath = os.path.join(save_folder, filename)
 
-        # Save the figure
-        plt.savefig(filepath, dpi=300, bbox_inches='tight')
+        # Save the figure (full resolution only when labels are drawn)
+        fig.savefig(filepath, dpi=300 if count <= label_limit else 120, bbox_inches='tight')
         print(f"Visualization saved to: {filepath}")
 
-        plt.show()
+        if show:
+            plt.show()
+        plt.close(fig)
+        return filepath
+
+    def export_dot(self, path, view='full', max_nodes=None, max_depth=None, collapse_pruned=False):
+        # Writes the (selected) tree as a Graphviz DOT file, one line per node and edge
+        nodes, notes = self.select(view, max_nodes, max_depth, collapse_pruned)
+        parents, flags = self.columns['parent'].tolist(), self.columns['flags'].tolist()
+        shown = set(nodes)
+        with open(path, "w", encoding="utf-8") as f:
+            f.write("digraph search {\n  node [shape=box, style=filled, fontsize=8];\n")
+            for node in nodes:
+                pruned = flags[node] & PRUNED
+                color = 'tomato' if pruned else 'palegreen' if parents[node] < 0 else 'lightskyblue'
+                label = self._label(node, notes.get(node)).replace('"', "'").replace("\n", "\\n")
+                f.write(f'  n{node} [label="{label}", fillcolor={color}];\n')
+                if parents[node] in shown:
+                    f.write(f"  n{parents[node]} -> n{node}{' [color=red]' if pruned else ''};\n")
+            f.write("}\n")
+        return path
+
+    def export_json(self, path, view='full', max_nodes=None, max_depth=None, collapse_pruned=False):
+        # Writes {"nodes": [...]} one node per line: id, parent, depth, move, value, alpha,
+        # beta, max, pruned and an optional note. Missing values are null, infinities strings.
+        nodes, notes = self.select(view, max_nodes, max_depth, collapse_pruned)
+        parents, depths, rows, cols, flags, values, alphas, betas = (
+            self.columns[name].tolist() for name in ('parent', 'depth', 'row', 'col', 'flags', 'value', 'alpha', 'beta'))
+
+        def number(val):
+            if val != val:
+                return None
+            if val in (float('inf'), float('-inf')):
+                return str(val)
+            return val
+
+        with open(path, "w", encoding="utf-8") as f:
+            f.write('{"nodes": [\n')
+            for i, node in enumerate(nodes):
+                record = {
+                    'id': node,
+                    'parent': parents[node],
+                    'depth': depths[node],
+                    'move': [rows[node], cols[node]] if rows[node] >= 0 else None,
+                    'value': number(values[node]),
+                    'alpha': number(alphas[node]),
+                    'beta': number(betas[node]),
+                    'max': bool(flags[node] & IS_MAX),
+                    'pruned': bool(flags[node] & PRUNED)
+                }
+                if node in notes:
+                    record['note'] = notes[node]
+                f.write(("," if i else "") + json.dumps(record) + "\n")
+            f.write("]}\n")
+        return path
+
+    def _label(self, node, note=None):
+        columns = self.columns
+
+        def format_val(val):
+            if val == float('inf'):
+                return '∞'
+            elif val == float('-inf'):
+                return '-∞'
+            elif val is None or val != val:  # None or NaN (no value)
+                return '-'
+            else:
+                return f"{val: .1f}"
+
+        if note and columns['flags'][node] & PRUNED:
+            return note
+        move = (int(columns['row'][node]), int(columns['col'][node])) if columns['row'][node] >= 0 else None
+        label = (f"{'MAX' if columns['flags'][node] & IS_MAX else 'MIN'}\n{move}\n"
+                 f"V: {format_val(float(columns['value'][node]))}\n"
+                 f"α: {format_val(float(columns['alpha'][node]))} β: {format_val(float(columns['beta'][node]))}")
+        return f"{label}\n{note}" if note else label